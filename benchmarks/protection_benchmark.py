@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+"""
+AVA OLO Protection Tooling Benchmark
+Times the audit, scan, dependency and visual gates against synthetic repositories
+
+Usage:
+    python benchmarks/protection_benchmark.py --files 2000 --output results.json
+    python benchmarks/protection_benchmark.py --baseline baseline.json   # exit 1 on regression
+"""
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import tempfile
+import contextlib
+import io
+import multiprocessing
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows - peak RSS is not reported
+    resource = None
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+for tool_dir in ['', 'protection_system', 'llm_first_audit', 'regression_prevention']:
+    sys.path.append(str(ROOT_DIR / tool_dir))
+
+MODULE_DIRS = ['ava-olo-agricultural-core', 'ava-olo-monitoring-dashboards']
+
+GATES = ['system_audit', 'llm_first_scan', 'dependency_map', 'visual_compare']
+
+# Extensions each gate reads, used for throughput
+GATE_EXTENSIONS = {
+    'system_audit': ('.py', '.html'),
+    'llm_first_scan': ('.py', '.js'),
+    'dependency_map': ('.py', '.js', '.html', '.css', '.json'),
+}
+
+CLEAN_PY_LINES = [
+    'def handle_request_{n}(payload):',
+    '    result = transform(payload, factor={n})',
+    '    items = [value * 2 for value in payload.values()]',
+    '    logger.info("processed %s items", len(items))',
+    '    return {{"status": "ok", "count": {n}}}',
+    'from .helpers import format_response',
+    'import json',
+    '',
+]
+
+VIOLATION_PY_LINES = [
+    'country = "Croatia"',
+    'if country == "HR": rate = {n}',
+    'db_url = os.getenv("DATABASE_URL")',
+    'import sqlite3',
+    'if crop == "wheat": return {n}',
+    'elif crop == "corn": pass',
+    'farmer_id = request.args.get("farmer_id")',
+    'try: load()\nexcept: pass',
+    'from ava_olo_monitoring_dashboards import metrics',
+]
+
+CLEAN_JS_LINES = [
+    'function render{n}(data) {{',
+    '  const rows = data.map(item => item.value * {n});',
+    '  return rows.join(",");',
+    '}}',
+    "import {{ api }} from './api.js';",
+]
+
+VIOLATION_JS_LINES = [
+    "if (country == 'croatia') {{ price = {n}; }}",
+    'if (risk == "high") {{ a(); }} else if (risk == "medium") {{ b(); }}',
+    "fetch('/api/farmers/{n}')",
+]
+
+HTML_TEMPLATE = """{{% extends "base.html" %}}
+{{% block content %}}
+<div class="dashboard-grid">
+  <div class="farmer-count">{{{{ total_farmers }}}}</div>
+  <span class="version-badge">{{{{ version }}}}</span>
+  <script src="/static/js/app{n}.js"></script>
+</div>
+{{% endblock %}}
+"""
+
+
+@dataclass
+class SyntheticRepoSpec:
+    """Shape of a generated benchmark repository"""
+    files: int = 500
+    lines_per_file: int = 120
+    js_share: float = 0.2
+    html_share: float = 0.1
+    violation_density: float = 0.02  # Share of lines that trigger a rule
+    minified_bundles: int = 5
+    image_pairs: int = 2
+    image_size: int = 800
+    seed: int = 42
+
+
+def generate_repo(root: Path, spec: SyntheticRepoSpec) -> Dict[str, int]:
+    """Write a synthetic ava-olo-* tree under root; returns file counts and bytes per extension"""
+    rng = random.Random(spec.seed)
+    stats: Dict[str, int] = {}
+
+    def write(path: Path, content: str):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding='utf-8')
+        ext = path.suffix
+        stats[f'files{ext}'] = stats.get(f'files{ext}', 0) + 1
+        stats[f'bytes{ext}'] = stats.get(f'bytes{ext}', 0) + len(content.encode('utf-8'))
+
+    def body(clean: List[str], violations: List[str]) -> str:
+        lines = []
+        for n in range(spec.lines_per_file):
+            templates = violations if rng.random() < spec.violation_density else clean
+            lines.append(rng.choice(templates).format(n=n))
+        return '\n'.join(lines) + '\n'
+
+    for index in range(spec.files):
+        module = MODULE_DIRS[index % len(MODULE_DIRS)]
+        package = f'package_{index % 17}'
+        roll = rng.random()
+        if roll < spec.html_share:
+            write(root / module / 'templates' / package / f'page_{index}.html', HTML_TEMPLATE.format(n=index))
+        elif roll < spec.html_share + spec.js_share:
+            write(root / module / 'static' / 'js' / package / f'app_{index}.js',
+                  body(CLEAN_JS_LINES, VIOLATION_JS_LINES))
+        else:
+            write(root / module / package / f'module_{index}.py', body(CLEAN_PY_LINES, VIOLATION_PY_LINES))
+
+    for index in range(spec.minified_bundles):
+        module = MODULE_DIRS[index % len(MODULE_DIRS)]
+        statements = ';'.join(f'var a{i}=function(b){{return b*{i}}}' for i in range(8000))
+        # Alternate names so both the name check and the content checks are exercised
+        name = f'vendor_{index}.min.js' if index % 2 else f'vendor_bundle_{index}.js'
+        write(root / module / 'static' / 'js' / name, statements + '\n//# sourceMappingURL=vendor.js.map\n')
+
+    for file_path in ['protection_system/guaranteed_rollback.py']:
+        write(root / 'ava-olo-shared' / file_path, '"""Rollback placeholder"""\n')
+
+    return stats
+
+
+def generate_images(directory: Path, spec: SyntheticRepoSpec) -> List[List[str]]:
+    """Baseline/current screenshot pairs with a few changed regions; empty without Pillow"""
+    try:
+        from PIL import Image, ImageDraw
+    except ImportError:
+        return []
+
+    rng = random.Random(spec.seed)
+    directory.mkdir(parents=True, exist_ok=True)
+    pairs = []
+    for index in range(spec.image_pairs):
+        size = (spec.image_size, spec.image_size * 10 // 16)
+        baseline = Image.new('RGB', size, (245, 245, 245))
+        draw = ImageDraw.Draw(baseline)
+        for _ in range(40):
+            x, y = rng.randrange(size[0]), rng.randrange(size[1])
+            draw.rectangle([x, y, x + 120, y + 40], fill=(rng.randrange(256), 200, 80))
+        current = baseline.copy()
+        ImageDraw.Draw(current).rectangle([10, 10, 200, 60], fill=(255, 215, 0))
+
+        baseline_path = directory / f'baseline_{index}.png'
+        current_path = directory / f'current_{index}.png'
+        baseline.save(baseline_path)
+        current.save(current_path)
+        pairs.append([str(baseline_path), str(current_path), str(directory / f'diff_{index}.png')])
+    return pairs
+
+
+def peak_rss_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    # ru_maxrss is KB on Linux, bytes on macOS
+    scale = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale, 1)
+
+
+def run_gate(gate: str, repo_root: str, image_pairs: List[List[str]]) -> Dict:
+    """Run one gate in the current process and measure it (called in a fresh process)"""
+    module_paths = [os.path.join(repo_root, module) for module in MODULE_DIRS]
+    quiet = contextlib.redirect_stdout(io.StringIO())
+
+    if gate == 'system_audit':
+        from comprehensive_audit import AVASystemAuditor
+        auditor = AVASystemAuditor(root_path=repo_root)
+        with quiet:
+            start = time.perf_counter()
+            auditor.run_comprehensive_audit()
+            seconds = time.perf_counter() - start
+        findings = len(auditor.violations) + len(auditor.warnings)
+
+    elif gate == 'llm_first_scan':
+        from llm_first_scanner import LLMFirstScanner
+        scanner = LLMFirstScanner()
+        with quiet:
+            start = time.perf_counter()
+            findings = sum(len(violations) for _, violations in scanner.iter_scan_repositories(module_paths))
+            seconds = time.perf_counter() - start
+
+    elif gate == 'dependency_map':
+        from dependency_mapper import DependencyMapper
+        mapper = DependencyMapper()
+        mapper.repo_paths = module_paths
+        with quiet:
+            start = time.perf_counter()
+            findings = len(mapper.analyze_repositories())
+            seconds = time.perf_counter() - start
+
+    elif gate == 'visual_compare':
+        if not image_pairs:
+            return {'skipped': 'Pillow is not installed'}
+        try:
+            from visual_regression_tester import VisualRegressionTester
+        except ImportError as e:
+            return {'skipped': f'visual_regression_tester unavailable ({e})'}
+        # compare_images needs no driver or output directories, so skip __init__
+        tester = VisualRegressionTester.__new__(VisualRegressionTester)
+        start = time.perf_counter()
+        findings = sum(1 for pair in image_pairs if tester.compare_images(*pair) > 0)
+        seconds = time.perf_counter() - start
+
+    else:
+        raise ValueError(f'Unknown gate: {gate}')
+
+    return {'seconds': seconds, 'findings': findings, 'peak_rss_mb': peak_rss_mb()}
+
+
+def measure_gate(gate: str, repo_root: Path, image_pairs: List[List[str]],
+                 repo_stats: Dict[str, int], repeat: int) -> Dict:
+    """Best of `repeat` runs, each in a fresh process so peak RSS belongs to the gate alone"""
+    context = multiprocessing.get_context('spawn')
+    runs = []
+    for _ in range(repeat):
+        with context.Pool(1) as pool:
+            result = pool.apply(run_gate, (gate, str(repo_root), image_pairs))
+        if 'skipped' in result:
+            return result
+        runs.append(result)
+
+    best = min(runs, key=lambda run: run['seconds'])
+    rss_values = [run['peak_rss_mb'] for run in runs if run['peak_rss_mb'] is not None]
+    measurement = {
+        'seconds': round(best['seconds'], 4),
+        'runs': [round(run['seconds'], 4) for run in runs],
+        'findings': best['findings'],
+        'peak_rss_mb': max(rss_values) if rss_values else None,
+    }
+
+    if gate == 'visual_compare':
+        measurement['pairs'] = len(image_pairs)
+        measurement['pairs_per_second'] = round(len(image_pairs) / max(best['seconds'], 1e-9), 2)
+    else:
+        extensions = GATE_EXTENSIONS[gate]
+        files = sum(repo_stats.get(f'files{ext}', 0) for ext in extensions)
+        size = sum(repo_stats.get(f'bytes{ext}', 0) for ext in extensions)
+        measurement['files'] = files
+        measurement['bytes'] = size
+        measurement['files_per_second'] = round(files / max(best['seconds'], 1e-9), 1)
+        measurement['mb_per_second'] = round(size / 1e6 / max(best['seconds'], 1e-9), 2)
+    return measurement
+
+
+def check_regressions(results: Dict, baseline: Dict, max_slowdown: float,
+                      max_rss_growth: float) -> List[str]:
+    """Compare gate results to a baseline run; returns regression messages"""
+    regressions = []
+    for gate, measurement in results['gates'].items():
+        reference = baseline.get('gates', {}).get(gate)
+        if not reference or 'seconds' not in reference or 'seconds' not in measurement:
+            continue
+
+        limit = reference['seconds'] * max_slowdown
+        measurement['limit_seconds'] = round(limit, 4)
+        if measurement['seconds'] > limit:
+            regressions.append(f"{gate}: {measurement['seconds']:.3f}s exceeds "
+                               f"{limit:.3f}s ({max_slowdown:g}x baseline {reference['seconds']:.3f}s)")
+
+        if measurement.get('peak_rss_mb') and reference.get('peak_rss_mb'):
+            rss_limit = reference['peak_rss_mb'] * max_rss_growth
+            measurement['limit_peak_rss_mb'] = round(rss_limit, 1)
+            if measurement['peak_rss_mb'] > rss_limit:
+                regressions.append(f"{gate}: peak RSS {measurement['peak_rss_mb']} MB exceeds "
+                                   f"{rss_limit:.1f} MB ({max_rss_growth:g}x baseline)")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line interface"""
+    defaults = SyntheticRepoSpec()
+    parser = argparse.ArgumentParser(description='Benchmark the AVA OLO protection tooling')
+    parser.add_argument('--files', type=int, default=defaults.files, help='Number of source files')
+    parser.add_argument('--lines', type=int, default=defaults.lines_per_file, help='Lines per source file')
+    parser.add_argument('--js-share', type=float, default=defaults.js_share, help='Share of JavaScript files')
+    parser.add_argument('--html-share', type=float, default=defaults.html_share, help='Share of HTML templates')
+    parser.add_argument('--violation-density', type=float, default=defaults.violation_density,
+                        help='Share of lines that violate a rule')
+    parser.add_argument('--minified-bundles', type=int, default=defaults.minified_bundles,
+                        help='Number of minified bundles to add')
+    parser.add_argument('--image-pairs', type=int, default=defaults.image_pairs,
+                        help='Screenshot pairs for the visual comparison')
+    parser.add_argument('--seed', type=int, default=defaults.seed)
+    parser.add_argument('--gates', nargs='+', choices=GATES, default=GATES)
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per gate (best time is kept)')
+    parser.add_argument('--output', default='protection_benchmark_results.json', help='Results JSON path')
+    parser.add_argument('--baseline', help='Earlier results JSON to check for regressions')
+    parser.add_argument('--max-slowdown', type=float, default=1.25,
+                        help='Allowed wall time relative to the baseline (default: 1.25)')
+    parser.add_argument('--max-rss-growth', type=float, default=1.25,
+                        help='Allowed peak RSS relative to the baseline (default: 1.25)')
+    parser.add_argument('--keep', action='store_true', help='Keep the generated repository')
+    args = parser.parse_args(argv)
+
+    spec = SyntheticRepoSpec(
+        files=args.files, lines_per_file=args.lines, js_share=args.js_share,
+        html_share=args.html_share, violation_density=args.violation_density,
+        minified_bundles=args.minified_bundles, image_pairs=args.image_pairs, seed=args.seed
+    )
+
+    work_dir = Path(tempfile.mkdtemp(prefix='ava_olo_benchmark_'))
+    repo_root = work_dir / 'repo'
+    print(f"🏗️  Generating synthetic repository ({spec.files} files x {spec.lines_per_file} lines) in {work_dir}")
+    repo_stats = generate_repo(repo_root, spec)
+    image_pairs = generate_images(work_dir / 'images', spec) if 'visual_compare' in args.gates else []
+
+    results = {
+        'timestamp': datetime.utcnow().isoformat(),
+        'python': sys.version.split()[0],
+        'spec': asdict(spec),
+        'repository': repo_stats,
+        'thresholds': {'max_slowdown': args.max_slowdown, 'max_rss_growth': args.max_rss_growth},
+        'gates': {}
+    }
+
+    try:
+        for gate in args.gates:
+            print(f"⏱️  {gate}...")
+            measurement = measure_gate(gate, repo_root, image_pairs, repo_stats, args.repeat)
+            results['gates'][gate] = measurement
+            if 'skipped' in measurement:
+                print(f"   ⏭️ Skipped: {measurement['skipped']}")
+            else:
+                print(f"   {measurement['seconds']:.3f}s | peak RSS {measurement['peak_rss_mb']} MB | "
+                      f"{measurement['findings']} findings")
+    finally:
+        if not args.keep:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            regressions = check_regressions(results, json.load(f), args.max_slowdown, args.max_rss_growth)
+        results['baseline'] = args.baseline
+        results['regressions'] = regressions
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"📄 Results: {args.output}")
+
+    for regression in regressions:
+        print(f"❌ Regression: {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
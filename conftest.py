@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+"""
+Shared pytest fixtures for the AVA OLO scanner and audit tests
+"""
+import os
+import subprocess
+from pathlib import Path
+
+import pytest
+
+# Commits in temporary repositories must not depend on the machine's git config
+GIT_IDENTITY = {'GIT_AUTHOR_NAME': 'Test', 'GIT_AUTHOR_EMAIL': 'test@example.com',
+                'GIT_COMMITTER_NAME': 'Test', 'GIT_COMMITTER_EMAIL': 'test@example.com'}
+
+
+def run_git(repo: Path, *args: str) -> str:
+    """Stripped stdout of a git command run in repo; fails the test if git fails"""
+    return subprocess.run(['git', *args], cwd=repo, check=True, capture_output=True, text=True,
+                          env={**os.environ, **GIT_IDENTITY}).stdout.strip()
+
+
+@pytest.fixture
+def git():
+    """run_git(repo, *args) for building temporary repositories"""
+    return run_git
@@ -4,27 +4,146 @@ LLM-First Compliance Scanner
 Detects business logic violations that should use LLM instead of hardcoded rules
 """
 
+import io
 import os
 import re
+import sys
 import json
-from dataclasses import dataclass
-from typing import List, Dict, Tuple
+import time
+import heapq
+import argparse
+from collections import OrderedDict
+from contextlib import nullcontext
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List, Dict, Tuple, Optional, Iterable, Iterator, TextIO
 from pathlib import Path
 
-@dataclass
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from scan_common.findings_cache import FindingsCache
+from scan_common.linear_rules import LinearRule
+from scan_common.generated_files import GeneratedFileDetector
+from scan_common.timing import TimingRecorder
+from scan_common.ignore_rules import IgnoreMatcher
+from scan_common.fs_walk import DEFAULT_IO_THREADS, find_repositories, read_ahead, scandir_walk
+from scan_common.diff_hunks import DEFAULT_HUNK_CONTEXT, FileChange, git_range_diff, parse_unified_diff
+from scan_common.git_blobs import GitBlobReader, git_prefix, staged_blobs
+from scan_common.shards import assign_shards, shard_argument, validate_shard_set
+from scan_common.baseline import Baseline, fingerprint, normalize_code
+
 class LLMFirstViolation:
-    file: str
-    line: int
-    code: str
-    severity: str  # CRITICAL, HIGH, MEDIUM, LOW
-    pattern: str
-    suggestion: str
-    context: str = ""
+    """A single finding, stored compactly
+    
+    File paths and (severity, pattern, suggestion) rules are interned once
+    per process and referenced by id. The surrounding context is kept as a
+    (context_start, context_end) line range and only read from the file when
+    a report asks for it.
+    """
+    
+    __slots__ = ('file_id', 'line', 'code', 'rule_id', 'context_start', 'context_end')
+    
+    _paths: List[str] = []
+    _path_ids: Dict[str, int] = {}
+    _rules: List[Tuple[str, str, str]] = []
+    _rule_ids: Dict[Tuple[str, str, str], int] = {}
+    
+    def __init__(self, file: str, line: int, code: str, severity: str, pattern: str,
+                 suggestion: str, context_start: int = 0, context_end: int = 0):
+        self.file_id = self._intern(self._paths, self._path_ids, file)
+        self.line = line
+        self.code = code
+        self.rule_id = self._intern(self._rules, self._rule_ids, (severity, pattern, suggestion))
+        self.context_start = context_start
+        self.context_end = context_end
+    
+    @staticmethod
+    def _intern(values: List, ids: Dict, value) -> int:
+        value_id = ids.get(value)
+        if value_id is None:
+            value_id = ids[value] = len(values)
+            values.append(value)
+        return value_id
+    
+    @property
+    def file(self) -> str:
+        return self._paths[self.file_id]
+    
+    @property
+    def severity(self) -> str:  # CRITICAL, HIGH, MEDIUM, LOW
+        return self._rules[self.rule_id][0]
+    
+    @property
+    def pattern(self) -> str:
+        return self._rules[self.rule_id][1]
+    
+    @property
+    def suggestion(self) -> str:
+        return self._rules[self.rule_id][2]
+    
+    @property
+    def context(self) -> str:
+        """Surrounding lines, read from the file on demand"""
+        return read_context(self.file, self.context_start, self.context_end)
+    
+    def to_dict(self, include_context: bool = True) -> Dict:
+        finding = {
+            'file': self.file,
+            'line': self.line,
+            'code': self.code,
+            'severity': self.severity,
+            'pattern': self.pattern,
+            'suggestion': self.suggestion,
+        }
+        if include_context:
+            finding['context'] = self.context
+        else:
+            finding['context_start'] = self.context_start
+            finding['context_end'] = self.context_end
+        return finding
+    
+    def __reduce__(self):
+        # Ids are per process; send the (shared) strings to other processes
+        return (LLMFirstViolation, (self.file, self.line, self.code, self.severity, self.pattern,
+                                    self.suggestion, self.context_start, self.context_end))
+    
+    def __repr__(self) -> str:
+        return f'LLMFirstViolation({self.file}:{self.line} {self.severity} {self.pattern!r})'
+
+# Lines of the most recently read files, for context slicing at report time
+CONTEXT_FILES_CACHED = 8
+_context_lines: 'OrderedDict[str, List[str]]' = OrderedDict()
+# Lines of files scanned from git blobs, which may differ from the working tree
+_pinned_context_lines: Dict[str, List[str]] = {}
+
+def pin_context(file_path: str, lines: List[str]):
+    """Serve context for file_path from lines instead of the working-tree file"""
+    _pinned_context_lines[file_path] = lines
+
+def read_context(file_path: str, start: int, end: int) -> str:
+    """Lines [start, end) of a file, decoded like the scan itself"""
+    lines = _pinned_context_lines.get(file_path)
+    if lines is not None:
+        return ''.join(lines[start:end])
+    
+    lines = _context_lines.get(file_path)
+    if lines is None:
+        try:
+            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+                lines = f.readlines()
+        except OSError:
+            lines = []
+        _context_lines[file_path] = lines
+        if len(_context_lines) > CONTEXT_FILES_CACHED:
+            _context_lines.popitem(last=False)
+    else:
+        _context_lines.move_to_end(file_path)
+    return ''.join(lines[start:end])
 
 class LLMFirstScanner:
     """Comprehensive scanner for LLM-first violations"""
     
-    def __init__(self):
+    def __init__(self, cache_file: Optional[str] = None, skip_generated: bool = True,
+                 timing: bool = False, io_threads: int = DEFAULT_IO_THREADS,
+                 shard: Optional[Tuple[int, int]] = None, baseline: Optional[Baseline] = None):
         self.violations = []
         self.violation_patterns = {
             'CRITICAL': [
@@ -82,71 +201,599 @@ class LLMFirstScanner:
         }
         
         self.file_extensions = ['.py', '.js', '.ts', '.jsx', '.tsx']
+        # Gitignore syntax; .avaoloignore and every .gitignore under the scan root are applied on top
         self.ignore_patterns = [
-            'test_', 'tests/', '__pycache__', '.git/', 'node_modules/',
-            'venv/', 'env/', '.env', 'migrations/', 'static/css/', 'static/js/lib'
+            'test_*', 'tests/', '__pycache__/', '.git/', 'node_modules/',
+            'venv/', '.venv*/', 'env/', '.env', 'migrations/', '**/static/css/', '**/static/js/lib/',
+            'dist/', 'coverage/', '.tox/', '.pytest_cache/', '.mypy_cache/'
         ]
+        self.ignore_matchers: Dict[str, IgnoreMatcher] = {}
+        # Reads kept in flight while scanning (slow mounts such as /mnt/c are latency-bound)
+        self.io_threads = io_threads
+        # Files, findings and timings per scanned repository
+        self.repository_stats: Dict[str, Dict] = {}
+        # Lines evaluated by diff scans (changed lines plus context)
+        self.changed_lines_scanned = 0
+        # (index, count): only scan this shard's files; file_positions maps each to its full-walk position
+        self.shard = shard
+        self.file_positions: Dict[str, int] = {}
+        # Known findings that are not reported again
+        self.baseline = baseline
+        # Optional per-phase and per-rule timings (adds a clock read per rule evaluation)
+        self.timings = TimingRecorder() if timing else None
+        self.compile_rules()
+        
+        # Minified bundles and generated files are skipped (and summarized) by default
+        self.generated_detector = GeneratedFileDetector() if skip_generated else None
+        
+        # Optional persistent cache - only new or changed files are rescanned
+        self.cache = None
+        if cache_file:
+            self.cache = FindingsCache(cache_file, FindingsCache.hash_ruleset({
+                'rules': self.violation_patterns,
+                'findings_format': 3  # Context as a line range, one finding per severity and line
+            }))
     
-    def should_ignore_file(self, file_path: str) -> bool:
-        """Check if file should be ignored based on patterns"""
-        return any(pattern in file_path for pattern in self.ignore_patterns)
+    def compile_rules(self):
+        """Compile violation_patterns once into a single combined matcher
+        
+        Every rule is compiled into a LinearRule (wildcard chains such as
+        `elif.*elif.*elif` are matched atom by atom, in linear time). The
+        leading atoms of all rules form one prefilter regex with a named
+        group per severity, so most lines are rejected by a single search;
+        each severity also gets its own prefilter of just its atoms. With
+        timing enabled every rule, and the prefilters, record their own
+        time and matches.
+        """
+        self.compiled_rules: Dict[str, List[Tuple[str, str, object]]] = {}
+        self.severity_matchers: Dict[str, object] = {}
+        severity_groups = []
+        for severity, patterns in self.violation_patterns.items():
+            first_atoms = []
+            rules = self.compiled_rules.setdefault(severity, [])
+            for pattern, suggestion in patterns:
+                rule = LinearRule(pattern, re.IGNORECASE)
+                if self.timings is not None:
+                    rule = self.timings.wrap_rule(severity, rule)
+                rules.append((pattern, suggestion, rule))
+                first_atoms.extend(rule.first_atoms)
+            if first_atoms:
+                alternatives = '|'.join(f'(?:{atom})' for atom in first_atoms)
+                severity_groups.append(f'(?P<{severity}>{alternatives})')
+                matcher = re.compile(alternatives, re.IGNORECASE)
+                if self.timings is not None:
+                    matcher = self.timings.wrap_rule('prefilter', matcher, f'first atoms of {severity} rules')
+                self.severity_matchers[severity] = matcher
+        
+        self.combined_matcher = re.compile('|'.join(severity_groups), re.IGNORECASE)
+        if self.timings is not None:
+            self.combined_matcher = self.timings.wrap_rule('prefilter', self.combined_matcher,
+                                                           'first atoms of all rules')
+    
+    def match_line(self, line: str) -> List[Tuple[str, str, str]]:
+        """(severity, pattern, suggestion) of the first matching rule of each severity, CRITICAL first
+        
+        A line gets at most one finding per severity. Lines none of whose
+        leading atoms occur are rejected by one combined search; otherwise
+        its named group (match.lastgroup) says which severity certainly
+        needs its rules checked, and the other severities are only checked
+        if their own prefilter finds one of their atoms in the line.
+        """
+        match = self.combined_matcher.search(line)
+        if not match:
+            return []
+        
+        found = []
+        for severity, rules in self.compiled_rules.items():
+            if severity != match.lastgroup:
+                matcher = self.severity_matchers.get(severity)
+                if matcher is None or not matcher.search(line):
+                    continue
+            for pattern, suggestion, rule in rules:
+                if rule.matches(line):
+                    found.append((severity, pattern, suggestion))
+                    break
+        return found
+    
+    def ignore_matcher(self, root: str) -> IgnoreMatcher:
+        """Compiled ignore rules for a scan root (.gitignore files are read once per directory)"""
+        root = os.path.abspath(root)
+        if root not in self.ignore_matchers:
+            self.ignore_matchers[root] = IgnoreMatcher(root, self.ignore_patterns)
+        return self.ignore_matchers[root]
+    
+    def should_ignore_file(self, file_path: str, root: str = '.') -> bool:
+        """Check if file, or any directory between root and it, is ignored"""
+        return self.ignore_matcher(root).is_ignored(file_path, False, check_parents=True)
     
     def scan_file(self, file_path: str) -> List[LLMFirstViolation]:
         """Scan a single file for LLM-first violations"""
-        violations = []
-        
         try:
             with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
                 lines = f.readlines()
+        except Exception as e:
+            print(f"Error scanning {file_path}: {e}")
+            return []
+        
+        return self.scan_lines(file_path, lines)
+    
+    def cached_findings(self, file_path: str, stat: Optional[os.stat_result] = None) -> Optional[List[LLMFirstViolation]]:
+        """Cached findings for an unchanged file, or None if it has to be scanned"""
+        if stat is None:
+            try:
+                stat = os.stat(file_path)
+            except OSError:
+                return None
+        
+        def content_hash() -> Optional[str]:
+            try:
+                with open(file_path, 'rb') as f:
+                    return FindingsCache.hash_content(f.read())
+            except OSError:
+                return None
+        
+        cached = self.cache.get(file_path, stat.st_size, stat.st_mtime_ns, content_hash)
+        if cached is None:
+            return None
+        if self.timings is not None:
+            self.timings.count('scan', files=1, matches=0 if isinstance(cached, dict) else len(cached))
+        if isinstance(cached, dict):
+            # Unchanged minified/generated file skipped on an earlier run
+            self.generated_detector.record(file_path, cached['skipped'])
+            return []
+        return [LLMFirstViolation(**finding) for finding in cached]
+    
+    def load_file(self, file_path: str, stat: Optional[os.stat_result] = None) -> Tuple:
+        """Stat and read a file without touching scanner state (safe in reader threads)
+        
+        Returns (stat, content, skip reason, error); content is None for files
+        skipped by name or size and for unreadable files.
+        """
+        try:
+            if stat is None:
+                stat = os.stat(file_path)
+            if self.generated_detector is not None:
+                skip_reason = self.generated_detector.reason_before_read(file_path, stat.st_size)
+                if skip_reason:
+                    return stat, None, skip_reason, None
             
-            for line_num, line in enumerate(lines, 1):
+            with open(file_path, 'rb') as f:
+                return stat, f.read(), None, None
+        except Exception as e:
+            return stat, None, None, e
+    
+    def scan_loaded(self, file_path: str, loaded: Tuple) -> Tuple[List[LLMFirstViolation], Optional[Tuple[int, int, str]], Optional[str]]:
+        """Scan a file read by load_file(); returns findings, (size, mtime_ns, content hash) for caching and a skip reason"""
+        if self.timings is not None:
+            self.timings.count('scan', files=1)
+        stat, data, skip_reason, error = loaded
+        if error is not None:
+            print(f"Error scanning {file_path}: {error}")
+            return [], None, None
+        if skip_reason:
+            return [], None, skip_reason
+        
+        if self.timings is not None:
+            self.timings.count('scan', bytes_read=len(data))
+        fingerprint = (stat.st_size, stat.st_mtime_ns, FindingsCache.hash_content(data))
+        if self.generated_detector is not None:
+            skip_reason = self.generated_detector.reason_for_content(data)
+            if skip_reason:
+                return [], fingerprint, skip_reason
+        
+        # Decode exactly like scan_file's text-mode open() so findings match
+        lines = io.TextIOWrapper(io.BytesIO(data), encoding='utf-8', errors='ignore').readlines()
+        violations = self.scan_lines(file_path, lines)
+        if self.timings is not None:
+            self.timings.count('scan', matches=len(violations))
+        return violations, fingerprint, None
+    
+    def record_scan(self, file_path: str, violations: List[LLMFirstViolation],
+                    fingerprint: Optional[Tuple[int, int, str]], skip_reason: Optional[str]):
+        """Record a fresh scan result: skipped files and cache entries"""
+        if skip_reason:
+            self.generated_detector.record(file_path, skip_reason)
+        
+        if self.cache is not None and fingerprint is not None:
+            size, mtime_ns, digest = fingerprint
+            if skip_reason:
+                findings = {'skipped': skip_reason}
+            else:
+                findings = [v.to_dict(include_context=False) for v in violations]
+            self.cache.put(file_path, size, mtime_ns, digest, findings)
+    
+    def scan_path(self, file_path: str, stat: Optional[os.stat_result] = None,
+                  loaded: Optional[Tuple] = None) -> List[LLMFirstViolation]:
+        """Scan a file found by scan_directory, using the cache and skipping generated files"""
+        if self.cache is not None:
+            violations = self.cached_findings(file_path, stat)
+            if violations is not None:
+                return violations
+        
+        if loaded is None:
+            loaded = self.load_file(file_path, stat)
+        violations, fingerprint, skip_reason = self.scan_loaded(file_path, loaded)
+        self.record_scan(file_path, violations, fingerprint, skip_reason)
+        return violations
+    
+    def scan_lines(self, file_path: str, lines: List[str]) -> List[LLMFirstViolation]:
+        """Scan already-read file lines for LLM-first violations"""
+        return self.scan_numbered_lines(file_path, enumerate(lines, 1), len(lines))
+    
+    def scan_numbered_lines(self, file_path: str, numbered_lines: Iterable[Tuple[int, str]],
+                            line_count: int) -> List[LLMFirstViolation]:
+        """Scan (line number, line) pairs of a file with line_count lines"""
+        violations = []
+        
+        try:
+            for line_num, line in numbered_lines:
                 line_stripped = line.strip()
                 if not line_stripped or line_stripped.startswith('#'):
                     continue
                 
-                # Check all violation patterns
-                for severity, patterns in self.violation_patterns.items():
-                    for pattern, suggestion in patterns:
-                        if re.search(pattern, line, re.IGNORECASE):
-                            # Get context (surrounding lines)
-                            context_start = max(0, line_num - 3)
-                            context_end = min(len(lines), line_num + 2)
-                            context = ''.join(lines[context_start:context_end])
-                            
-                            violation = LLMFirstViolation(
-                                file=file_path,
-                                line=line_num,
-                                code=line_stripped,
-                                severity=severity,
-                                pattern=pattern,
-                                suggestion=suggestion,
-                                context=context
-                            )
-                            violations.append(violation)
-                            break  # Only one violation per line
+                # Check all violation patterns (at most one violation per severity)
+                for severity, pattern, suggestion in self.match_line(line):
+                    # Context (surrounding lines) is referenced, not copied
+                    violation = LLMFirstViolation(
+                        file=file_path,
+                        line=line_num,
+                        code=line_stripped,
+                        severity=severity,
+                        pattern=pattern,
+                        suggestion=suggestion,
+                        context_start=max(0, line_num - 3),
+                        context_end=min(line_count, line_num + 2)
+                    )
+                    violations.append(violation)
         
         except Exception as e:
             print(f"Error scanning {file_path}: {e}")
         
         return violations
     
-    def scan_directory(self, directory: str) -> List[LLMFirstViolation]:
-        """Scan entire directory recursively"""
-        all_violations = []
+    def scan_diff(self, repo_dir: str, diff_lines: Iterable[str],
+                  context: int = DEFAULT_HUNK_CONTEXT) -> List[LLMFirstViolation]:
+        """Scan only the lines a unified diff adds or touches, in diff order"""
+        return self.scan_changes(repo_dir, parse_unified_diff(diff_lines), context)
+    
+    def scan_git_range(self, repo_dir: str, git_range: str,
+                       context: int = DEFAULT_HUNK_CONTEXT) -> List[LLMFirstViolation]:
+        """scan_diff() of a git range (A..B, A...B, or REV for REV..HEAD); raises RuntimeError if git fails"""
+        return self.scan_diff(repo_dir, git_range_diff(repo_dir, git_range).splitlines(), context)
+    
+    def scan_changes(self, repo_dir: str, changes: List[FileChange],
+                     context: int = DEFAULT_HUNK_CONTEXT) -> List[LLMFirstViolation]:
+        """Evaluate rules on changed lines only, plus context lines on each side
         
-        for root, dirs, files in os.walk(directory):
-            # Skip ignored directories
-            dirs[:] = [d for d in dirs if not any(pattern in d for pattern in self.ignore_patterns)]
-            
-            for file in files:
-                if any(file.endswith(ext) for ext in self.file_extensions):
-                    file_path = os.path.join(root, file)
-                    if not self.should_ignore_file(file_path):
-                        violations = self.scan_file(file_path)
-                        all_violations.extend(violations)
+        New file contents are read from the repository through one git
+        cat-file process - working-tree files are never opened. If a blob is
+        not in the repository (a diff of uncommitted work), the lines the
+        diff itself carries are scanned. Extensions, ignore rules and the
+        generated-file filter apply as in a directory scan; the findings
+        cache does not, as findings depend on the diff.
         
+        Git diffs name files from the repository's top level. If repo_dir
+        is a subdirectory, paths are taken relative to it and files outside
+        it are skipped.
+        """
+        stats = self.repository_stats.setdefault(repo_dir, new_repository_stats())
+        extensions = tuple(self.file_extensions)
+        prefix = git_prefix(repo_dir)
+        violations = []
+        start = time.perf_counter()
+        with self.timings.phase('scan') if self.timings is not None else nullcontext({}), \
+                GitBlobReader(repo_dir) as reader:
+            for change in changes:
+                if change.deleted or change.binary or not change.path.endswith(extensions):
+                    continue
+                if not change.path.startswith(prefix):
+                    continue
+                file_path = os.path.join(repo_dir, change.path[len(prefix):])
+                if self.should_ignore_file(file_path, repo_dir):
+                    continue
+                
+                file_violations = self.scan_change(repo_dir, file_path, change, context, reader, stats)
+                for violation in file_violations:
+                    stats['by_severity'][violation.severity] += 1
+                violations.extend(file_violations)
+        stats['scan_seconds'] += time.perf_counter() - start
+        return violations
+    
+    def scan_staged(self, repo_dir: str) -> List[LLMFirstViolation]:
+        """Scan the staged version of every added, copied, modified or renamed file (pre-commit)
+        
+        Paths and blob ids come from one `git diff --cached`, contents from
+        one git cat-file process: the working tree is neither walked nor
+        read, so the cost is proportional to the commit, not the checkout.
+        Raises RuntimeError if git fails.
+        """
+        stats = self.repository_stats.setdefault(repo_dir, new_repository_stats())
+        extensions = tuple(self.file_extensions)
+        violations = []
+        start = time.perf_counter()
+        with self.timings.phase('scan') if self.timings is not None else nullcontext({}), \
+                GitBlobReader(repo_dir) as reader:
+            for path, blob in staged_blobs(repo_dir):
+                file_path = os.path.join(repo_dir, path)
+                if not path.endswith(extensions) or self.should_ignore_file(file_path, repo_dir):
+                    continue
+                data = reader.read(blob)
+                lines = self.blob_lines(file_path, data) if data is not None else None
+                if lines is None:
+                    continue
+                
+                stats['files'] += 1
+                stats['bytes'] += len(data)
+                if self.timings is not None:
+                    self.timings.count('scan', files=1, bytes_read=len(data))
+                file_violations = self.scan_lines(file_path, lines)
+                if self.timings is not None:
+                    self.timings.count('scan', matches=len(file_violations))
+                file_violations = self.unreported(repo_dir, file_violations)
+                if file_violations:
+                    pin_context(file_path, lines)
+                for violation in file_violations:
+                    stats['by_severity'][violation.severity] += 1
+                violations.extend(file_violations)
+        stats['scan_seconds'] += time.perf_counter() - start
+        return violations
+    
+    def blob_lines(self, file_path: str, data: bytes) -> Optional[List[str]]:
+        """Lines of a blob decoded like a working-tree read, or None for generated files"""
+        if self.generated_detector is not None:
+            skip_reason = (self.generated_detector.reason_before_read(file_path, len(data))
+                           or self.generated_detector.reason_for_content(data))
+            if skip_reason:
+                self.generated_detector.record(file_path, skip_reason)
+                return None
+        return io.TextIOWrapper(io.BytesIO(data), encoding='utf-8', errors='ignore').readlines()
+    
+    def scan_change(self, repo_dir: str, file_path: str, change: FileChange, context: int,
+                    reader: GitBlobReader, stats: Dict) -> List[LLMFirstViolation]:
+        """Scan one changed file's touched lines, reading its new blob through reader; returns unreported findings"""
+        data = reader.read(change.new_blob) if change.new_blob else None
+        if data is not None:
+            lines = self.blob_lines(file_path, data)
+            if lines is None:
+                return []
+            selected = change.lines_to_scan(context, len(lines))
+            numbered = [(line_num, lines[line_num - 1]) for line_num in selected]
+        else:
+            # Blob not in the repository - only the lines shown in the diff are known
+            line_count = max(change.lines, default=0)
+            lines = [change.lines.get(line_num, '\n') for line_num in range(1, line_count + 1)]
+            numbered = [(line_num, change.lines[line_num])
+                        for line_num in change.lines_to_scan(context) if line_num in change.lines]
+        
+        stats['files'] += 1
+        stats['bytes'] += sum(len(line) for _, line in numbered)
+        self.changed_lines_scanned += len(numbered)
+        if self.timings is not None:
+            self.timings.count('scan', files=1, bytes_read=len(data) if data is not None else 0)
+        
+        violations = self.scan_numbered_lines(file_path, numbered, len(lines))
+        if self.timings is not None:
+            self.timings.count('scan', matches=len(violations))
+        # Only some lines were scanned, so identical earlier lines are counted in the whole file
+        violations = self.unreported(repo_dir, violations, lines)
+        if violations:
+            pin_context(file_path, lines)
+        return violations
+    
+    def collect_entries(self, directory: str) -> List[Tuple[str, os.stat_result]]:
+        """(path, stat) of scannable files under directory in walk order
+        
+        Ignored directories are pruned before they are descended into, and
+        the stat taken during the walk is reused by the cache and the reader.
+        """
+        extensions = tuple(self.file_extensions)
+        return list(scandir_walk(directory, include_file=lambda entry: entry.name.endswith(extensions),
+                                 ignore=self.ignore_matcher(directory)))
+    
+    def scan_directory(self, directory: str, workers: int = 1) -> List[LLMFirstViolation]:
+        """Scan entire directory recursively
+        
+        With workers > 1 files are scanned in a process pool; findings are
+        merged back in walk order, so the result is identical to a serial scan.
+        """
+        all_violations = []
+        for violations in self.iter_scan(directory, workers):
+            all_violations.extend(violations)
         return all_violations
     
+    def iter_scan(self, directory: str, workers: int = 1) -> Iterator[List[LLMFirstViolation]]:
+        """Scan a directory, yielding each file's findings in walk order as soon as they are known"""
+        for _, violations in self.iter_scan_repositories([directory], workers):
+            yield violations
+    
+    def iter_scan_repositories(self, directories: List[str],
+                               workers: int = 1) -> Iterator[Tuple[str, List[LLMFirstViolation]]]:
+        """Scan several repositories as one job, yielding (repository, findings) per file
+        
+        The repositories are walked concurrently and their files are scanned
+        as a single list through one reader/worker pool, so adding a
+        repository adds its files, not another sequential pass. Findings
+        come in walk order, repository by repository; per-repository
+        counters and timings are kept in repository_stats.
+        """
+        directories = [directory for directory in directories if os.path.isdir(directory)]
+        
+        def walk(directory: str) -> Tuple[List[Tuple[str, os.stat_result]], float]:
+            start = time.perf_counter()
+            return self.collect_entries(directory), time.perf_counter() - start
+        
+        entries = []
+        owners = []
+        with self.timings.phase('walk') if self.timings is not None else nullcontext({}) as walk_phase:
+            for directory, (repository_entries, seconds) in zip(directories, read_ahead(directories, walk, self.io_threads)):
+                stats = self.repository_stats.setdefault(directory, new_repository_stats())
+                stats['walk_seconds'] += seconds
+                entries.extend(repository_entries)
+                owners.extend([directory] * len(repository_entries))
+            if self.shard is not None:
+                entries, owners = self.select_shard(entries, owners)
+            for (_, stat), directory in zip(entries, owners):
+                self.repository_stats[directory]['files'] += 1
+                self.repository_stats[directory]['bytes'] += stat.st_size
+            if self.timings is not None:
+                walk_phase['files'] += len(entries)
+        
+        if workers > 1 and len(entries) > 1:
+            results = self.iter_scan_parallel(entries, workers)
+        else:
+            results = self.iter_scan_serial(entries)
+        
+        if self.timings is not None:
+            results = self.timings.timed_iter('scan', results)
+        
+        start = time.perf_counter()
+        for directory, violations in zip(owners, results):
+            violations = self.unreported(directory, violations)
+            stats = self.repository_stats[directory]
+            for violation in violations:
+                stats['by_severity'][violation.severity] += 1
+            # In the shared pool a repository's scan time is when its last file was done
+            stats['scan_seconds'] = time.perf_counter() - start
+            yield directory, violations
+        
+        if self.cache is not None:
+            self.cache.save()
+    
+    def unreported(self, directory: str, violations: List[LLMFirstViolation],
+                   lines: Optional[List[str]] = None) -> List[LLMFirstViolation]:
+        """Findings of one file not in the baseline, dropped before any context is read or rendered
+        
+        Fingerprints use the repository name and repository-relative path,
+        the rule pattern and the code line, as select_shard keys files.
+        Identical lines breaking the same rule are numbered in file order,
+        so a new copy of a known line is still reported. violations must
+        cover the whole file unless lines (the full file) is given.
+        """
+        if self.baseline is None or not violations:
+            return violations
+        repository = os.path.basename(directory)
+        earlier: Dict[str, List[int]] = {}
+        if lines is not None:
+            # Line numbers of every line whose code a finding has, to count identical lines before it
+            codes = {normalize_code(violation.code) for violation in violations}
+            for line_num, line in enumerate(lines, 1):
+                code = normalize_code(line)
+                if code in codes:
+                    earlier.setdefault(code, []).append(line_num)
+        
+        occurrences: Dict[Tuple[str, str], int] = {}
+        reported = []
+        for violation in violations:
+            code = normalize_code(violation.code)
+            if lines is None:
+                key = (violation.pattern, code)
+                occurrence = occurrences.get(key, 0)
+                occurrences[key] = occurrence + 1
+            else:
+                occurrence = sum(
+                    1 for line_num in earlier[code] if line_num < violation.line
+                    and any(pattern == violation.pattern for _, pattern, _ in self.match_line(lines[line_num - 1]))
+                )
+            if not self.baseline.known(fingerprint(
+                os.path.join(repository, os.path.relpath(violation.file, directory)),
+                violation.pattern, code, occurrence
+            )):
+                reported.append(violation)
+        return reported
+    
+    def select_shard(self, entries: List[Tuple[str, os.stat_result]],
+                     owners: List[str]) -> Tuple[List[Tuple[str, os.stat_result]], List[str]]:
+        """This shard's entries and owners, keeping walk order
+        
+        Files are keyed by repository name and repository-relative path, so
+        jobs with different workspace paths agree on the partition.
+        """
+        index, count = self.shard
+        keys = [
+            (os.path.join(os.path.basename(directory), os.path.relpath(file_path, directory)), stat.st_size)
+            for (file_path, stat), directory in zip(entries, owners)
+        ]
+        kept = [position for position, shard in enumerate(assign_shards(keys, count)) if shard == index]
+        self.file_positions = {entries[position][0]: position for position in kept}
+        return [entries[position] for position in kept], [owners[position] for position in kept]
+    
+    def repository_report(self) -> Dict[str, Dict]:
+        """Per-repository section of the report: totals, score and timings"""
+        return {
+            directory: {
+                'files': stats['files'],
+                'bytes': stats['bytes'],
+                'total_violations': sum(stats['by_severity'].values()),
+                'by_severity': dict(stats['by_severity']),
+                'compliance_score': compute_compliance_score(stats['by_severity']),
+                'walk_seconds': round(stats['walk_seconds'], 6),
+                'scan_seconds': round(stats['scan_seconds'], 6)
+            }
+            for directory, stats in self.repository_stats.items()
+        }
+    
+    def iter_scan_serial(self, entries: List[Tuple[str, os.stat_result]]) -> Iterator[List[LLMFirstViolation]]:
+        """Scan files in this process while io_threads reader threads read ahead"""
+        # Files the cache answers from stat data alone are never read
+        fresh = set()
+        if self.cache is not None:
+            fresh = {file_path for file_path, stat in entries
+                     if self.cache.is_fresh(file_path, stat.st_size, stat.st_mtime_ns)}
+        
+        def load(entry: Tuple[str, os.stat_result]) -> Optional[Tuple]:
+            file_path, stat = entry
+            return None if file_path in fresh else self.load_file(file_path, stat)
+        
+        for (file_path, stat), loaded in zip(entries, read_ahead(entries, load, self.io_threads)):
+            yield self.scan_path(file_path, stat, loaded)
+    
+    def iter_scan_parallel(self, entries: List[Tuple[str, os.stat_result]], workers: int) -> Iterator[List[LLMFirstViolation]]:
+        """Scan files across a process pool in size-balanced chunks
+        
+        Results are buffered only until every earlier file is done, then
+        yielded in walk order.
+        """
+        ready: Dict[int, List[LLMFirstViolation]] = {}
+        next_index = 0
+        
+        def drain() -> Iterator[List[LLMFirstViolation]]:
+            nonlocal next_index
+            while next_index in ready:
+                yield ready.pop(next_index)
+                next_index += 1
+        
+        # Cached files are resolved here; only the rest are sent to workers
+        pending = []
+        for index, (file_path, stat) in enumerate(entries):
+            cached = self.cached_findings(file_path, stat) if self.cache is not None else None
+            if cached is None:
+                pending.append(index)
+            else:
+                ready[index] = cached
+                yield from drain()
+        
+        if not pending:
+            return
+        
+        sizes = {index: entries[index][1].st_size for index in pending}
+        chunks = balance_chunks(pending, sizes, workers * CHUNKS_PER_WORKER)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(self.violation_patterns, self.generated_detector,
+                                           self.timings is not None, self.io_threads)) as executor:
+            futures = {
+                executor.submit(_scan_chunk, [entries[index] for index in chunk]): chunk
+                for chunk in chunks
+            }
+            for future in as_completed(futures):
+                chunk = futures[future]
+                results, timings = future.result()
+                if timings is not None:
+                    self.timings.merge(timings)
+                for index, (violations, fingerprint, skip_reason) in zip(chunk, results):
+                    self.record_scan(entries[index][0], violations, fingerprint, skip_reason)
+                    ready[index] = violations
+                yield from drain()
+    
     def generate_report(self, violations: List[LLMFirstViolation]) -> Dict:
         """Generate comprehensive compliance report"""
         # Group violations by severity
@@ -163,83 +810,455 @@ class LLMFirstScanner:
         
         # Calculate compliance score
         total_violations = len(violations)
-        critical_violations = len(by_severity['CRITICAL'])
-        high_violations = len(by_severity['HIGH'])
+        compliance_score = compute_compliance_score({k: len(v) for k, v in by_severity.items()})
         
-        # Compliance score: penalize critical/high violations more
-        penalty_score = (critical_violations * 10) + (high_violations * 5) + \
-                       (len(by_severity['MEDIUM']) * 2) + len(by_severity['LOW'])
+        # Convert violations to serializable format for the report (context is read here)
+        serializable_violations = [violation.to_dict() for violation in violations]
         
-        # Score out of 100 (lower penalty = higher score)
-        max_penalty = total_violations * 10  # If all were critical
-        compliance_score = max(0, 100 - (penalty_score / max(1, max_penalty) * 100))
-        
-        # Convert violations to serializable format for the report
-        serializable_violations = []
-        for violation in violations:
-            serializable_violations.append({
-                'file': violation.file,
-                'line': violation.line,
-                'code': violation.code,
-                'severity': violation.severity,
-                'pattern': violation.pattern,
-                'suggestion': violation.suggestion,
-                'context': violation.context
-            })
-        
-        return {
+        report = {
             'total_violations': total_violations,
             'by_severity': {k: len(v) for k, v in by_severity.items()},
             'by_file': {k: len(v) for k, v in by_file.items()},
-            'compliance_score': round(compliance_score, 1),
+            'compliance_score': compliance_score,
             'violations': serializable_violations,
             'violations_objects': violations,  # Keep original objects for processing
-            'top_violating_files': sorted(by_file.items(), key=lambda x: len(x[1]), reverse=True)[:10]
+            'skipped_files': self.generated_detector.summary() if self.generated_detector else {},
+            'top_violating_files': sorted(by_file.items(), key=lambda x: len(x[1]), reverse=True)[:10],
+            'repositories': self.repository_report()
         }
+        if self.timings is not None:
+            report['timings'] = self.timings.to_dict()
+        if self.baseline is not None:
+            report['baseline_suppressed'] = self.baseline.suppressed
+        if self.shard is not None:
+            # Where this shard's files sit in the full walk, so a merge can restore the order
+            report['shard'] = {
+                'index': self.shard[0],
+                'count': self.shard[1],
+                'file_positions': {path: self.file_positions[path] for path in by_file}
+            }
+        return report
     
     def save_report(self, report: Dict, output_file: str):
         """Save report to JSON file"""
-        # Create new report without original violation objects
-        report_data = {
-            'total_violations': report['total_violations'],
-            'by_severity': report['by_severity'],
-            'by_file': report['by_file'],
-            'compliance_score': report['compliance_score'],
-            'top_violating_files': report['top_violating_files'],
-            'violations': report['violations']  # Already serializable
+        with open(output_file, 'w') as f:
+            json.dump(serializable_report(report), f, indent=2)
+
+def serializable_report(report: Dict) -> Dict:
+    """A report without the original violation objects, as save_report() writes it"""
+    report_data = {
+        'total_violations': report['total_violations'],
+        'by_severity': report['by_severity'],
+        'by_file': report['by_file'],
+        'compliance_score': report['compliance_score'],
+        # (file, violation count) - generate_report keeps the violation objects here
+        'top_violating_files': [
+            [path, len(found) if isinstance(found, list) else found]
+            for path, found in report['top_violating_files']
+        ],
+        'skipped_files': report['skipped_files'],
+        'repositories': report.get('repositories', {}),
+        'violations': report['violations']  # Already serializable
+    }
+    if 'timings' in report:
+        report_data['timings'] = report['timings']
+    if 'baseline_suppressed' in report:
+        report_data['baseline_suppressed'] = report['baseline_suppressed']
+    if 'shard' in report:
+        report_data['shard'] = report['shard']
+    return report_data
+
+def merge_shard_reports(shard_reports: List[Dict]) -> Dict:
+    """Combine the JSON reports of a complete shard set into the report of a single run
+    
+    Findings are put back in full-walk order and every total, score and
+    top-file list is recomputed from them; per-repository file and byte
+    counts add up, walk and scan times are the slowest shard's. Raises
+    ValueError if the set is incomplete or mixes shard counts.
+    """
+    validate_shard_set((report['shard']['index'], report['shard']['count']) for report in shard_reports)
+    
+    ordered = []
+    for report in shard_reports:
+        positions = report['shard']['file_positions']
+        for sequence, finding in enumerate(report['violations']):
+            ordered.append((positions[finding['file']], sequence, finding))
+    ordered.sort(key=lambda item: item[:2])
+    violations = [finding for _, _, finding in ordered]
+    
+    by_severity = {'CRITICAL': 0, 'HIGH': 0, 'MEDIUM': 0, 'LOW': 0}
+    by_file = {}
+    for finding in violations:
+        by_severity[finding['severity']] += 1
+        by_file[finding['file']] = by_file.get(finding['file'], 0) + 1
+    
+    skipped_files = {}
+    repositories = {}
+    timings = TimingRecorder()
+    for report in shard_reports:
+        for reason, count in report['skipped_files'].items():
+            skipped_files[reason] = skipped_files.get(reason, 0) + count
+        for directory, section in report.get('repositories', {}).items():
+            merged = repositories.setdefault(directory, {
+                'files': 0, 'bytes': 0, 'by_severity': {'CRITICAL': 0, 'HIGH': 0, 'MEDIUM': 0, 'LOW': 0},
+                'walk_seconds': 0.0, 'scan_seconds': 0.0
+            })
+            merged['files'] += section['files']
+            merged['bytes'] += section['bytes']
+            for severity, count in section['by_severity'].items():
+                merged['by_severity'][severity] += count
+            merged['walk_seconds'] = max(merged['walk_seconds'], section['walk_seconds'])
+            merged['scan_seconds'] = max(merged['scan_seconds'], section['scan_seconds'])
+        if 'timings' in report:
+            timings.merge(report['timings'])
+    
+    report = {
+        'total_violations': len(violations),
+        'by_severity': by_severity,
+        'by_file': by_file,
+        'compliance_score': compute_compliance_score(by_severity),
+        'violations': violations,
+        'skipped_files': dict(sorted(skipped_files.items())),
+        'top_violating_files': sorted(by_file.items(), key=lambda x: x[1], reverse=True)[:10],
+        'repositories': {
+            directory: {
+                'files': section['files'],
+                'bytes': section['bytes'],
+                'total_violations': sum(section['by_severity'].values()),
+                'by_severity': section['by_severity'],
+                'compliance_score': compute_compliance_score(section['by_severity']),
+                'walk_seconds': section['walk_seconds'],
+                'scan_seconds': section['scan_seconds']
+            }
+            for directory, section in repositories.items()
         }
-        
+    }
+    if any('timings' in shard_report for shard_report in shard_reports):
+        report['timings'] = timings.to_dict()
+    if any('baseline_suppressed' in shard_report for shard_report in shard_reports):
+        report['baseline_suppressed'] = sum(shard_report.get('baseline_suppressed', 0)
+                                            for shard_report in shard_reports)
+    return serializable_report(report)
+
+def new_repository_stats() -> Dict:
+    return {
+        'files': 0, 'bytes': 0, 'walk_seconds': 0.0, 'scan_seconds': 0.0,
+        'by_severity': {'CRITICAL': 0, 'HIGH': 0, 'MEDIUM': 0, 'LOW': 0}
+    }
+
+def compute_compliance_score(by_severity: Dict[str, int]) -> float:
+    """Compliance score out of 100 from per-severity violation counts"""
+    total_violations = sum(by_severity.values())
+    
+    # Compliance score: penalize critical/high violations more
+    penalty_score = (by_severity.get('CRITICAL', 0) * 10) + (by_severity.get('HIGH', 0) * 5) + \
+                   (by_severity.get('MEDIUM', 0) * 2) + by_severity.get('LOW', 0)
+    
+    # Score out of 100 (lower penalty = higher score)
+    max_penalty = total_violations * 10  # If all were critical
+    compliance_score = max(0, 100 - (penalty_score / max(1, max_penalty) * 100))
+    return round(compliance_score, 1)
+
+class StreamingReport:
+    """Writes findings as NDJSON while they are produced
+    
+    Only running counters are kept, so memory stays flat no matter how many
+    findings a scan produces, and consumers can tail the output mid-scan.
+    """
+    
+    def __init__(self, output: TextIO):
+        self.output = output
+        self.total_violations = 0
+        self.by_severity = {'CRITICAL': 0, 'HIGH': 0, 'MEDIUM': 0, 'LOW': 0}
+        self.by_file = {}
+    
+    def add(self, violations: List[LLMFirstViolation]):
+        """Write one file's findings (one JSON object per line) and update counters"""
+        for violation in violations:
+            self.output.write(json.dumps(violation.to_dict()) + '\n')
+            self.total_violations += 1
+            self.by_severity[violation.severity] += 1
+            self.by_file[violation.file] = self.by_file.get(violation.file, 0) + 1
+        if violations:
+            self.output.flush()
+    
+    def summary(self) -> Dict:
+        """Report totals in the same shape as generate_report, without the findings"""
+        return {
+            'total_violations': self.total_violations,
+            'by_severity': dict(self.by_severity),
+            'by_file': dict(self.by_file),
+            'compliance_score': compute_compliance_score(self.by_severity),
+            'top_violating_files': sorted(self.by_file.items(), key=lambda x: x[1], reverse=True)[:10]
+        }
+
+# Files are grouped into several chunks per worker so one large file cannot stall the pool
+CHUNKS_PER_WORKER = 4
+
+_worker_scanner = None
+
+def _init_worker(violation_patterns: Dict, generated_detector: Optional[GeneratedFileDetector],
+                 timing: bool = False, io_threads: int = DEFAULT_IO_THREADS):
+    """Process pool initializer: build one scanner per worker process"""
+    global _worker_scanner
+    _worker_scanner = LLMFirstScanner(timing=timing, io_threads=io_threads)
+    _worker_scanner.violation_patterns = violation_patterns
+    _worker_scanner.generated_detector = generated_detector
+    _worker_scanner.compile_rules()
+
+def _scan_chunk(entries: List[Tuple[str, os.stat_result]]) -> Tuple[List[Tuple], Optional[Dict]]:
+    """Process pool task: scan a chunk of (path, stat) entries; returns results and the chunk's timings"""
+    loaded = read_ahead(entries, lambda entry: _worker_scanner.load_file(*entry), _worker_scanner.io_threads)
+    results = [_worker_scanner.scan_loaded(file_path, data) for (file_path, _), data in zip(entries, loaded)]
+    timings = _worker_scanner.timings
+    if timings is None:
+        return results, None
+    snapshot = timings.snapshot()
+    timings.reset()
+    return results, snapshot
+
+def balance_chunks(items: List[int], sizes: Dict[int, int], chunk_count: int) -> List[List[int]]:
+    """Split items into chunks of roughly equal total size (largest first, greedy)"""
+    chunk_count = max(1, min(chunk_count, len(items)))
+    heap = [(0, chunk_id) for chunk_id in range(chunk_count)]
+    chunks = [[] for _ in range(chunk_count)]
+    
+    for item in sorted(items, key=lambda i: sizes[i], reverse=True):
+        total, chunk_id = heapq.heappop(heap)
+        chunks[chunk_id].append(item)
+        heapq.heappush(heap, (total + sizes[item], chunk_id))
+    
+    return [chunk for chunk in chunks if chunk]
+
+def run_streaming_scan(scanner: LLMFirstScanner, batches: Iterable[List[LLMFirstViolation]],
+                       output: TextIO) -> Dict:
+    """Write each batch of findings to output as NDJSON while scanning; returns the report summary"""
+    stream = StreamingReport(output)
+    for violations in batches:
+        stream.add(violations)
+    
+    report = stream.summary()
+    report['repositories'] = scanner.repository_report()
+    report['skipped_files'] = scanner.generated_detector.summary() if scanner.generated_detector else {}
+    if scanner.timings is not None:
+        report['timings'] = scanner.timings.to_dict()
+    if scanner.baseline is not None:
+        report['baseline_suppressed'] = scanner.baseline.suppressed
+    return report
+
+def merge_shards_command(shard_files: List[str], output_file: Optional[str]) -> Optional[Dict]:
+    """Merge shard JSON reports into output_file (stdout if None)"""
+    shard_reports = []
+    for shard_file in shard_files:
+        with open(shard_file, 'r', encoding='utf-8') as f:
+            shard_reports.append(json.load(f))
+        if 'shard' not in shard_reports[-1]:
+            print(f"{shard_file} is not the --json output of a --shard run", file=sys.stderr)
+            return None
+    
+    try:
+        report = merge_shard_reports(shard_reports)
+    except ValueError as e:
+        print(f"Cannot merge shards: {e}", file=sys.stderr)
+        return None
+    
+    if output_file:
         with open(output_file, 'w') as f:
-            json.dump(report_data, f, indent=2)
+            json.dump(report, f, indent=2)
+        print(f"Merged {len(shard_reports)} shards: {report['total_violations']} violations, "
+              f"compliance score {report['compliance_score']}/100 -> {output_file}")
+    else:
+        json.dump(report, sys.stdout, indent=2)
+    return report
+
+# Repositories scanned when none are named on the command line
+DEFAULT_ROOT = '/mnt/c/Users/HP/ava-olo-constitutional'
+DEFAULT_SCAN_PATHS = [
+    f'{DEFAULT_ROOT}/ava-olo-agricultural-core',
+    f'{DEFAULT_ROOT}/ava-olo-monitoring-dashboards'
+]
 
-def main():
+def main(argv: Optional[List[str]] = None):
     """Main scanner execution"""
-    scanner = LLMFirstScanner()
-    
-    # Scan both agricultural and monitoring repositories
-    scan_paths = [
-        '/mnt/c/Users/HP/ava-olo-constitutional/ava-olo-agricultural-core',
-        '/mnt/c/Users/HP/ava-olo-constitutional/ava-olo-monitoring-dashboards'
-    ]
-    
-    all_violations = []
-    for path in scan_paths:
-        if os.path.exists(path):
-            print(f"Scanning {path}...")
-            violations = scanner.scan_directory(path)
+    parser = argparse.ArgumentParser(description='LLM-First Compliance Scanner')
+    parser.add_argument('repos', nargs='*',
+                        help='Repositories to scan (default: agricultural-core and monitoring-dashboards)')
+    parser.add_argument('--all-repos', action='store_true',
+                        help='Scan every ava-olo-* repository under --root')
+    parser.add_argument('--root', default=DEFAULT_ROOT,
+                        help='Directory containing the ava-olo-* repositories (with --all-repos)')
+    parser.add_argument('--cache-file', help='Persistent findings cache; unchanged files are not rescanned')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Scan files in a pool of N processes (0 = one per CPU core)')
+    parser.add_argument('--include-generated', action='store_true',
+                        help='Also scan minified, bundled and generated files')
+    parser.add_argument('--ndjson', metavar='PATH',
+                        help="Stream findings to PATH as NDJSON while scanning ('-' for stdout); "
+                             "only counters are kept in memory")
+    parser.add_argument('--timing', action='store_true',
+                        help='Record wall time, files, bytes and matches per phase and per rule')
+    parser.add_argument('--timing-json', metavar='PATH',
+                        help='Write the timings to PATH as JSON (implies --timing)')
+    parser.add_argument('--io-threads', type=int, default=DEFAULT_IO_THREADS,
+                        help=f'Overlap up to N file reads (default: {DEFAULT_IO_THREADS}; 1 = serial reads)')
+    changes = parser.add_mutually_exclusive_group()
+    changes.add_argument('--diff', metavar='PATH',
+                         help="Only scan lines added or touched by the unified diff in PATH ('-' for stdin); "
+                              "the first repo (default: current directory) is the git repository")
+    changes.add_argument('--git-range', metavar='RANGE',
+                         help='Only scan lines changed in RANGE (A..B, A...B, or REV for REV..HEAD)')
+    changes.add_argument('--staged', action='store_true',
+                         help='Pre-commit mode: scan the staged version of staged files, read from the '
+                              'git index of the first repo (default: current directory); exits 1 on findings')
+    parser.add_argument('--hunk-context', type=int, default=DEFAULT_HUNK_CONTEXT, metavar='N',
+                        help=f'Unchanged lines scanned on each side of a change with --diff/--git-range '
+                             f'(default: {DEFAULT_HUNK_CONTEXT})')
+    parser.add_argument('--json', metavar='PATH', help='Write the JSON report to PATH')
+    parser.add_argument('--shard', type=shard_argument, metavar='I/N',
+                        help='Only scan shard I of N (deterministic, size-balanced by path); '
+                             'the --json outputs of all shards combine with --merge-shards')
+    parser.add_argument('--baseline', metavar='PATH',
+                        help='Suppress findings whose fingerprint (path, rule, normalized code line) '
+                             'is in the baseline file at PATH; only new findings are reported')
+    parser.add_argument('--update-baseline', action='store_true',
+                        help='After a full scan, rewrite the --baseline file with every current finding')
+    parser.add_argument('--merge-shards', nargs='+', metavar='JSON',
+                        help='Merge the --json outputs of a complete shard set into the report of a '
+                             'single run, written to --json (default: stdout); nothing is scanned')
+    args = parser.parse_args(argv)
+    
+    if args.merge_shards:
+        return merge_shards_command(args.merge_shards, args.json)
+    if args.shard and not args.json:
+        parser.error('--shard needs --json for the shard output')
+    if args.shard and (args.diff or args.git_range or args.staged or args.ndjson):
+        parser.error('--shard cannot be combined with --diff, --git-range, --staged or --ndjson')
+    if args.update_baseline and not args.baseline:
+        parser.error('--update-baseline needs --baseline')
+    if args.update_baseline and (args.shard or args.diff or args.git_range or args.staged):
+        parser.error('--update-baseline needs a full scan, not --shard, --diff, --git-range or --staged')
+    baseline = None
+    if args.baseline:
+        try:
+            baseline = Baseline.load(args.baseline)
+        except FileNotFoundError:
+            if not args.update_baseline:
+                parser.error(f'baseline file {args.baseline} does not exist (create it with --update-baseline)')
+            baseline = Baseline()
+        except (OSError, ValueError) as e:
+            parser.error(f'cannot read baseline {args.baseline}: {e}')
+    workers = args.workers or os.cpu_count() or 1
+    
+    # Diff findings depend on the hunks, so diff scans neither use nor prune the cache
+    diff_scan = bool(args.diff or args.git_range or args.staged)
+    scanner = LLMFirstScanner(cache_file=None if diff_scan else args.cache_file,
+                              skip_generated=not args.include_generated,
+                              timing=args.timing or bool(args.timing_json), io_threads=args.io_threads,
+                              shard=args.shard, baseline=baseline)
+    
+    # All repositories are scanned together through one shared pool
+    if args.all_repos:
+        scan_paths = find_repositories(args.root) + args.repos
+    else:
+        scan_paths = args.repos or DEFAULT_SCAN_PATHS
+    
+    # Keep stdout clean for the findings when streaming to it
+    log = sys.stderr if args.ndjson == '-' else sys.stdout
+    
+    if diff_scan:
+        # Diff scans are small and evaluated up front
+        repo_dir = os.path.abspath(args.repos[0] if args.repos else '.')
+        if args.staged:
+            try:
+                batches = [scanner.scan_staged(repo_dir)]
+            except RuntimeError as e:
+                print(f"Could not read the index of {repo_dir}: {e}", file=sys.stderr)
+                sys.exit(2)
+        elif args.git_range:
+            print(f"Scanning {args.git_range} in {repo_dir}...", file=log)
+            try:
+                batches = [scanner.scan_git_range(repo_dir, args.git_range, args.hunk_context)]
+            except RuntimeError as e:
+                print(f"Could not diff {args.git_range}: {e}", file=sys.stderr)
+                return None
+        elif args.diff == '-':
+            print(f"Scanning diff from stdin against {repo_dir}...", file=log)
+            batches = [scanner.scan_diff(repo_dir, sys.stdin, args.hunk_context)]
+        else:
+            print(f"Scanning {args.diff} against {repo_dir}...", file=log)
+            with open(args.diff, 'r', encoding='utf-8', errors='surrogateescape') as f:
+                batches = [scanner.scan_diff(repo_dir, f, args.hunk_context)]
+        if not args.staged:
+            print(f"Evaluated {scanner.changed_lines_scanned} changed and context lines", file=log)
+    else:
+        print(f"Scanning {len(scan_paths)} repositories...", file=log)
+        batches = (violations for _, violations in scanner.iter_scan_repositories(scan_paths, workers))
+    
+    if args.ndjson:
+        if args.ndjson == '-':
+            report = run_streaming_scan(scanner, batches, sys.stdout)
+        else:
+            with open(args.ndjson, 'w', encoding='utf-8') as output:
+                report = run_streaming_scan(scanner, batches, output)
+    else:
+        all_violations = []
+        for violations in batches:
             all_violations.extend(violations)
-            print(f"Found {len(violations)} violations in {path}")
-    
-    # Generate comprehensive report
-    report = scanner.generate_report(all_violations)
-    
-    print(f"\n=== LLM-FIRST COMPLIANCE REPORT ===")
-    print(f"Total Violations: {report['total_violations']}")
-    print(f"Compliance Score: {report['compliance_score']}/100")
-    print(f"Critical: {report['by_severity']['CRITICAL']}")
-    print(f"High: {report['by_severity']['HIGH']}")
-    print(f"Medium: {report['by_severity']['MEDIUM']}")
-    print(f"Low: {report['by_severity']['LOW']}")
+        
+        # Generate comprehensive report
+        report = scanner.generate_report(all_violations)
+    
+    if scanner.cache is not None:
+        if args.shard is None:  # Other shards' files were not touched, not deleted
+            scanner.cache.discard_untouched()
+        scanner.cache.save()
+        print(f"Cache: {scanner.cache.hits} unchanged files reused, {scanner.cache.misses} rescanned", file=log)
+    
+    for path, section in report['repositories'].items():
+        print(f"Found {section['total_violations']} violations in {path} "
+              f"({section['files']} files, walk {section['walk_seconds']:.2f}s, "
+              f"done after {section['scan_seconds']:.2f}s)", file=log)
+    
+    print(f"\n=== LLM-FIRST COMPLIANCE REPORT ===", file=log)
+    print(f"Total Violations: {report['total_violations']}", file=log)
+    print(f"Compliance Score: {report['compliance_score']}/100", file=log)
+    print(f"Critical: {report['by_severity']['CRITICAL']}", file=log)
+    print(f"High: {report['by_severity']['HIGH']}", file=log)
+    print(f"Medium: {report['by_severity']['MEDIUM']}", file=log)
+    print(f"Low: {report['by_severity']['LOW']}", file=log)
+    for reason, count in report['skipped_files'].items():
+        print(f"Skipped ({reason}): {count}", file=log)
+    if baseline is not None:
+        print(f"Known (baseline): {baseline.suppressed}", file=log)
+        if args.update_baseline:
+            baseline.save(args.baseline)
+            print(f"Baseline of {len(baseline.seen)} fingerprints written to {args.baseline}", file=log)
+    
+    if scanner.timings is not None:
+        print(f"\n=== TIMINGS ===", file=log)
+        print(scanner.timings.markdown_table(), file=log)
+        if args.timing_json:
+            scanner.timings.save_json(args.timing_json)
+            print(f"Timings written to {args.timing_json}", file=log)
+    
+    if args.json:
+        if args.ndjson:
+            # Streaming keeps only the summary
+            with open(args.json, 'w') as f:
+                json.dump(report, f, indent=2)
+        else:
+            scanner.save_report(report, args.json)
+        print(f"JSON report written to {args.json}", file=log)
+    
+    if args.staged:
+        # Pre-commit hooks read the exit status
+        if not args.ndjson:
+            for violation in report['violations_objects']:
+                print(f"{violation.file}:{violation.line}: {violation.severity} {violation.suggestion}", file=log)
+        sys.exit(1 if report['total_violations'] else 0)
+    
+    if args.ndjson:
+        return report
     
     # Save detailed report (skip JSON for now due to serialization)
     output_dir = '/mnt/c/Users/HP/ava-olo-constitutional/ava-olo-shared/llm_first_audit'
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+LLMFirstScanner diff scan tests
+Diff paths are relative to the repository's top level, whatever directory is scanned
+"""
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from llm_first_scanner import LLMFirstScanner
+
+
+@pytest.fixture
+def repo(tmp_path, git):
+    """Repository with the same file in two subdirectories, both changed by the last commit"""
+    git(tmp_path, 'init', '-q')
+    for name in ('service', 'other'):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / 'alerts.py').write_text('def alert():\n    pass\n')
+    git(tmp_path, 'add', '.')
+    git(tmp_path, 'commit', '-q', '-m', 'base')
+    for name in ('service', 'other'):
+        (tmp_path / name / 'alerts.py').write_text(
+            'def alert():\n    pass\n    if notification_ready: send()\n')
+    git(tmp_path, 'commit', '-q', '-am', 'notify')
+    return tmp_path
+
+
+def test_range_scan_at_top_level(repo):
+    scanner = LLMFirstScanner(cache_file=None)
+    violations = scanner.scan_git_range(str(repo), 'HEAD~1')
+    assert sorted(v.file for v in violations) == [
+        os.path.join(str(repo), 'other', 'alerts.py'),
+        os.path.join(str(repo), 'service', 'alerts.py'),
+    ]
+    assert {v.line for v in violations} == {3}
+
+
+def test_range_scan_of_subdirectory(repo):
+    scanner = LLMFirstScanner(cache_file=None)
+    subdirectory = str(repo / 'service')
+    violations = scanner.scan_git_range(subdirectory, 'HEAD~1')
+    assert [(v.file, v.line, v.severity) for v in violations] == [
+        (os.path.join(subdirectory, 'alerts.py'), 3, 'LOW')
+    ]
+    assert 'notification_ready' in violations[0].context
+
+
+def test_stdin_diff_of_subdirectory(repo, git):
+    # `git diff` run anywhere in the repository names files from the top level
+    diff = git(repo / 'service', 'diff', '--full-index', 'HEAD~1')
+    scanner = LLMFirstScanner(cache_file=None)
+    subdirectory = str(repo / 'service')
+    violations = scanner.scan_diff(subdirectory, diff.splitlines(keepends=True))
+    assert [(v.file, v.line) for v in violations] == [(os.path.join(subdirectory, 'alerts.py'), 3)]
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+LLMFirstScanner.match_line tests
+The combined prefilter must classify lines exactly like checking every rule with re
+"""
+import re
+import sys
+import random
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from llm_first_scanner import LLMFirstScanner
+
+# Fragments of the rule patterns, recombined into lines that match several severities at once
+TOKENS = ['if', 'elif', 'else', 'crop', 'country', '==', '!=', "'italy'", 'def', 'recommend',
+          'return', 'interpret', 'classify', 'validate', 'priority', '=', 'urgent', 'status',
+          'condition', 'notification', 'send', 'format', 'output', 'risk', 'high', 'medium',
+          'language', "'english'", '.lower()', 'in', 'list', 'RULES', '{x}', ':', '(', ')']
+
+
+def reference(scanner: LLMFirstScanner, line: str):
+    """First matching rule of each severity, as the scanner did before the combined matcher"""
+    found = []
+    for severity, patterns in scanner.violation_patterns.items():
+        for pattern, suggestion in patterns:
+            if re.search(pattern, line, re.IGNORECASE):
+                found.append((severity, pattern, suggestion))
+                break
+    return found
+
+
+@pytest.fixture(scope='module')
+def scanner():
+    return LLMFirstScanner(skip_generated=False)
+
+
+def test_one_finding_per_matching_severity(scanner):
+    line = 'x = 1 if crop == 1 else 2; elif crop elif crop elif elif'
+    assert [severity for severity, _, _ in scanner.match_line(line)] == ['CRITICAL', 'HIGH']
+
+
+def test_lines_without_leading_atoms_are_rejected(scanner):
+    assert scanner.match_line('total = price * quantity') == []
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_matches_reference_on_random_lines(scanner, seed):
+    rng = random.Random(seed)
+    for _ in range(400):
+        line = ' '.join(rng.choice(TOKENS) for _ in range(rng.randint(1, 14)))
+        assert scanner.match_line(line) == reference(scanner, line), line
+
+
+def test_timed_rules_classify_the_same(scanner):
+    timed = LLMFirstScanner(skip_generated=False, timing=True)
+    line = 'def recommend(crop): return a if crop == 1 elif b elif c elif d'
+    assert timed.match_line(line) == scanner.match_line(line) == reference(scanner, line)
@@ -0,0 +1,478 @@
+#!/usr/bin/env python3
+"""
+AVA OLO Audit AST Pass
+Parses each file once and feeds a single traversal to every registered check
+"""
+import ast
+from typing import Dict, List, Optional, Set, Tuple
+
+
+class AstFacts:
+    """Everything the AST checks found in one file"""
+
+    def __init__(self):
+        self.try_except_count = 0
+        self.bare_except_count = 0
+        self.bare_except_lines: List[int] = []
+        self.proper_fallback_count = 0
+        # (line, description) of direct environment access
+        self.env_accesses: List[Tuple[int, str]] = []
+        # Absolute imported module names, e.g. 'sqlite3' or 'package.module'
+        self.imports: List[str] = []
+        # Top-level imported name -> lines importing it
+        self.import_lines: Dict[str, List[int]] = {}
+        # (line, source text) of hardcoded country/crop assignments, keywords and comparisons
+        self.hardcoded_literals: List[Tuple[int, str]] = []
+        # (line, value) of string constants that name a SQLite database or connection URL
+        self.sqlite_literals: List[Tuple[int, str]] = []
+        # requests/httpx calls, and (line, identifier, call) where personal data reaches one
+        self.http_calls = 0
+        self.personal_data_flows: List[Tuple[int, str, str]] = []
+
+    @property
+    def imported_roots(self) -> Set[str]:
+        return {name.split('.')[0] for name in self.imports}
+
+
+class AstCheck:
+    """Base class for checks fed by the shared traversal
+
+    Like ast.NodeVisitor, a check defines visit_<NodeType>(node) methods,
+    but it never walks the tree itself; the MultiVisitor calls it for each
+    node of that type and the check records into self.facts.
+    """
+
+    def __init__(self, facts: AstFacts, source: str):
+        self.facts = facts
+        self.source = source
+
+    def segment(self, node: ast.AST) -> str:
+        return ast.get_source_segment(self.source, node) or ''
+
+
+class ErrorHandlingCheck(AstCheck):
+    """try/except blocks, bare excepts and handlers with a fallback"""
+
+    def visit_Try(self, node: ast.Try):
+        self.facts.try_except_count += 1
+        for handler in node.handlers:
+            if handler.type is None:
+                self.facts.bare_except_count += 1
+                self.facts.bare_except_lines.append(handler.lineno)
+        for handler in node.handlers:
+            # Simple check for return or assignment in except
+            if any(isinstance(stmt, (ast.Return, ast.Assign)) for stmt in handler.body):
+                self.facts.proper_fallback_count += 1
+
+
+class EnvironmentAccessCheck(AstCheck):
+    """os.getenv(), os.environ[...] and os.environ.get(), including aliased imports"""
+
+    def __init__(self, facts: AstFacts, source: str):
+        super().__init__(facts, source)
+        self.os_names = {'os'}
+        self.environ_names = set()
+        self.getenv_names = set()
+
+    def visit_Import(self, node: ast.Import):
+        for alias in node.names:
+            if alias.name == 'os':
+                self.os_names.add(alias.asname or 'os')
+
+    def visit_ImportFrom(self, node: ast.ImportFrom):
+        if node.module == 'os' and not node.level:
+            for alias in node.names:
+                if alias.name == 'environ':
+                    self.environ_names.add(alias.asname or 'environ')
+                elif alias.name == 'getenv':
+                    self.getenv_names.add(alias.asname or 'getenv')
+
+    def is_environ(self, node: ast.AST) -> bool:
+        if isinstance(node, ast.Name):
+            return node.id in self.environ_names
+        return (isinstance(node, ast.Attribute) and node.attr == 'environ'
+                and isinstance(node.value, ast.Name) and node.value.id in self.os_names)
+
+    def visit_Call(self, node: ast.Call):
+        func = node.func
+        if isinstance(func, ast.Name) and func.id in self.getenv_names:
+            self.facts.env_accesses.append((node.lineno, 'getenv()'))
+        elif isinstance(func, ast.Attribute):
+            if (func.attr == 'getenv' and isinstance(func.value, ast.Name)
+                    and func.value.id in self.os_names):
+                self.facts.env_accesses.append((node.lineno, 'os.getenv()'))
+            elif func.attr == 'get' and self.is_environ(func.value):
+                self.facts.env_accesses.append((node.lineno, 'os.environ.get()'))
+
+    def visit_Subscript(self, node: ast.Subscript):
+        if self.is_environ(node.value):
+            self.facts.env_accesses.append((node.lineno, 'os.environ[]'))
+
+
+class ImportCheck(AstCheck):
+    """Absolute imports (cross-module and SQLite checks are derived from these)
+
+    Besides import statements (whatever alias they bind), modules loaded by
+    literal name through importlib.import_module() or __import__() count,
+    including when importlib or import_module are themselves aliased.
+    """
+
+    def __init__(self, facts: AstFacts, source: str):
+        super().__init__(facts, source)
+        self.importlib_names = {'importlib'}
+        self.import_function_names = {'__import__'}
+
+    def add(self, name: str, line: int):
+        self.facts.imports.append(name)
+        self.facts.import_lines.setdefault(name.split('.')[0], []).append(line)
+
+    def visit_Import(self, node: ast.Import):
+        for alias in node.names:
+            self.add(alias.name, node.lineno)
+            if alias.name == 'importlib':
+                self.importlib_names.add(alias.asname or 'importlib')
+
+    def visit_ImportFrom(self, node: ast.ImportFrom):
+        if node.module and not node.level:
+            self.add(node.module, node.lineno)
+            if node.module == 'importlib':
+                for alias in node.names:
+                    if alias.name == 'import_module':
+                        self.import_function_names.add(alias.asname or 'import_module')
+
+    def visit_Call(self, node: ast.Call):
+        func = node.func
+        if isinstance(func, ast.Name):
+            dynamic = func.id in self.import_function_names
+        else:
+            dynamic = (isinstance(func, ast.Attribute) and func.attr == 'import_module'
+                       and isinstance(func.value, ast.Name) and func.value.id in self.importlib_names)
+        if dynamic and node.args:
+            name = node.args[0]
+            if isinstance(name, ast.Constant) and isinstance(name.value, str) and not name.value.startswith('.'):
+                self.add(name.value, node.lineno)
+
+
+class HardcodedLiteralCheck(AstCheck):
+    """Hardcoded country/crop values assigned to, passed as or compared (==) with country/crop names"""
+
+    HARDCODED_VALUES = {
+        'country': {'croatia', 'hr'},
+        'crop': {'wheat', 'corn'},
+    }
+
+    # Calls that only normalize the value they are called on: farmer.country.lower()
+    NORMALIZING_METHODS = {'lower', 'upper', 'strip', 'lstrip', 'rstrip', 'casefold', 'title'}
+
+    def operand_name(self, node: ast.AST) -> Optional[str]:
+        """Name a value goes by: variable, attribute, constant subscript or .get() key, or called function"""
+        while isinstance(node, ast.Call):
+            func = node.func
+            if isinstance(func, ast.Attribute) and func.attr in self.NORMALIZING_METHODS:
+                node = func.value
+            elif isinstance(func, ast.Attribute) and func.attr == 'get' and node.args:
+                node = node.args[0]
+                return node.value if isinstance(node, ast.Constant) and isinstance(node.value, str) else None
+            elif isinstance(func, ast.Name):
+                return func.id  # get_country() == 'Croatia'
+            else:
+                return None
+        if isinstance(node, ast.Name):
+            return node.id
+        if isinstance(node, ast.Attribute):
+            return node.attr
+        if isinstance(node, ast.Subscript):
+            key = node.slice
+            if isinstance(key, ast.Constant) and isinstance(key.value, str):
+                return key.value
+        return None
+
+    def binds_hardcoded(self, name_node: ast.AST, value_node: ast.AST) -> bool:
+        name = self.operand_name(name_node)
+        return name is not None and self.is_hardcoded(name, value_node)
+
+    def is_hardcoded(self, name: str, value_node: ast.AST) -> bool:
+        if not (isinstance(value_node, ast.Constant) and isinstance(value_node.value, str)):
+            return False
+        name = name.lower()
+        return any(kind in name and value_node.value.lower() in values
+                   for kind, values in self.HARDCODED_VALUES.items())
+
+    def record(self, node: ast.AST, text: Optional[str] = None):
+        text = text or self.segment(node)
+        if all(text != known for _, known in self.facts.hardcoded_literals):
+            self.facts.hardcoded_literals.append((node.lineno, text))
+
+    def visit_Assign(self, node: ast.Assign):
+        if any(self.binds_hardcoded(target, node.value) for target in node.targets):
+            self.record(node)
+
+    def visit_AnnAssign(self, node: ast.AnnAssign):
+        if node.value is not None and self.binds_hardcoded(node.target, node.value):
+            self.record(node)
+
+    def visit_keyword(self, node: ast.keyword):
+        if node.arg and self.is_hardcoded(node.arg, node.value):
+            self.record(node)
+
+    def visit_arguments(self, node: ast.arguments):
+        positional = node.posonlyargs + node.args
+        pairs = list(zip(positional[len(positional) - len(node.defaults):], node.defaults))
+        pairs += [(arg, default) for arg, default in zip(node.kwonlyargs, node.kw_defaults) if default]
+        for arg, default in pairs:
+            if self.is_hardcoded(arg.arg, default):
+                self.record(default, f'{arg.arg}={self.segment(default)}')
+
+    def visit_Compare(self, node: ast.Compare):
+        operands = [node.left] + node.comparators
+        for op, left, right in zip(node.ops, operands, operands[1:]):
+            if not isinstance(op, ast.Eq):
+                continue
+            if self.binds_hardcoded(left, right) or self.binds_hardcoded(right, left):
+                self.record(node)
+                return
+
+
+class SqliteLiteralCheck(AstCheck):
+    """String constants naming a SQLite database file, URL or in-memory database"""
+
+    SQLITE_SUFFIXES = ('.db', '.sqlite', '.sqlite3')
+
+    def visit_Constant(self, node: ast.Constant):
+        if isinstance(node.value, str):
+            value = node.value.lower()
+            if (value.endswith(self.SQLITE_SUFFIXES) or ':memory:' in value
+                    or value.startswith('sqlite:')):
+                self.facts.sqlite_literals.append((node.lineno, node.value))
+
+
+class PersonalDataFlowCheck(AstCheck):
+    """Personal data identifiers that reach requests/httpx calls
+
+    Taint follows assignments in source order: a variable assigned from an
+    expression that mentions a personal-data identifier (a name, attribute
+    or dict key such as farmer_id), or filled with one via item assignment
+    or update()/append(), carries that identifier. A requests/httpx call -
+    module function, aliased import, Session/Client instance - receiving
+    such an expression or variable is a flow. Tracking is per file and
+    does not distinguish branches.
+    """
+
+    # Mirrors the auditor's PERSONAL_DATA_PATTERNS
+    PERSONAL_DATA_IDENTIFIERS = ('farmer_id', 'phone_number', 'farm_location', 'personal_data', 'user_data')
+    HTTP_MODULES = {'requests', 'httpx'}
+    HTTP_METHODS = {'get', 'post', 'put', 'patch', 'delete', 'head', 'options', 'request', 'stream'}
+    CLIENT_FACTORIES = {'Session', 'session', 'Client', 'AsyncClient'}
+    MUTATING_METHODS = {'update', 'append', 'extend', 'add', 'setdefault', 'insert'}
+
+    def __init__(self, facts: AstFacts, source: str):
+        super().__init__(facts, source)
+        self.modules: Dict[str, str] = {}  # local name -> requests/httpx
+        self.functions: Dict[str, str] = {}  # local name -> e.g. requests.post
+        self.factories: Dict[str, str] = {}  # local name -> e.g. httpx.AsyncClient
+        self.clients: Dict[str, str] = {}  # dotted variable -> client type
+        self.tainted: Dict[str, Set[str]] = {}  # dotted variable -> identifiers it carries
+
+    @staticmethod
+    def dotted(node: ast.AST) -> Optional[str]:
+        if isinstance(node, ast.Name):
+            return node.id
+        if isinstance(node, ast.Attribute):
+            base = PersonalDataFlowCheck.dotted(node.value)
+            return f'{base}.{node.attr}' if base else None
+        return None
+
+    def identifiers_in(self, text: str) -> Set[str]:
+        text = text.lower()
+        return {identifier for identifier in self.PERSONAL_DATA_IDENTIFIERS if identifier in text}
+
+    def carried(self, node: Optional[ast.AST]) -> Set[str]:
+        """Personal-data identifiers an expression mentions or carries through tainted variables"""
+        found = set()
+        if node is None:
+            return found
+        for child in ast.walk(node):
+            if isinstance(child, ast.Name):
+                found |= self.identifiers_in(child.id)
+                found |= self.tainted.get(child.id, set())
+            elif isinstance(child, ast.Attribute):
+                found |= self.identifiers_in(child.attr)
+                found |= self.tainted.get(self.dotted(child) or '', set())
+            elif isinstance(child, ast.Constant) and isinstance(child.value, str) and len(child.value) < 64:
+                found |= self.identifiers_in(child.value)
+        return found
+
+    def visit_Import(self, node: ast.Import):
+        for alias in node.names:
+            if alias.name in self.HTTP_MODULES:
+                self.modules[alias.asname or alias.name] = alias.name
+
+    def visit_ImportFrom(self, node: ast.ImportFrom):
+        if node.module in self.HTTP_MODULES and not node.level:
+            for alias in node.names:
+                qualified = f'{node.module}.{alias.name}'
+                if alias.name in self.HTTP_METHODS:
+                    self.functions[alias.asname or alias.name] = qualified
+                elif alias.name in self.CLIENT_FACTORIES:
+                    self.factories[alias.asname or alias.name] = qualified
+
+    def client_type(self, node: ast.AST) -> Optional[str]:
+        """Client type if node constructs a requests Session or an httpx Client"""
+        if not isinstance(node, ast.Call):
+            return None
+        func = node.func
+        if isinstance(func, ast.Name):
+            return self.factories.get(func.id)
+        if (isinstance(func, ast.Attribute) and func.attr in self.CLIENT_FACTORIES
+                and isinstance(func.value, ast.Name) and func.value.id in self.modules):
+            return f'{self.modules[func.value.id]}.{func.attr}'
+        return None
+
+    def sink(self, node: ast.Call) -> Optional[str]:
+        """Name of the requests/httpx call node makes, or None"""
+        func = node.func
+        if isinstance(func, ast.Name):
+            return self.functions.get(func.id)
+        if isinstance(func, ast.Attribute) and func.attr in self.HTTP_METHODS:
+            receiver = self.dotted(func.value)
+            if receiver in self.modules:
+                return f'{self.modules[receiver]}.{func.attr}'
+            if receiver in self.clients:
+                return f'{self.clients[receiver]}.{func.attr}'
+            client = self.client_type(func.value)
+            if client:
+                return f'{client}.{func.attr}'
+        return None
+
+    def bind(self, target: ast.AST, value: ast.AST, carried: Set[str], accumulate: bool = False):
+        if isinstance(target, (ast.Tuple, ast.List)):
+            for element in target.elts:
+                self.bind(element, value, carried, accumulate)
+            return
+        if isinstance(target, ast.Subscript):
+            # payload['farmer_id'] = ... fills the container
+            name = self.dotted(target.value)
+            carried = carried | self.carried(target.slice)
+            accumulate = True
+        else:
+            name = self.dotted(target)
+        if name is None:
+            return
+
+        client = self.client_type(value)
+        if client:
+            self.clients[name] = client
+        if carried:
+            self.tainted[name] = (self.tainted.get(name, set()) | carried) if accumulate else set(carried)
+        elif not accumulate:
+            self.tainted.pop(name, None)  # Rebound to clean data
+
+    def visit_Assign(self, node: ast.Assign):
+        carried = self.carried(node.value)
+        for target in node.targets:
+            self.bind(target, node.value, carried)
+
+    def visit_AnnAssign(self, node: ast.AnnAssign):
+        if node.value is not None:
+            self.bind(node.target, node.value, self.carried(node.value))
+
+    def visit_AugAssign(self, node: ast.AugAssign):
+        self.bind(node.target, node.value, self.carried(node.value), accumulate=True)
+
+    def visit_NamedExpr(self, node: ast.NamedExpr):
+        self.bind(node.target, node.value, self.carried(node.value))
+
+    def visit_withitem(self, node: ast.withitem):
+        # with httpx.Client() as client:
+        if node.optional_vars is not None:
+            self.bind(node.optional_vars, node.context_expr, set())
+
+    def visit_Call(self, node: ast.Call):
+        func = node.func
+        if isinstance(func, ast.Attribute) and func.attr in self.MUTATING_METHODS:
+            receiver = self.dotted(func.value)
+            carried = set()
+            for argument in node.args + [keyword.value for keyword in node.keywords]:
+                carried |= self.carried(argument)
+            carried |= {identifier for keyword in node.keywords if keyword.arg
+                        for identifier in self.identifiers_in(keyword.arg)}
+            if receiver and carried:
+                self.tainted[receiver] = self.tainted.get(receiver, set()) | carried
+            return
+
+        call = self.sink(node)
+        if call is None:
+            return
+        self.facts.http_calls += 1
+        carried = set()
+        for argument in node.args + [keyword.value for keyword in node.keywords]:
+            carried |= self.carried(argument)
+        for identifier in sorted(carried):
+            self.facts.personal_data_flows.append((node.lineno, identifier, call))
+
+
+# Checks fed by every traversal, in registration order
+REGISTERED_CHECKS = [
+    ErrorHandlingCheck,
+    EnvironmentAccessCheck,
+    ImportCheck,
+    HardcodedLiteralCheck,
+    SqliteLiteralCheck,
+    PersonalDataFlowCheck,
+]
+
+
+class MultiVisitor:
+    """Walks a tree once, dispatching each node to every check that handles its type"""
+
+    def __init__(self, checks: List[AstCheck]):
+        self.dispatch: Dict[type, List] = {}
+        for check in checks:
+            for attr in dir(check):
+                if attr.startswith('visit_'):
+                    node_type = getattr(ast, attr[len('visit_'):], None)
+                    if isinstance(node_type, type):
+                        self.dispatch.setdefault(node_type, []).append(getattr(check, attr))
+
+    def visit(self, tree: ast.AST):
+        stack = [tree]
+        while stack:
+            node = stack.pop()
+            for handler in self.dispatch.get(type(node), ()):
+                handler(node)
+            # Reversed so siblings are visited in source order (imports before their uses)
+            stack.extend(reversed(list(ast.iter_child_nodes(node))))
+
+
+def analyze_tree(tree: ast.AST, source: str) -> AstFacts:
+    """Run all registered checks over a parsed file in one traversal"""
+    facts = AstFacts()
+    MultiVisitor([check(facts, source) for check in REGISTERED_CHECKS]).visit(tree)
+    return facts
+
+
+class AstCache:
+    """Facts of the shared AST pass keyed by content hash (None if the content does not parse)
+
+    Identical content (a re-saved file, a file copied between modules, a
+    file touched during watch mode) is parsed and traversed only once. The
+    tree is dropped after analyze_tree(); only its facts are kept.
+    """
+
+    def __init__(self):
+        self.entries: Dict[str, Optional[AstFacts]] = {}
+
+    def get(self, content_hash: str, source: str) -> Optional[AstFacts]:
+        if content_hash not in self.entries:
+            try:
+                tree = ast.parse(source)
+            except (SyntaxError, ValueError):
+                self.entries[content_hash] = None
+            else:
+                self.entries[content_hash] = analyze_tree(tree, source)
+        return self.entries[content_hash]
+
+    def retain(self, content_hashes: Set[str]):
+        """Drop entries for content no longer present in the corpus"""
+        for key in [key for key in self.entries if key not in content_hashes]:
+            del self.entries[key]
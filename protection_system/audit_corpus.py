@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+AVA OLO Audit Corpus
+Walks the repository once and shares every loaded file across all audits
+"""
+import io
+import os
+import sys
+import hashlib
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from audit_ast import AstCache, AstFacts
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from scan_common.fs_walk import DEFAULT_IO_THREADS, read_ahead, scandir_walk, stat_paths
+from scan_common.git_blobs import GitBlobReader
+from scan_common.ignore_rules import IgnoreMatcher
+from scan_common.shards import assign_shards
+
+
+class SourceFile:
+    """A single file loaded into the audit corpus"""
+
+    def __init__(self, path: Path, root_path: Path, size: int = 0, mtime_ns: int = 0,
+                 ast_cache: Optional[AstCache] = None,
+                 read_bytes: Optional[Callable[[], Optional[bytes]]] = None):
+        self.path = path
+        self.relative_path = path.relative_to(root_path)
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self._text = None
+        self._text_loaded = False
+        self._content_hash = None
+        self._lines = None
+        self._facts = None
+        self._parsed = False
+        self._ast_cache = ast_cache
+        self._read_bytes = read_bytes  # Content source other than the file (e.g. a staged blob)
+
+    @property
+    def name(self) -> str:
+        return self.path.name
+
+    @property
+    def text(self) -> Optional[str]:
+        """File content, read on first use (None if not readable as UTF-8)"""
+        if not self._text_loaded:
+            self._text_loaded = True
+            try:
+                if self._read_bytes is None:
+                    self._text = self.path.read_text(encoding='utf-8')
+                else:
+                    data = self._read_bytes()
+                    if data is not None:
+                        self.size = len(data)
+                        # Newlines translated exactly like read_text()
+                        self._text = io.TextIOWrapper(io.BytesIO(data), encoding='utf-8').read()
+            except Exception:
+                self._text = None
+        return self._text
+
+    @property
+    def readable(self) -> bool:
+        return self.text is not None
+
+    @property
+    def content_hash(self) -> Optional[str]:
+        """SHA-256 of the file text (None if the file is not readable)"""
+        if self._content_hash is None and self.text is not None:
+            self._content_hash = hashlib.sha256(
+                self.text.encode('utf-8', errors='surrogatepass')
+            ).hexdigest()
+        return self._content_hash
+
+    @property
+    def lines(self) -> List[str]:
+        """File content split into lines, computed on first use"""
+        if self._lines is None:
+            self._lines = self.text.split('\n') if self.text is not None else []
+        return self._lines
+
+    @property
+    def facts(self) -> Optional[AstFacts]:
+        """Findings of the shared AST pass, computed on first use (None if the file does not parse)"""
+        if not self._parsed:
+            self._parsed = True
+            if self.text is not None:
+                cache = self._ast_cache if self._ast_cache is not None else AstCache()
+                self._facts = cache.get(self.content_hash, self.text)
+        return self._facts
+
+    def __str__(self) -> str:
+        return str(self.path)
+
+
+class SnapshotCorpus(ABC):
+    """Files the system audit inspects, loaded once by load()
+
+    Subclasses decide where the file list and contents come from: a walk
+    of the tree (AuditCorpus), the git index (StagedAuditCorpus) or a
+    shard manifest (ManifestAuditCorpus). Only a walked corpus can be
+    refreshed for watch mode.
+    """
+
+    # Never audited, on top of the .gitignore files and .avaoloignore under the root
+    IGNORE_PATTERNS = ['node_modules/', '.git/']
+    EXTENSIONS = ['.py', '.html']
+
+    def __init__(self, root_path: Path, paths: Optional[List[str]] = None,
+                 io_threads: int = DEFAULT_IO_THREADS):
+        self.root_path = Path(root_path)
+        self.paths = paths  # Restrict the corpus to these root-relative paths
+        self.io_threads = io_threads
+        self.files: Dict[str, List[SourceFile]] = {ext: [] for ext in self.EXTENSIONS}
+        # After select_shard(): root-relative path -> position in its extension's full file list
+        self.positions: Dict[str, int] = {}
+        self.ast_cache = AstCache()
+        self.ignore = IgnoreMatcher(str(self.root_path), self.IGNORE_PATTERNS)
+        self.load()
+
+    @property
+    def scoped(self) -> bool:
+        return self.paths is not None
+
+    @abstractmethod
+    def load(self):
+        """Fill self.files with the corpus files of each extension, in path order"""
+
+    def select_shard(self, index: int, count: int):
+        """Keep only shard index of count, partitioned by relative path and size"""
+        sources = [source for ext in self.EXTENSIONS for source in self.files[ext]]
+        assignment = assign_shards([(source.relative_path.as_posix(), source.size) for source in sources], count)
+        selected = {id(source) for source, shard in zip(sources, assignment) if shard == index}
+
+        self.positions = {}
+        for ext in self.EXTENSIONS:
+            kept = []
+            for position, source in enumerate(self.files[ext]):
+                if id(source) in selected:
+                    self.positions[source.relative_path.as_posix()] = position
+                    kept.append(source)
+            self.files[ext] = kept
+
+    def prefetch(self, sources: List[SourceFile]):
+        """Read the text of sources with up to io_threads reads in flight"""
+        pending = [source for source in sources if not source._text_loaded]
+        for _ in read_ahead(pending, lambda source: source.text, self.io_threads):
+            pass
+
+    def prune_ast_cache(self):
+        """Forget AST facts of content that is no longer in the corpus"""
+        self.ast_cache.retain({
+            source._content_hash for ext in self.EXTENSIONS for source in self.files[ext]
+            if source._content_hash is not None
+        })
+
+    def includes(self, relative: str) -> bool:
+        """True if a root-relative path has an audited extension and neither it nor a parent is ignored"""
+        path = self.root_path / relative
+        if path.suffix not in self.files:
+            return False
+        return not self.ignore.is_ignored(str(path), False, check_parents=True)
+
+    @property
+    def python_files(self) -> List[SourceFile]:
+        return self.files['.py']
+
+    @property
+    def html_files(self) -> List[SourceFile]:
+        return self.files['.html']
+
+    def python_files_by_top_level(self) -> Dict[str, List[SourceFile]]:
+        """Python files grouped by the top-level directory of the root they are in (one pass)"""
+        groups: Dict[str, List[SourceFile]] = {}
+        for source in self.python_files:
+            groups.setdefault(source.relative_path.parts[0], []).append(source)
+        return groups
+
+
+class AuditCorpus(SnapshotCorpus):
+    """Single-walk snapshot of all files the system audit inspects
+
+    Each file is stat'ed during the walk and read at most once, either on
+    first use or ahead of time by prefetch() through a bounded thread pool.
+    refresh() re-stats the tree for watch mode.
+    """
+
+    def load(self):
+        """Walk the tree once and read every relevant file exactly once"""
+        for ext in self.EXTENSIONS:
+            self.files[ext] = []
+
+        for path, stat in self.iter_entries():
+            self.files[path.suffix].append(
+                SourceFile(path, self.root_path, stat.st_size, stat.st_mtime_ns, self.ast_cache)
+            )
+
+    def refresh(self) -> Set[str]:
+        """Re-stat the corpus and return the paths added, modified or removed
+
+        Unchanged files keep their SourceFile, so text and AST facts
+        already in memory are reused; only changed files are read again.
+        """
+        previous = {str(source.path): source for ext in self.EXTENSIONS for source in self.files[ext]}
+        # Ignore files may have changed too
+        self.ignore = IgnoreMatcher(str(self.root_path), self.IGNORE_PATTERNS)
+        files: Dict[str, List[SourceFile]] = {ext: [] for ext in self.EXTENSIONS}
+        changed = set()
+
+        for path, stat in self.iter_entries():
+            key = str(path)
+            source = previous.pop(key, None)
+            if source is None or source.size != stat.st_size or source.mtime_ns != stat.st_mtime_ns:
+                source = SourceFile(path, self.root_path, stat.st_size, stat.st_mtime_ns, self.ast_cache)
+                changed.add(key)
+            files[path.suffix].append(source)
+
+        changed.update(previous)  # Removed since the last walk
+        self.files = files
+        return changed
+
+    def iter_entries(self) -> Iterator[Tuple[Path, os.stat_result]]:
+        """(path, stat) of every corpus file, in sorted walk order"""
+        if self.scoped:
+            yield from self.iter_paths(self.paths)
+        else:
+            yield from self.iter_tree(self.root_path)
+
+    def iter_tree(self, directory: Path) -> Iterator[Tuple[Path, os.stat_result]]:
+        """Files of a directory first, then its subdirectories, using os.scandir stat data"""
+        entries = scandir_walk(
+            str(directory),
+            include_file=lambda entry: os.path.splitext(entry.name)[1] in self.files,
+            ignore=self.ignore,
+            sort=True
+        )
+        for path, stat in entries:
+            yield Path(path), stat
+
+    def iter_paths(self, paths: List[str]) -> Iterator[Tuple[Path, os.stat_result]]:
+        """Stat an explicit list of root-relative paths instead of walking the tree"""
+        selected = [self.root_path / relative for relative in sorted(set(paths))
+                    if self.includes(relative)]
+
+        for path, stat in stat_paths(selected, self.io_threads):
+            if stat is not None:  # None if deleted since the reference
+                yield path, stat
+
+
+class StagedAuditCorpus(SnapshotCorpus):
+    """Audit corpus of the staged (index) version of the files in a commit
+
+    blobs lists (root-relative path, blob id) pairs, e.g. from
+    staged_blobs(). Contents are read through one git cat-file process on
+    first use; the working tree is neither walked nor read, so a pre-commit
+    audit costs one git diff plus one blob read per staged file.
+    """
+
+    def __init__(self, root_path: Path, reader: GitBlobReader, blobs: List[Tuple[str, str]]):
+        self.reader = reader
+        self.blobs = dict(blobs)
+        # One pipe serves the reads, so read-ahead threads would only queue on it
+        super().__init__(root_path, list(self.blobs), io_threads=1)
+
+    def load(self):
+        for ext in self.EXTENSIONS:
+            self.files[ext] = []
+
+        for relative in sorted(self.blobs):
+            if not self.includes(relative):
+                continue
+            path = self.root_path / relative
+            self.files[path.suffix].append(SourceFile(
+                path, self.root_path, ast_cache=self.ast_cache,
+                read_bytes=lambda blob=self.blobs[relative]: self.reader.read(blob)
+            ))
+
+
+class ManifestAuditCorpus(SnapshotCorpus):
+    """Corpus rebuilt from a list of root-relative paths, e.g. to merge sharded audits
+
+    Nothing is walked or stat'ed; a file is only read if an audit still
+    needs its content.
+    """
+
+    def __init__(self, root_path: Path, files: Dict[str, List[str]], scoped: bool = False):
+        self.manifest = files
+        self._scoped = scoped
+        super().__init__(root_path, io_threads=1)
+
+    @property
+    def scoped(self) -> bool:
+        return self._scoped
+
+    def load(self):
+        for ext in self.EXTENSIONS:
+            self.files[ext] = [
+                SourceFile(self.root_path / relative, self.root_path, ast_cache=self.ast_cache)
+                for relative in self.manifest.get(ext, [])
+            ]
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+AVA OLO Audit Watcher
+Keeps the system audit warm in memory and re-audits only what changed
+"""
+import os
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional, Set, Tuple
+
+from audit_corpus import AuditCorpus
+
+if TYPE_CHECKING:
+    from comprehensive_audit import AVASystemAuditor
+
+
+class AuditWatcher:
+    """Long-running wrapper around AVASystemAuditor
+
+    The corpus, file contents, AST facts and per-file results stay in
+    memory between cycles. Each poll only re-stats the tree; audits whose
+    inputs did not change replay their previous findings instead of running.
+    """
+
+    # Per-file audits affected by a change to a file with this extension
+    AUDITS_BY_EXTENSION = {
+        '.py': [
+            'mango_rule',
+            'environment_variables',
+            'module_independence',
+            'database_usage',
+            'privacy_compliance',
+            'version_visibility',
+            'llm_first_approach',
+            'error_handling',
+        ],
+        '.html': ['version_visibility'],
+    }
+
+    def __init__(self, auditor: 'AVASystemAuditor', interval: float = 2.0,
+                 report_path: Optional[str] = None):
+        self.auditor = auditor
+        self.interval = interval
+        self.report_path = Path(report_path) if report_path else (
+            auditor.root_path / 'ava-olo-shared' / 'essentials' / 'reports' / 'live_system_audit.md'
+        )
+        # Findings of each audit's last run: (violations, warnings, successes, baseline findings suppressed)
+        self.audit_findings: Dict[str, Tuple[List, List, List, int]] = {}
+        self.signatures: Dict[str, Tuple] = {}
+        self.cycles = 0
+
+    def repo_signatures(self) -> Dict[str, Tuple]:
+        """Cheap stat fingerprints of the inputs of the repo-wide audits"""
+        git_dir = self.auditor.root_path / '.git'
+        return {
+            'git_standards': tuple(
+                self._stat_signature(git_dir / name) for name in ['HEAD', 'logs/HEAD', 'packed-refs']
+            ),
+            'deployment_protection': tuple(
+                (self.auditor.root_path / 'ava-olo-shared' / file_path).exists()
+                for file_path in self.auditor.PROTECTION_FILES
+            ),
+        }
+
+    @staticmethod
+    def _stat_signature(path: Path) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return (stat.st_size, stat.st_mtime_ns)
+
+    def poll(self) -> Tuple[Set[str], Set[str]]:
+        """Re-stat the corpus; returns (changed paths, audits affected by them)"""
+        changed = self.auditor.corpus.refresh()
+        affected = set()
+        for key in changed:
+            affected.update(self.AUDITS_BY_EXTENSION.get(os.path.splitext(key)[1], []))
+
+        signatures = self.repo_signatures()
+        for audit_name, signature in signatures.items():
+            if self.signatures.get(audit_name) != signature:
+                affected.add(audit_name)
+        self.signatures = signatures
+
+        return changed, affected
+
+    def run_cycle(self, affected: Optional[Set[str]] = None):
+        """Run affected audits (all when None) and replay the others"""
+        auditor = self.auditor
+        auditor.reset_findings()
+
+        for audit_name in auditor.AUDIT_SEQUENCE:
+            if affected is not None and audit_name not in affected and audit_name in self.audit_findings:
+                violations, warnings, successes, suppressed = self.audit_findings[audit_name]
+                auditor.violations.extend(violations)
+                auditor.warnings.extend(warnings)
+                auditor.successes.extend(successes)
+                # reset_findings() zeroed the count; replayed findings are not checked against the baseline again
+                if auditor.baseline is not None:
+                    auditor.baseline.suppressed += suppressed
+                continue
+
+            before = (len(auditor.violations), len(auditor.warnings), len(auditor.successes),
+                      self.suppressed_count())
+            auditor.run_audit(audit_name)
+            self.audit_findings[audit_name] = (
+                auditor.violations[before[0]:],
+                auditor.warnings[before[1]:],
+                auditor.successes[before[2]:],
+                self.suppressed_count() - before[3]
+            )
+
+        auditor.save_cache(prune=not auditor.corpus.scoped)
+        auditor.corpus.prune_ast_cache()
+        self.write_report()
+        self.cycles += 1
+
+    def suppressed_count(self) -> int:
+        baseline = self.auditor.baseline
+        return baseline.suppressed if baseline is not None else 0
+
+    def write_report(self):
+        """Replace the live report atomically so readers never see a partial file"""
+        self.report_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.report_path.with_name(self.report_path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.auditor.render_report())
+        os.replace(tmp_path, self.report_path)
+
+    def watch(self, max_cycles: Optional[int] = None) -> bool:
+        """Audit once, then re-audit on every change until interrupted"""
+        corpus = self.auditor.corpus
+        if not isinstance(corpus, AuditCorpus) or corpus.positions:
+            # Staged, shard and merged corpora are fixed file lists that cannot be re-walked
+            print("❌ Watch mode needs the working tree corpus (not --staged, --shard or --merge-shards)")
+            return False
+        print(f"👀 Watching {self.auditor.root_path} every {self.interval:g}s (Ctrl+C to stop)")
+        self.signatures = self.repo_signatures()
+        self.run_cycle()
+        self.print_status(None, None)
+
+        try:
+            while max_cycles is None or self.cycles < max_cycles:
+                time.sleep(self.interval)
+                changed, affected = self.poll()
+                if not affected:
+                    continue
+
+                self.auditor.forget_files(changed)
+                self.run_cycle(affected)
+                self.print_status(changed, affected)
+        except KeyboardInterrupt:
+            print("\n👋 Stopped watching")
+
+        return len(self.auditor.violations) == 0
+
+    def print_status(self, changed: Optional[Set[str]], affected: Optional[Set[str]]):
+        auditor = self.auditor
+        if changed is None:
+            print("\n✅ Initial audit complete")
+        else:
+            audits = [name for name in auditor.AUDIT_SEQUENCE if name in affected]
+            print(f"\n🔄 {len(changed)} files changed - re-ran {', '.join(audits)}")
+        print(f"   ❌ {len(auditor.violations)} violations | ⚠️  {len(auditor.warnings)} warnings | "
+              f"✅ {len(auditor.successes)} successes")
+        print(f"   📄 Live report: {self.report_path}")
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+AVA OLO Commit Log
+Append-only record of audited commits; its last entry is the watermark for the next run
+"""
+import re
+import json
+import subprocess
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+# Commit subjects must start with the version: "v3.2.1 - what changed"
+VERSION_SUBJECT = re.compile(r'v\d+\.\d+\.\d+')
+
+
+def git_commits(repo_path: Path, since: Optional[str] = None,
+                limit: Optional[int] = None) -> List[Tuple[str, str]]:
+    """(commit id, subject) of HEAD's commits after since, oldest first, from one git log
+
+    Without since the whole branch is listed (or its last limit commits).
+    Raises RuntimeError if git fails, e.g. outside a repository or when
+    since no longer exists.
+    """
+    command = ['git', 'log', '--format=%H%x09%s', '--reverse', '--no-color']
+    if limit is not None:
+        command.append(f'-{limit}')
+    command.append(f'{since}..HEAD' if since else 'HEAD')
+    result = subprocess.run(command + ['--'], cwd=repo_path, capture_output=True,
+                            text=True, encoding='utf-8', errors='replace')
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip() or 'git log failed')
+    commits = []
+    for line in result.stdout.splitlines():
+        commit, _, subject = line.partition('\t')
+        if commit:
+            commits.append((commit, subject))
+    return commits
+
+
+class CommitLog:
+    """JSON lines, one per audited commit, in the order they were audited
+
+    Entries are only ever appended, so the newest audited commit - the
+    watermark - is the last line, and whole-branch compliance is a count
+    over the file rather than a walk of the history.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.entries: List[Dict] = []
+        self.commits: Set[str] = set()
+        self.torn = False  # Last line has no newline; the next append must not extend it
+        if self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    self.torn = not line.endswith('\n')
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # Torn last line of an interrupted append
+                    self.entries.append(entry)
+                    self.commits.add(entry['commit'])
+
+    @property
+    def watermark(self) -> Optional[str]:
+        """Last audited commit, or None before the first run"""
+        return self.entries[-1]['commit'] if self.entries else None
+
+    def append(self, commits: List[Tuple[str, str]]) -> List[Dict]:
+        """Check and record commits not logged yet; returns their new entries"""
+        audited = datetime.utcnow().isoformat(timespec='seconds')
+        new_entries = [
+            {'commit': commit, 'subject': subject,
+             'follows_format': bool(VERSION_SUBJECT.match(subject)), 'audited': audited}
+            for commit, subject in commits if commit not in self.commits
+        ]
+        if new_entries:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                if self.torn:
+                    f.write('\n')
+                    self.torn = False
+                for entry in new_entries:
+                    f.write(json.dumps(entry) + '\n')
+            self.entries.extend(new_entries)
+            self.commits.update(entry['commit'] for entry in new_entries)
+        return new_entries
+
+    def update(self, repo_path: Path) -> List[Dict]:
+        """Audit the commits made since the watermark; raises RuntimeError if git fails
+
+        If the watermark is gone (history rewritten and collected), the
+        branch is listed again and only commits missing from the log are
+        added.
+        """
+        watermark = self.watermark
+        try:
+            commits = git_commits(repo_path, watermark)
+        except RuntimeError:
+            if watermark is None:
+                raise
+            commits = git_commits(repo_path)
+        return self.append(commits)
+
+    def compliance(self, last: Optional[int] = None) -> Tuple[int, int]:
+        """(commits following the format, commits) over the log, or its last entries"""
+        entries = self.entries[-last:] if last else self.entries
+        return sum(1 for entry in entries if entry['follows_format']), len(entries)
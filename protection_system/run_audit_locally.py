@@ -17,10 +17,8 @@ sys.modules['modules.core.aws_env_enforcement'].AWSEnvironmentEnforcer = type('A
 })
 
 # Now import and run the auditor
-from comprehensive_audit import AVASystemAuditor
+from comprehensive_audit import main
 
 if __name__ == "__main__":
     print("🏃 Running audit in local mode (AWS enforcement bypassed)...")
-    auditor = AVASystemAuditor()
-    success = auditor.run_comprehensive_audit()
-    sys.exit(0 if success else 1)
\ No newline at end of file
+    sys.exit(main())
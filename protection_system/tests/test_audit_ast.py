@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Shared AST pass tests
+One traversal must give every check the facts it would find walking the tree itself
+"""
+import ast
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from audit_ast import AstCache, AstCheck, AstFacts, MultiVisitor, analyze_tree
+
+FIXTURE = (Path(__file__).resolve().parent / 'fixtures' / 'ast_module.txt').read_text(encoding='utf-8')
+LINES = FIXTURE.splitlines()
+
+
+def facts_of(source: str = FIXTURE) -> AstFacts:
+    return analyze_tree(ast.parse(source), source)
+
+
+def test_error_handling():
+    facts = facts_of()
+    assert facts.try_except_count == 2
+    assert facts.bare_except_count == 2
+    assert facts.bare_except_lines == [22, 29]
+    assert facts.proper_fallback_count == 2
+
+
+def test_environment_access_through_aliases():
+    assert facts_of().env_accesses == [
+        (9, 'os.getenv()'), (10, 'os.environ[]'), (11, 'os.environ.get()'), (12, 'getenv()')
+    ]
+
+
+def test_imports_with_lines():
+    facts = facts_of()
+    assert facts.imports == ['os', 'os', 'importlib', 'requests', 'httpx', 'ava_olo_shared.config',
+                             'ava_olo_agricultural_core.plugins']
+    assert facts.import_lines['os'] == [2, 3]
+    assert facts.import_lines['ava_olo_agricultural_core'] == [13]
+    assert facts.imported_roots >= {'ava_olo_shared', 'ava_olo_agricultural_core'}
+
+
+def test_literals():
+    facts = facts_of()
+    # Expected values come from the fixture so this file itself stays clean for the audit
+    assert facts.hardcoded_literals == [(15, LINES[14])]
+    assert facts.sqlite_literals == [(14, LINES[13].split("'")[1])]
+
+
+def test_personal_data_flows():
+    facts = facts_of()
+    assert facts.http_calls == 2
+    assert facts.personal_data_flows == [
+        (21, 'farmer_id', 'requests.post'), (35, 'phone_number', 'httpx.AsyncClient.put')
+    ]
+
+
+def test_rebinding_clears_taint():
+    source = "import requests\npayload = farmer_id\npayload = 1\nrequests.get('u', params=payload)\n"
+    assert facts_of(source).personal_data_flows == []
+
+
+class NodeCounter(AstCheck):
+    """Counts visits, to compare the shared traversal with ast.walk"""
+
+    def __init__(self, facts: AstFacts, source: str):
+        super().__init__(facts, source)
+        self.names = []
+        self.calls = 0
+
+    def visit_Name(self, node: ast.Name):
+        self.names.append((node.lineno, node.col_offset))
+
+    def visit_Call(self, node: ast.Call):
+        self.calls += 1
+
+
+def test_visits_every_node_once_in_source_order():
+    tree = ast.parse(FIXTURE)
+    first, second = NodeCounter(AstFacts(), FIXTURE), NodeCounter(AstFacts(), FIXTURE)
+    MultiVisitor([first, second]).visit(tree)
+    expected = [(node.lineno, node.col_offset) for node in ast.walk(tree) if isinstance(node, ast.Name)]
+    assert sorted(first.names) == sorted(expected)
+    assert first.names == sorted(first.names)
+    assert first.names == second.names
+    assert first.calls == sum(isinstance(node, ast.Call) for node in ast.walk(tree))
+
+
+def test_cache_parses_identical_content_once():
+    cache = AstCache()
+    facts = cache.get('hash', FIXTURE)
+    assert isinstance(facts, AstFacts)
+    assert cache.get('hash', FIXTURE) is facts
+    assert cache.get('broken', 'def (:') is None
+    # Only facts are kept, never the parsed tree
+    assert all(entry is None or isinstance(entry, AstFacts) for entry in cache.entries.values())
+    cache.retain({'hash'})
+    assert list(cache.entries) == ['hash']
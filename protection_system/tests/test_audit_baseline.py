@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Audit baseline tests
+Known findings are suppressed by code line, new occurrences in the same file are not
+"""
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
+from audit_watcher import AuditWatcher
+from comprehensive_audit import AVASystemAuditor
+from scan_common.baseline import Baseline
+
+HANDLER = "try:\n    run()\nexcept:\n    pass\n"
+ENV_ACCESS = "import os\nhost = os.environ['DB_HOST']\n"
+
+
+def audit(root: Path, baseline: Baseline) -> AVASystemAuditor:
+    auditor = AVASystemAuditor(root_path=str(root), baseline=baseline)
+    auditor.audit_environment_variables()
+    auditor.audit_error_handling()
+    return auditor
+
+
+def write(root: Path, content: str):
+    repository = root / 'ava-olo-agricultural-core'
+    repository.mkdir(exist_ok=True)
+    (repository / 'app.py').write_text(content, encoding='utf-8')
+
+
+def accepted(root: Path, baseline_file: Path) -> Baseline:
+    """Baseline of everything the current tree reports, reloaded from disk"""
+    baseline = Baseline()
+    audit(root, baseline)
+    baseline.save(str(baseline_file))
+    return Baseline.load(str(baseline_file))
+
+
+def test_known_findings_are_suppressed_after_lines_move(tmp_path):
+    write(tmp_path, ENV_ACCESS + HANDLER)
+    baseline = accepted(tmp_path, tmp_path / 'baseline.json')
+    write(tmp_path, '# header\n\n' + ENV_ACCESS + HANDLER)
+    auditor = audit(tmp_path, baseline)
+    assert auditor.violations == [] and auditor.warnings == []
+    assert baseline.suppressed == 3  # Direct access, missing CentralConfig, bare except
+
+
+def test_new_bare_except_in_known_file_is_reported(tmp_path):
+    write(tmp_path, HANDLER)
+    baseline = accepted(tmp_path, tmp_path / 'baseline.json')
+    write(tmp_path, HANDLER + "try:\n    stop()\nexcept:\n    log()\n")
+    auditor = audit(tmp_path, baseline)
+    assert [w['details'] for w in auditor.warnings] == ['Bare except clause found']
+    assert baseline.suppressed == 1
+
+
+def test_new_env_access_in_known_file_is_reported(tmp_path):
+    write(tmp_path, ENV_ACCESS)
+    baseline = accepted(tmp_path, tmp_path / 'baseline.json')
+    write(tmp_path, ENV_ACCESS + "token = os.getenv('API_TOKEN')\n")
+    auditor = audit(tmp_path, baseline)
+    assert [v['principle'] for v in auditor.violations] == ['Environment Variables']
+
+
+def test_file_level_findings_use_their_message(tmp_path):
+    baseline = Baseline()
+    auditor = AVASystemAuditor(root_path=str(tmp_path), baseline=baseline)
+    auditor.add_warning('Deployment Protection', 'Protection file missing: gate.sh')
+    assert len(baseline.seen) == 1
+    auditor = AVASystemAuditor(root_path=str(tmp_path), baseline=Baseline(baseline.seen))
+    auditor.add_warning('Deployment Protection', 'Protection file missing: gate.sh')
+    auditor.add_warning('Deployment Protection', 'Protection file missing: other.sh')
+    assert [w['details'] for w in auditor.warnings] == ['Protection file missing: other.sh']
+
+
+def test_watch_cycle_keeps_suppressed_count_of_replayed_audits(tmp_path):
+    write(tmp_path, ENV_ACCESS + HANDLER)
+    baseline = accepted(tmp_path, tmp_path / 'baseline.json')
+    auditor = AVASystemAuditor(root_path=str(tmp_path), baseline=baseline)
+    watcher = AuditWatcher(auditor, interval=0, report_path=str(tmp_path / 'live.md'))
+    watcher.run_cycle()
+    assert baseline.suppressed == 3
+    watcher.run_cycle({'error_handling'})
+    assert baseline.suppressed == 3
+    watcher.run_cycle(set())
+    assert baseline.suppressed == 3
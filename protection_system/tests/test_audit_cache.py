@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+System audit findings cache tests
+Editing any module that decides matches invalidates the cache
+"""
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
+from comprehensive_audit import RULESET_MODULES, AVASystemAuditor
+
+
+def ruleset_hash(tmp_path: Path) -> str:
+    return AVASystemAuditor(root_path=str(tmp_path), cache_file=str(tmp_path / 'cache.json')).cache.ruleset_hash
+
+
+def test_rule_engine_modules_are_part_of_the_ruleset():
+    assert {'scan_common.linear_rules', 'scan_common.literal_prefilter'} <= set(RULESET_MODULES)
+
+
+@pytest.mark.parametrize('name', RULESET_MODULES)
+def test_module_edit_changes_the_ruleset_hash(tmp_path, monkeypatch, name):
+    before = ruleset_hash(tmp_path)
+    module = sys.modules[name]
+    edited = tmp_path / Path(module.__file__).name
+    shutil.copyfile(module.__file__, edited)
+    with edited.open('a', encoding='utf-8') as f:
+        f.write('\n# edited\n')
+    monkeypatch.setattr(module, '__file__', str(edited))
+    assert ruleset_hash(tmp_path) != before
@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+"""
+System audit command line tests
+Option combinations that cannot work together are rejected before anything runs
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+import comprehensive_audit
+
+
+@pytest.mark.parametrize('options', [
+    ['--watch', '--fail-fast'],
+    ['--watch', '--budget-seconds', '5'],
+    ['--staged', '--since', 'HEAD'],
+    ['--shard', '1/2'],
+    ['--update-baseline'],
+])
+def test_rejects_incompatible_options(tmp_path, capsys, options):
+    with pytest.raises(SystemExit) as exit_info:
+        comprehensive_audit.main(['--root', str(tmp_path)] + options)
+    assert exit_info.value.code == 2
+    assert 'error:' in capsys.readouterr().err
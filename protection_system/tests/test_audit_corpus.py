@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Audit corpus tests
+Walked, manifest and sharded corpora, and which of them watch mode accepts
+"""
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from audit_corpus import AuditCorpus, ManifestAuditCorpus, SnapshotCorpus, StagedAuditCorpus
+from audit_watcher import AuditWatcher
+from comprehensive_audit import AVASystemAuditor
+
+
+def make_tree(root: Path):
+    for relative, content in {
+        'ava-olo-agricultural-core/app.py': 'print(1)\n',
+        'ava-olo-agricultural-core/templates/index.html': '<p>hi</p>\n',
+        'ava-olo-api-gateway/gateway.py': 'x = 2\n',
+        'ava-olo-api-gateway/node_modules/lib.py': 'skipped = True\n',
+        'ava-olo-api-gateway/notes.txt': 'not audited\n',
+    }.items():
+        path = root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding='utf-8')
+
+
+def relative_paths(corpus: SnapshotCorpus):
+    return {ext: [source.relative_path.as_posix() for source in sources] for ext, sources in corpus.files.items()}
+
+
+def test_walk_skips_other_extensions_and_skip_dirs(tmp_path):
+    make_tree(tmp_path)
+    assert relative_paths(AuditCorpus(tmp_path)) == {
+        '.py': ['ava-olo-agricultural-core/app.py', 'ava-olo-api-gateway/gateway.py'],
+        '.html': ['ava-olo-agricultural-core/templates/index.html'],
+    }
+
+
+def test_ignore_rules_prune_exact_names_and_gitignored_paths(tmp_path):
+    for relative in ('.git/hooks/hook.py', '.github/scripts/check.py', 'build/out.py', 'app.py'):
+        path = tmp_path / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text('x = 1\n', encoding='utf-8')
+    (tmp_path / '.gitignore').write_text('build/\n', encoding='utf-8')
+    audited = ['.github/scripts/check.py', 'app.py']
+    assert sorted(relative_paths(AuditCorpus(tmp_path))['.py']) == audited
+    # --since paths go through the same rules
+    scoped = AuditCorpus(tmp_path, paths=['.git/hooks/hook.py', '.github/scripts/check.py', 'build/out.py', 'app.py'])
+    assert sorted(relative_paths(scoped)['.py']) == audited
+
+
+def test_refresh_reports_added_modified_and_removed_files(tmp_path):
+    make_tree(tmp_path)
+    corpus = AuditCorpus(tmp_path)
+    unchanged = corpus.python_files[1]
+    app = tmp_path / 'ava-olo-agricultural-core/app.py'
+    app.write_text('print(1)\nprint(2)\n', encoding='utf-8')
+    (tmp_path / 'ava-olo-api-gateway/new.py').write_text('y = 3\n', encoding='utf-8')
+    (tmp_path / 'ava-olo-agricultural-core/templates/index.html').unlink()
+
+    changed = corpus.refresh()
+    assert changed == {str(app), str(tmp_path / 'ava-olo-api-gateway/new.py'),
+                       str(tmp_path / 'ava-olo-agricultural-core/templates/index.html')}
+    assert unchanged in corpus.python_files  # Unchanged files keep their loaded SourceFile
+
+
+def test_snapshot_corpora_cannot_refresh(tmp_path):
+    assert not hasattr(ManifestAuditCorpus, 'refresh')
+    assert not hasattr(StagedAuditCorpus, 'refresh')
+
+
+def test_shard_positions_cover_the_full_file_list(tmp_path):
+    make_tree(tmp_path)
+    full = relative_paths(AuditCorpus(tmp_path))
+    rebuilt = {ext: {} for ext in full}
+    for index in (1, 2):
+        corpus = AuditCorpus(tmp_path)
+        corpus.select_shard(index, 2)
+        for ext, paths in relative_paths(corpus).items():
+            for path in paths:
+                rebuilt[ext][corpus.positions[path]] = path
+    assert {ext: [by_position[i] for i in sorted(by_position)] for ext, by_position in rebuilt.items()} == full
+
+
+def test_watch_refuses_fixed_file_lists(tmp_path, capsys):
+    make_tree(tmp_path)
+    auditor = AVASystemAuditor(root_path=str(tmp_path))
+    auditor._corpus = ManifestAuditCorpus(tmp_path, relative_paths(AuditCorpus(tmp_path)))
+    assert AuditWatcher(auditor, interval=0).watch(max_cycles=0) is False
+    assert 'Watch mode needs the working tree corpus' in capsys.readouterr().out
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Sharded audit tests
+The merge of a complete shard set reports exactly what a single full run reports
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from comprehensive_audit import AVASystemAuditor
+
+FIXTURES = Path(__file__).resolve().parent / 'fixtures'
+
+
+@pytest.fixture
+def root(tmp_path):
+    """Repositories built from the fixture modules, so every audit has something to find"""
+    sources = [(FIXTURES / 'ast_module.txt').read_text(encoding='utf-8'),
+               (FIXTURES / 'mango_violations.txt').read_text(encoding='utf-8'),
+               (FIXTURES / 'mango_clean.txt').read_text(encoding='utf-8')]
+    for index, repository in enumerate(['ava-olo-agricultural-core', 'ava-olo-shared', 'ava-olo-api-gateway']):
+        for number in range(5):
+            module = tmp_path / repository / f'package_{number % 2}' / f'module_{number}.py'
+            module.parent.mkdir(parents=True, exist_ok=True)
+            module.write_text(sources[(index + number) % len(sources)], encoding='utf-8')
+    return tmp_path
+
+
+def findings(auditor: AVASystemAuditor):
+    return auditor.violations, auditor.warnings, auditor.successes
+
+
+def test_merged_shards_equal_a_full_run(root, tmp_path_factory, capsys):
+    full = AVASystemAuditor(root_path=str(root))
+    full.run_comprehensive_audit()
+    assert full.violations
+
+    output = tmp_path_factory.mktemp('shards')
+    shard_files = []
+    for index in (3, 1, 2):
+        shard_file = str(output / f'shard_{index}.json')
+        AVASystemAuditor(root_path=str(root), shard=(index, 3)).run_shard(shard_file)
+        shard_files.append(shard_file)
+
+    merged = AVASystemAuditor(root_path=str(root))
+    merged.load_shards(shard_files)
+    merged.run_comprehensive_audit()
+    assert findings(merged) == findings(full)
+
+
+def test_incomplete_shard_set_is_rejected(root, tmp_path_factory, capsys):
+    shard_file = str(tmp_path_factory.mktemp('shards') / 'shard_1.json')
+    AVASystemAuditor(root_path=str(root), shard=(1, 2)).run_shard(shard_file)
+    with pytest.raises(ValueError):
+        AVASystemAuditor(root_path=str(root)).load_shards([shard_file])
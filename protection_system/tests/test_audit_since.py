@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Incremental (--since) audit tests
+The changed set covers modified tracked files and new untracked ones, not ignored ones
+"""
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from comprehensive_audit import AVASystemAuditor
+
+
+def test_changed_files_include_untracked(tmp_path, git):
+    git(tmp_path, 'init', '-q')
+    (tmp_path / '.gitignore').write_text('build/\n')
+    (tmp_path / 'kept.py').write_text('x = 1\n')
+    (tmp_path / 'edited.py').write_text('x = 1\n')
+    git(tmp_path, 'add', '.')
+    git(tmp_path, 'commit', '-q', '-m', 'base')
+
+    (tmp_path / 'edited.py').write_text('x = 2\n')
+    (tmp_path / 'pkg').mkdir()
+    (tmp_path / 'pkg' / 'new.py').write_text('x = 3\n')
+    (tmp_path / 'build').mkdir()
+    (tmp_path / 'build' / 'out.py').write_text('x = 4\n')
+
+    auditor = AVASystemAuditor(root_path=str(tmp_path))
+    assert sorted(auditor.changed_files_since('HEAD')) == ['edited.py', 'pkg/new.py']
+
+
+def test_changed_files_outside_repository(tmp_path, capsys):
+    auditor = AVASystemAuditor(root_path=str(tmp_path))
+    assert auditor.changed_files_since('HEAD') is None
+    assert 'auditing all files' in capsys.readouterr().out
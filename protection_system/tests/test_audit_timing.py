@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+System audit timing tests
+Rules are only wrapped in TimedRule when per-rule timing is asked for
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from comprehensive_audit import AVASystemAuditor
+from scan_common.timing import TimedRule
+
+
+def audited(tmp_path: Path, timing: bool) -> AVASystemAuditor:
+    """Auditor after a MANGO RULE audit of one file that does not parse, so the rules run"""
+    repository = tmp_path / 'ava-olo-agricultural-core'
+    repository.mkdir(parents=True)
+    (repository / 'rules.py').write_text("if farmer['country'] == 'Croatia':\n    pass(\n", encoding='utf-8')
+    auditor = AVASystemAuditor(root_path=str(tmp_path), timing=timing)
+    auditor.audit_mango_rule()
+    return auditor
+
+
+def test_rules_are_not_wrapped_by_default(tmp_path):
+    auditor = audited(tmp_path, timing=False)
+    for attr in AVASystemAuditor.RULE_SETS:
+        assert not any(isinstance(rule, TimedRule) for rule in getattr(auditor, attr).rules), attr
+    assert auditor.timings.rules == {}
+    assert [v['principle'] for v in auditor.violations] == ['MANGO RULE']
+
+
+@pytest.mark.parametrize('attr', sorted(AVASystemAuditor.RULE_SETS))
+def test_timing_wraps_every_rule(tmp_path, attr):
+    auditor = AVASystemAuditor(root_path=str(tmp_path), timing=True)
+    assert all(isinstance(rule, TimedRule) for rule in getattr(auditor, attr).rules)
+
+
+def test_timing_keeps_findings(tmp_path):
+    untimed = audited(tmp_path / 'untimed', timing=False)
+    timed = audited(tmp_path / 'timed', timing=True)
+    assert [v['details'] for v in timed.violations] == [v['details'] for v in untimed.violations]
+    assert any(stats['calls'] for stats in timed.timings.rules.values())
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Commit log tests
+Each run audits only the commits after the watermark, and survives rewritten history
+"""
+import sys
+import json
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from commit_log import CommitLog, git_commits
+
+
+@pytest.fixture
+def commit(git):
+    """commit(repo, subject): id of a new empty commit"""
+    def make_commit(repo: Path, subject: str) -> str:
+        git(repo, 'commit', '-q', '--allow-empty', '-m', subject)
+        return git(repo, 'rev-parse', 'HEAD')
+    return make_commit
+
+
+@pytest.fixture
+def repo(tmp_path, git):
+    repository = tmp_path / 'repo'
+    repository.mkdir()
+    git(repository, 'init', '-q')
+    return repository
+
+
+def test_git_commits_oldest_first(repo, commit):
+    first = commit(repo, 'v1.0.0 - start')
+    second = commit(repo, 'fix things')
+    assert git_commits(repo) == [(first, 'v1.0.0 - start'), (second, 'fix things')]
+    assert git_commits(repo, since=first) == [(second, 'fix things')]
+    assert git_commits(repo, limit=1) == [(second, 'fix things')]
+
+
+def test_git_commits_outside_repository(tmp_path):
+    with pytest.raises(RuntimeError):
+        git_commits(tmp_path)
+
+
+def test_watermark_advances(repo, tmp_path, commit):
+    log_file = tmp_path / 'log' / 'commits.jsonl'
+    commit(repo, 'v1.0.0 - start')
+    second = commit(repo, 'no version')
+
+    log = CommitLog(str(log_file))
+    assert log.watermark is None
+    assert [entry['follows_format'] for entry in log.update(repo)] == [True, False]
+    assert log.watermark == second
+
+    third = commit(repo, 'v1.0.1 - next')
+    reloaded = CommitLog(str(log_file))
+    assert reloaded.watermark == second
+    assert [entry['commit'] for entry in reloaded.update(repo)] == [third]
+    assert reloaded.update(repo) == []
+    assert reloaded.compliance() == (2, 3)
+    assert reloaded.compliance(last=2) == (1, 2)
+
+
+def test_rewritten_history_falls_back_to_the_branch(repo, tmp_path, git, commit):
+    log_file = tmp_path / 'commits.jsonl'
+    base = commit(repo, 'v1.0.0 - start')
+    commit(repo, 'v1.1.0 - doomed')
+    log = CommitLog(str(log_file))
+    log.update(repo)
+
+    git(repo, 'reset', '-q', '--hard', base)
+    git(repo, 'reflog', 'expire', '--expire=now', '--all')
+    git(repo, 'gc', '-q', '--prune=now')
+    replacement = commit(repo, 'v1.1.0 - rewritten')
+
+    added = CommitLog(str(log_file)).update(repo)
+    assert [entry['commit'] for entry in added] == [replacement]
+
+
+def test_torn_last_line_is_ignored(tmp_path):
+    log_file = tmp_path / 'commits.jsonl'
+    entry = {'commit': 'abc', 'subject': 'v1.0.0 - x', 'follows_format': True, 'audited': '2026-01-01T00:00:00'}
+    log_file.write_text(json.dumps(entry) + '\n{"commit": "de')
+    log = CommitLog(str(log_file))
+    assert log.watermark == 'abc'
+    assert log.append([('abc', 'v1.0.0 - x')]) == []
+
+    # The next entry starts on its own line, so it is still there on reload
+    log.append([('def', 'v1.0.1 - y')])
+    assert [entry['commit'] for entry in CommitLog(str(log_file)).entries] == ['abc', 'def']
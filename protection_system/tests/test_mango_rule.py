@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+MANGO RULE audit tests
+Condition shapes the AST pass must report, from fixtures/mango_*.txt
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from audit_corpus import SourceFile
+from comprehensive_audit import AVASystemAuditor
+
+FIXTURES = Path(__file__).resolve().parent / 'fixtures'
+
+
+def fixture_statements(name: str):
+    lines = (FIXTURES / name).read_text(encoding='utf-8').splitlines()
+    return [line for line in lines if line and not line.startswith('#')]
+
+
+def check(tmp_path: Path, statement: str):
+    path = tmp_path / 'module.py'
+    path.write_text(statement + '\n', encoding='utf-8')
+    auditor = AVASystemAuditor(root_path=str(tmp_path))
+    source = SourceFile(path, tmp_path)
+    assert source.facts is not None, 'fixture statements must parse'
+    return auditor.check_mango_rule(source)
+
+
+@pytest.mark.parametrize('statement', fixture_statements('mango_violations.txt'))
+def test_reports_hardcoded_shapes(tmp_path, statement):
+    result = check(tmp_path, statement)
+    assert result['counts']['violations_found'] == 1, statement
+    assert result['violations'][0][0] == 'MANGO RULE'
+
+
+@pytest.mark.parametrize('statement', fixture_statements('mango_clean.txt'))
+def test_ignores_non_hardcoded_shapes(tmp_path, statement):
+    result = check(tmp_path, statement)
+    assert result['counts']['violations_found'] == 0, result['violations']
+
+
+def test_audit_does_not_report_success_on_subscript_condition(tmp_path):
+    """The file-level gate must fail, not report "No hardcoded countries/crops found" """
+    repository = tmp_path / 'ava-olo-agricultural-core'
+    repository.mkdir()
+    (repository / 'rules.py').write_text("if farmer['country'] == 'Croatia':\n    pass\n", encoding='utf-8')
+    auditor = AVASystemAuditor(root_path=str(tmp_path))
+    assert auditor.audit_mango_rule() is False
+    assert [v['principle'] for v in auditor.violations] == ['MANGO RULE']
+    assert not any(s['principle'] == 'MANGO RULE' for s in auditor.successes)
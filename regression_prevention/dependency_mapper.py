@@ -6,11 +6,19 @@ Maps module dependencies to prevent unintended side effects during changes
 
 import os
 import re
+import sys
 import json
+import time
 import ast
+import argparse
 from pathlib import Path
-from typing import Dict, List, Set, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 from dataclasses import dataclass
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from scan_common.generated_files import GeneratedFileDetector
+from scan_common.fs_walk import DEFAULT_IO_THREADS, find_repositories, read_ahead, scandir_walk
+from scan_common.ignore_rules import IgnoreMatcher
 # import networkx as nx  # Optional for advanced graph analysis
 # import matplotlib.pyplot as plt  # Optional for visualization
 
@@ -25,11 +33,25 @@ class DependencyRelation:
 class DependencyMapper:
     """Comprehensive dependency analysis for change impact assessment"""
     
-    def __init__(self):
+    # Common directories that don't contain application code, on top of each repository's .gitignore files
+    IGNORE_PATTERNS = [
+        '__pycache__/', '.git/', 'node_modules/', '.env/', 'venv/', 'env/',
+        '.pytest_cache/', '.coverage/', 'dist/', 'build/'
+    ]
+    
+    def __init__(self, io_threads: int = DEFAULT_IO_THREADS):
         self.dependencies = []
         self.file_index = {}
         self.dependency_graph = {}  # Simple dict-based graph
         
+        # Minified bundles and generated files are skipped and summarized
+        self.generated_detector = GeneratedFileDetector()
+        
+        # File reads kept in flight (the repositories live on the slow /mnt/c mount)
+        self.io_threads = io_threads
+        # Files, dependencies and timings per analyzed repository
+        self.repository_stats: Dict[str, Dict] = {}
+        
         # Repository paths to analyze
         self.repo_paths = [
             '/mnt/c/Users/HP/ava-olo-constitutional/ava-olo-agricultural-core',
@@ -75,44 +97,118 @@ class DependencyMapper:
             ]
         }
     
-    def analyze_repositories(self):
-        """Analyze all repositories for dependencies"""
+    def analyze_repositories(self, repo_paths: Optional[List[str]] = None):
+        """Analyze all repositories for dependencies
+        
+        The repositories are walked concurrently and their files are read
+        through one shared pool, so each added repository costs its own
+        files rather than another sequential pass.
+        """
         print("🔍 Starting comprehensive dependency analysis...")
+        repo_paths = [path for path in (repo_paths or self.repo_paths) if os.path.exists(path)]
+        print(f"  📂 Analyzing {len(repo_paths)} repositories...")
+        
+        to_read = []
+        owners = []
+        for repo_path, (files, skipped, seconds) in zip(repo_paths, read_ahead(repo_paths, self.collect_directory, self.io_threads)):
+            for file_path, skip_reason in skipped:
+                self.generated_detector.record(file_path, skip_reason)
+            self.repository_stats[repo_path] = {
+                'files': 0, 'skipped': len(skipped), 'dependencies': 0,
+                'walk_seconds': seconds, 'analyze_seconds': 0.0
+            }
+            to_read.extend(files)
+            owners.extend([repo_path] * len(files))
         
-        for repo_path in self.repo_paths:
-            if os.path.exists(repo_path):
-                print(f"  📂 Analyzing {repo_path}...")
-                self.analyze_directory(repo_path)
+        self.analyze_files(to_read, owners)
         
         self.build_dependency_graph()
         print(f"✅ Analysis complete. Found {len(self.dependencies)} dependencies.")
+        for repo_path, stats in self.repository_stats.items():
+            print(f"  📂 {repo_path}: {stats['dependencies']} dependencies in {stats['files']} files "
+                  f"(walk {stats['walk_seconds']:.2f}s, done after {stats['analyze_seconds']:.2f}s)")
+        for reason, count in self.generated_detector.summary().items():
+            print(f"  ⏭️ Skipped {count} files ({reason})")
         
         return self.dependencies
     
     def analyze_directory(self, directory: str):
         """Recursively analyze directory for dependencies"""
-        for root, dirs, files in os.walk(directory):
-            # Skip common directories that don't contain application code
-            dirs[:] = [d for d in dirs if d not in [
-                '__pycache__', '.git', 'node_modules', '.env', 'venv', 'env',
-                '.pytest_cache', '.coverage', 'dist', 'build'
-            ]]
-            
-            for file in files:
-                file_path = os.path.join(root, file)
-                
-                # Check if file matches any pattern we care about
-                for file_type, pattern in self.file_patterns.items():
-                    if re.match(pattern, file, re.IGNORECASE):
-                        self.analyze_file(file_path, file_type)
-                        break
+        files, skipped, _ = self.collect_directory(directory)
+        for file_path, skip_reason in skipped:
+            self.generated_detector.record(file_path, skip_reason)
+        self.analyze_files(files)
     
-    def analyze_file(self, file_path: str, file_type: str):
-        """Analyze individual file for dependencies"""
+    def collect_directory(self, directory: str) -> Tuple[List[Tuple[str, str]], List[Tuple[str, str]], float]:
+        """Walk a directory with os.scandir; returns (path, file type) to analyze, (path, reason) skipped and seconds
+        
+        Only reads the tree, so several directories can be collected in parallel.
+        """
+        start = time.perf_counter()
+        # Only files matching a pattern we care about are stat'ed
+        entries = scandir_walk(directory,
+                               include_file=lambda entry: self.file_type_for(entry.name) is not None,
+                               ignore=IgnoreMatcher(directory, self.IGNORE_PATTERNS))
+        
+        files = []
+        skipped = []
+        for file_path, stat in entries:
+            skip_reason = self.generated_detector.reason_before_read(file_path, stat.st_size)
+            if skip_reason:
+                skipped.append((file_path, skip_reason))
+            else:
+                files.append((file_path, self.file_type_for(os.path.basename(file_path))))
+        return files, skipped, time.perf_counter() - start
+    
+    def analyze_files(self, files: List[Tuple[str, str]], owners: Optional[List[str]] = None):
+        """Analyze (path, file type) pairs in order while reader threads read ahead
+        
+        owners names each file's repository so its analyzed or skipped file,
+        its dependencies and its finishing time are added to repository_stats.
+        """
+        start = time.perf_counter()
+        contents = read_ahead(files, lambda item: self.read_file(item[0]), self.io_threads)
+        for index, ((file_path, file_type), content) in enumerate(zip(files, contents)):
+            found_before = len(self.dependencies)
+            skipped_before = len(self.generated_detector.skipped)
+            self.analyze_file(file_path, file_type, content)
+            if owners is not None:
+                stats = self.repository_stats[owners[index]]
+                stats['dependencies'] += len(self.dependencies) - found_before
+                stats['skipped'] += len(self.generated_detector.skipped) - skipped_before
+                if file_path in self.file_index:  # Not skipped for its content or unreadable
+                    stats['files'] += 1
+                stats['analyze_seconds'] = time.perf_counter() - start
+    
+    def file_type_for(self, file_name: str) -> Optional[str]:
+        """First file type whose pattern matches the name, or None"""
+        for file_type, pattern in self.file_patterns.items():
+            if re.match(pattern, file_name, re.IGNORECASE):
+                return file_type
+        return None
+    
+    @staticmethod
+    def read_file(file_path: str):
+        """File text, or the exception raised reading it (runs in reader threads)"""
         try:
             with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-                lines = content.split('\n')
+                return f.read()
+        except Exception as e:
+            return e
+    
+    def analyze_file(self, file_path: str, file_type: str, content: Optional[str] = None):
+        """Analyze individual file for dependencies"""
+        try:
+            if content is None:
+                content = self.read_file(file_path)
+            if isinstance(content, Exception):
+                raise content
+            lines = content.split('\n')
+            
+            skip_reason = self.generated_detector.reason_for_content(content)
+            if skip_reason:
+                self.generated_detector.record(file_path, skip_reason)
+                return
             
             # Index file for quick lookup
             self.file_index[file_path] = {
@@ -131,6 +227,9 @@ class DependencyMapper:
                 self.analyze_html_file(file_path, content, lines)
             elif file_type == 'css':
                 self.analyze_css_file(file_path, content, lines)
+        
+        except Exception as e:
+            print(f"    ⚠️ Error analyzing {file_path}: {e}")
     
     def analyze_css_file(self, file_path: str, content: str, lines: List[str]):
         """Analyze CSS file for imports and dependencies"""
@@ -493,6 +592,7 @@ Generated: {datetime.now().isoformat()}
 ## Summary
 - Total Dependencies: {len(self.dependencies)}
 - Files Analyzed: {len(self.file_index)}
+- Files Skipped (minified/generated): {len(self.generated_detector.skipped)}
 - Dependency Types: {len(set(dep.dependency_type for dep in self.dependencies))}
 
 ## Dependency Breakdown by Type
@@ -515,6 +615,20 @@ Generated: {datetime.now().isoformat()}
             if len(deps) > 10:
                 report += f"- ... and {len(deps) - 10} more\n"
         
+        if self.repository_stats:
+            report += "\n## Repositories\n"
+            report += "| Repository | Files | Skipped | Dependencies | Walk (s) | Done After (s) |\n"
+            report += "|------------|-------|---------|--------------|----------|----------------|\n"
+            for repo_path, stats in self.repository_stats.items():
+                report += (f"| {os.path.basename(repo_path)} | {stats['files']} | {stats['skipped']} | "
+                           f"{stats['dependencies']} | {stats['walk_seconds']:.2f} | {stats['analyze_seconds']:.2f} |\n")
+        
+        skipped_summary = self.generated_detector.summary()
+        if skipped_summary:
+            report += "\n## Skipped Files\n"
+            for reason, count in skipped_summary.items():
+                report += f"- {reason}: {count}\n"
+        
         # Critical components analysis
         critical_deps = [dep for dep in self.dependencies if dep.dependency_type == 'critical_component']
         if critical_deps:
@@ -565,14 +679,29 @@ Generated: {datetime.now().isoformat()}
         
         print(f"📊 Dependency analysis saved to {output_dir}")
 
-def main():
+def main(argv: Optional[List[str]] = None):
     """Main analysis execution"""
-    mapper = DependencyMapper()
+    parser = argparse.ArgumentParser(description='Dependency Mapping and Change Impact Analysis')
+    parser.add_argument('repos', nargs='*', help='Repositories to analyze (default: agricultural-core and '
+                                                  'monitoring-dashboards)')
+    parser.add_argument('--all-repos', action='store_true',
+                        help='Analyze every ava-olo-* repository under --root')
+    parser.add_argument('--root', default='/mnt/c/Users/HP/ava-olo-constitutional',
+                        help='Directory containing the ava-olo-* repositories (with --all-repos)')
+    parser.add_argument('--io-threads', type=int, default=DEFAULT_IO_THREADS,
+                        help=f'Overlap up to N file reads (default: {DEFAULT_IO_THREADS}; 1 = serial reads)')
+    args = parser.parse_args(argv)
+    
+    mapper = DependencyMapper(io_threads=args.io_threads)
+    if args.all_repos:
+        mapper.repo_paths = find_repositories(args.root) + args.repos
+    elif args.repos:
+        mapper.repo_paths = args.repos
     
     print("🔗 Dependency Mapping and Change Impact Analysis")
     print("=" * 60)
     
-    # Analyze repositories
+    # Analyze all repositories together
     dependencies = mapper.analyze_repositories()
     
     # Save analysis
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+DependencyMapper repository statistics tests
+A file skipped for its content counts as skipped, not as analyzed
+"""
+import os
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from dependency_mapper import DependencyMapper
+
+
+def test_skipped_files_are_not_counted_as_analyzed(tmp_path, capsys):
+    repository = tmp_path / 'ava-olo-shared'
+    repository.mkdir()
+    (repository / 'app.py').write_text('import json\n', encoding='utf-8')
+    (repository / 'bundle.js').write_text('var a = 1;\n//# sourceMappingURL=bundle.js.map\n',
+                                          encoding='utf-8')
+    (repository / 'schema_pb2.py').write_text('# @generated by protoc\nimport json\n', encoding='utf-8')
+
+    mapper = DependencyMapper(io_threads=1)
+    mapper.analyze_repositories([str(repository)])
+    stats = mapper.repository_stats[str(repository)]
+    assert stats['files'] == 1
+    assert stats['skipped'] == 2
+    assert list(mapper.file_index) == [str(repository / 'app.py')]
+    assert '1 files' in capsys.readouterr().out
+
+
+def test_ignored_directories_are_not_walked(tmp_path):
+    repository = tmp_path / 'ava-olo-shared'
+    for relative in ('app.py', '.github/scripts/check.py', '.git/hooks/hook.py', 'generated/out.py'):
+        path = repository / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text('import json\n', encoding='utf-8')
+    (repository / '.gitignore').write_text('generated/\n', encoding='utf-8')
+
+    files, skipped, _ = DependencyMapper(io_threads=1).collect_directory(str(repository))
+    assert sorted(os.path.relpath(path, str(repository)) for path, _ in files) == [
+        os.path.join('.github', 'scripts', 'check.py'), 'app.py'
+    ]
+    assert skipped == []
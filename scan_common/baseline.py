@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Violation Baseline for AVA OLO scanners
+Fingerprints of accepted findings, so a run only reports what is new
+"""
+import os
+import json
+import hashlib
+from typing import Iterable, Set
+
+BASELINE_FORMAT = 1
+
+
+def normalize_code(code: str) -> str:
+    """Code line with indentation and runs of whitespace collapsed"""
+    return ' '.join(code.split())
+
+
+def fingerprint(path: str, rule: str, code: str, occurrence: int = 0) -> str:
+    """Stable id of a finding: its file, rule and normalized code line
+
+    The line number is not part of it, so a finding keeps its fingerprint
+    when code above it moves. path should be relative to the scan root so
+    checkouts in different places agree. occurrence numbers identical
+    lines of one file that break the same rule; without it they share a
+    fingerprint.
+    """
+    parts = [path.replace(os.sep, '/'), rule, normalize_code(code)]
+    if occurrence:
+        parts.append(str(occurrence))
+    key = '\0'.join(parts)
+    return hashlib.sha256(key.encode('utf-8', errors='surrogateescape')).hexdigest()[:32]
+
+
+class Baseline:
+    """Set of known fingerprints, checked in O(1) per finding
+
+    known() also records every fingerprint it is asked about, so after a
+    full run save() writes the baseline of everything currently found.
+    """
+
+    def __init__(self, fingerprints: Iterable[str] = ()):
+        self.fingerprints: Set[str] = set(fingerprints)
+        self.seen: Set[str] = set()
+        self.suppressed = 0
+
+    @classmethod
+    def load(cls, path: str) -> 'Baseline':
+        """Baseline from a file written by save(); raises OSError or ValueError"""
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if not isinstance(data, dict) or data.get('format') != BASELINE_FORMAT:
+            raise ValueError(f'{path} is not a version {BASELINE_FORMAT} baseline file')
+        return cls(data.get('fingerprints', []))
+
+    def known(self, finding_fingerprint: str) -> bool:
+        """True if the finding is in the baseline (and counts it as suppressed)"""
+        self.seen.add(finding_fingerprint)
+        if finding_fingerprint in self.fingerprints:
+            self.suppressed += 1
+            return True
+        return False
+
+    def known_all(self, fingerprints: Iterable[str]) -> bool:
+        """True if every fingerprint of a multi-line finding is in the baseline (counted once)"""
+        fingerprints = list(fingerprints)
+        self.seen.update(fingerprints)
+        if fingerprints and all(item in self.fingerprints for item in fingerprints):
+            self.suppressed += 1
+            return True
+        return False
+
+    def reset(self):
+        """Forget what the last run saw, for a rerun with the same baseline"""
+        self.seen = set()
+        self.suppressed = 0
+
+    def save(self, path: str):
+        """Write every fingerprint seen since the last reset as the new baseline"""
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'format': BASELINE_FORMAT, 'fingerprints': sorted(self.seen)}, f, indent=0)
+        os.replace(tmp_path, path)
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Unified Diff Hunks for AVA OLO scanners
+Which new-side lines of each file a diff adds or touches
+"""
+import re
+import subprocess
+from typing import Dict, Iterable, List, Optional, Set
+
+from scan_common.git_blobs import is_null_oid
+
+# Unchanged lines scanned on each side of a change by default
+DEFAULT_HUNK_CONTEXT = 1
+
+HUNK_HEADER = re.compile(r'@@ -\d+(?:,(\d+))? \+(\d+)(?:,(\d+))? @@')
+INDEX_LINE = re.compile(r'index ([0-9a-fA-F]+)\.\.([0-9a-fA-F]+)')
+
+
+def unquote_path(path: str) -> str:
+    """Path from a diff header, with git's C-style quoting removed"""
+    path = path.split('\t', 1)[0]
+    if len(path) >= 2 and path.startswith('"') and path.endswith('"'):
+        # Octal escapes are UTF-8 bytes
+        raw = path[1:-1].encode('latin-1', errors='backslashreplace').decode('unicode_escape')
+        path = raw.encode('latin-1', errors='ignore').decode('utf-8', errors='replace')
+    return path
+
+
+def strip_prefix(path: str) -> str:
+    """Drop the a/ or b/ prefix git puts on diff paths"""
+    if path.startswith(('a/', 'b/')):
+        return path[2:]
+    return path
+
+
+class FileChange:
+    """New-side changes of one file in a unified diff
+
+    added holds the line numbers of added lines. A removal with nothing
+    added in its place leaves a deletion point p (between lines p-1 and p),
+    which only reaches the scan through the context window. lines keeps
+    every new-side line the diff itself shows (added and context), for
+    diffs whose new blob is not in the repository.
+    """
+
+    __slots__ = ('path', 'new_blob', 'deleted', 'binary', 'added', 'deletion_points', 'lines')
+
+    def __init__(self, path: str):
+        self.path = path
+        self.new_blob: Optional[str] = None
+        self.deleted = False
+        self.binary = False
+        self.added: List[int] = []
+        self.deletion_points: List[int] = []
+        self.lines: Dict[int, str] = {}
+
+    def lines_to_scan(self, context: int, line_count: Optional[int] = None) -> List[int]:
+        """Sorted new-side line numbers within context lines of a change"""
+        selected: Set[int] = set()
+        for line in self.added:
+            selected.update(range(line - context, line + context + 1))
+        for point in self.deletion_points:
+            selected.update(range(point - context, point + context))
+        return sorted(line for line in selected
+                      if line >= 1 and (line_count is None or line <= line_count))
+
+
+def parse_unified_diff(lines: Iterable[str]) -> List[FileChange]:
+    """Changed files of a unified diff (git or plain `diff -u`), in diff order"""
+    changes: List[FileChange] = []
+    current: Optional[FileChange] = None
+    old_remaining = new_remaining = 0
+    new_line = 0
+    pending_deletion = False
+
+    for raw in lines:
+        line = raw.rstrip('\n').rstrip('\r')
+
+        if old_remaining > 0 or new_remaining > 0:
+            tag = line[:1]
+            if tag == '+':
+                current.lines[new_line] = line[1:] + '\n'
+                current.added.append(new_line)
+                new_line += 1
+                new_remaining -= 1
+                pending_deletion = False
+                continue
+            if tag == '-':
+                old_remaining -= 1
+                pending_deletion = True
+                continue
+            if tag == ' ' or line == '':
+                if pending_deletion:
+                    current.deletion_points.append(new_line)
+                    pending_deletion = False
+                current.lines[new_line] = line[1:] + '\n'
+                new_line += 1
+                old_remaining -= 1
+                new_remaining -= 1
+                continue
+            if tag == '\\':  # "\ No newline at end of file"
+                continue
+            # Malformed hunk - fall through to header parsing
+            old_remaining = new_remaining = 0
+
+        if pending_deletion and current is not None:
+            current.deletion_points.append(new_line)
+            pending_deletion = False
+
+        if line.startswith('\\'):
+            continue
+
+        if line.startswith('diff --git '):
+            current = FileChange('')
+            changes.append(current)
+            continue
+
+        if line.startswith('--- '):
+            if current is None or current.path or current.added or current.deletion_points:
+                # Plain diff without a "diff --git" line
+                current = FileChange('')
+                changes.append(current)
+            continue
+
+        if current is None:
+            continue
+
+        if line.startswith('+++ '):
+            path = unquote_path(line[4:])
+            if path == '/dev/null':
+                current.deleted = True
+            else:
+                current.path = strip_prefix(path)
+        elif line.startswith('rename to ') or line.startswith('copy to '):
+            current.path = unquote_path(line.split(' ', 2)[2])
+        elif line.startswith('deleted file mode'):
+            current.deleted = True
+        elif line.startswith('Binary files ') or line.startswith('GIT binary patch'):
+            current.binary = True
+        elif line.startswith('index '):
+            match = INDEX_LINE.match(line)
+            if match:
+                current.new_blob = match.group(2)
+                if is_null_oid(current.new_blob):
+                    current.deleted = True
+        elif line.startswith('@@'):
+            match = HUNK_HEADER.match(line)
+            if match:
+                old_count, new_start, new_count = match.groups()
+                old_remaining = 1 if old_count is None else int(old_count)
+                new_remaining = 1 if new_count is None else int(new_count)
+                # A hunk that adds nothing (+N,0) is anchored after line N
+                new_line = int(new_start) if new_remaining else int(new_start) + 1
+
+    if pending_deletion and current is not None:
+        current.deletion_points.append(new_line)
+
+    for change in changes:
+        if not change.path:
+            # "diff --git a/x b/x" with no ---/+++ lines (mode change, empty file)
+            change.deleted = True
+    return changes
+
+
+def git_range_diff(repo_dir: str, git_range: str) -> str:
+    """Unified diff (no context, full blob ids) of a git range; REV alone means REV..HEAD
+
+    Raises RuntimeError if git fails.
+    """
+    revisions = [git_range] if '..' in git_range else [git_range, 'HEAD']
+    result = subprocess.run(
+        ['git', 'diff', '--no-color', '--no-ext-diff', '--unified=0', '--full-index', '-M',
+         *revisions, '--'],
+        cwd=repo_dir,
+        capture_output=True,
+        text=True,
+        encoding='utf-8',
+        errors='surrogateescape'
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip() or f'git diff {git_range} failed')
+    return result.stdout
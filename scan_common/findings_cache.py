@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Persistent Findings Cache for AVA OLO compliance scans
+Lets scanners skip files whose content and rule set have not changed
+"""
+import os
+import json
+import hashlib
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Union
+
+
+class FindingsCache:
+    """On-disk per-file findings cache keyed by path, content hash and rule set
+
+    Lookups use a cheap (size, mtime) fast path first. When the stat data
+    changed but the size did not, the content hash decides whether the cached
+    findings are still valid. Any change to the rule set invalidates the
+    whole cache.
+    """
+
+    FORMAT_VERSION = 1
+
+    def __init__(self, cache_file: Union[str, Path], ruleset_hash: str):
+        self.cache_file = Path(cache_file)
+        self.ruleset_hash = ruleset_hash
+        self.entries: Dict[str, Dict] = {}
+        self.touched = set()
+        self.dirty = False
+        self.hits = 0
+        self.misses = 0
+        self.load()
+
+    @staticmethod
+    def hash_content(content: Union[str, bytes]) -> str:
+        if isinstance(content, str):
+            content = content.encode('utf-8', errors='surrogatepass')
+        return hashlib.sha256(content).hexdigest()
+
+    @staticmethod
+    def hash_ruleset(rules: Any) -> str:
+        """Stable hash of any JSON-representable rule definition"""
+        serialized = json.dumps(rules, sort_keys=True, default=str)
+        return hashlib.sha256(serialized.encode('utf-8')).hexdigest()
+
+    def load(self):
+        """Load cache from disk, discarding it if format or rule set differ"""
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        if data.get('format_version') != self.FORMAT_VERSION:
+            return
+        if data.get('ruleset_hash') != self.ruleset_hash:
+            return
+
+        self.entries = data.get('entries', {})
+
+    def get(self, key: str, size: int, mtime_ns: int,
+            content_hash: Callable[[], Optional[str]]) -> Optional[Any]:
+        """Return cached findings for an unchanged file, otherwise None
+
+        content_hash is only called when the stat fast path is inconclusive,
+        so unchanged files are never read.
+        """
+        entry = self.entries.get(key)
+        if entry is not None and entry['size'] == size:
+            if entry['mtime_ns'] == mtime_ns:
+                return self._hit(key, entry)
+
+            if entry['hash'] == content_hash():
+                # Touched but not modified (checkout, copy) - refresh stat data
+                entry['mtime_ns'] = mtime_ns
+                self.dirty = True
+                return self._hit(key, entry)
+
+        self.misses += 1
+        return None
+
+    def is_fresh(self, key: str, size: int, mtime_ns: int) -> bool:
+        """True if get() will hit on stat data alone (the file need not be read)"""
+        entry = self.entries.get(key)
+        return entry is not None and entry['size'] == size and entry['mtime_ns'] == mtime_ns
+
+    def _hit(self, key: str, entry: Dict) -> Any:
+        self.hits += 1
+        self.touched.add(key)
+        return entry['findings']
+
+    def put(self, key: str, size: int, mtime_ns: int, content_hash: Optional[str], findings: Any):
+        """Store findings for a file (files without a content hash are not cached)"""
+        if content_hash is None:
+            return
+        self.entries[key] = {
+            'size': size,
+            'mtime_ns': mtime_ns,
+            'hash': content_hash,
+            'findings': findings
+        }
+        self.touched.add(key)
+        self.dirty = True
+
+    def discard(self, key: str):
+        """Drop the entry for a single file (deleted while a long-running scan was active)"""
+        self.touched.discard(key)
+        if self.entries.pop(key, None) is not None:
+            self.dirty = True
+
+    def discard_untouched(self):
+        """Drop entries for files not seen in this run (deleted or now ignored)"""
+        stale = [key for key in self.entries if key not in self.touched]
+        for key in stale:
+            del self.entries[key]
+        if stale:
+            self.dirty = True
+
+    def save(self):
+        """Write the cache atomically if anything changed"""
+        if not self.dirty:
+            return
+
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.cache_file.with_name(self.cache_file.name + '.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({
+                'format_version': self.FORMAT_VERSION,
+                'ruleset_hash': self.ruleset_hash,
+                'entries': self.entries
+            }, f)
+        os.replace(tmp_file, self.cache_file)
+        self.dirty = False
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Git Blob Reader for AVA OLO scanners
+Reads committed or staged file contents through one long-running git cat-file process
+"""
+import subprocess
+import threading
+from typing import List, Optional, Tuple
+
+
+def is_null_oid(oid: Optional[str]) -> bool:
+    """True for the all-zero object id git uses for "no file" on one side of a diff"""
+    return not oid or not oid.strip('0')
+
+
+def git_prefix(directory: str) -> str:
+    """Path of directory below its repository's top level, with a trailing /
+
+    Empty at the top level and outside a repository. Diffs name files
+    relative to the top level, so this is what to strip to get paths
+    relative to directory.
+    """
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--show-prefix'], cwd=directory,
+                                capture_output=True, text=True, encoding='utf-8',
+                                errors='surrogateescape')
+    except OSError:
+        return ''
+    return result.stdout.rstrip('\n') if result.returncode == 0 else ''
+
+
+class GitBlobReader:
+    """One `git cat-file --batch` process per repository
+
+    read() takes any object name git understands - a blob id (full or
+    abbreviated), `REV:path` or `:path` for the staged version - and returns
+    the blob's bytes, or None if it does not exist or is not a blob. The
+    process is started on first use and reused for every read, so scanning
+    a few hundred files costs one process, not one per file. Working-tree
+    files are never opened. Reads are serialized, so reader threads may
+    share one instance.
+    """
+
+    def __init__(self, repo_dir: str):
+        self.repo_dir = repo_dir
+        self.process: Optional[subprocess.Popen] = None
+        self.failed = False
+        self.reads = 0
+        self.lock = threading.Lock()
+
+    def start(self) -> bool:
+        if self.process is None and not self.failed:
+            try:
+                self.process = subprocess.Popen(
+                    ['git', 'cat-file', '--batch'],
+                    cwd=self.repo_dir,
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL
+                )
+            except OSError:
+                self.failed = True
+        return self.process is not None
+
+    def read(self, name: str) -> Optional[bytes]:
+        """Contents of the blob called name, or None"""
+        with self.lock:
+            return self._read(name)
+
+    def _read(self, name: str) -> Optional[bytes]:
+        if '\n' in name or not self.start():
+            return None
+
+        try:
+            self.process.stdin.write(name.encode('utf-8') + b'\n')
+            self.process.stdin.flush()
+            header = self.process.stdout.readline()
+        except OSError:
+            header = b''
+        if not header:
+            # Not a repository, or git exited
+            self.close()
+            self.failed = True
+            return None
+
+        # "<oid> <type> <size>" on success, "<name> missing" / "<name> ambiguous" otherwise
+        parts = header.rstrip(b'\n').split(b' ')
+        if len(parts) != 3 or not parts[2].isdigit():
+            return None
+        data = self.process.stdout.read(int(parts[2]))
+        self.process.stdout.read(1)  # Trailing newline
+        self.reads += 1
+        return data if parts[1] == b'blob' else None
+
+    def close(self):
+        if self.process is not None:
+            try:
+                self.process.stdin.close()
+            except OSError:
+                pass
+            self.process.wait()
+            self.process = None
+
+    def __enter__(self) -> 'GitBlobReader':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def staged_blobs(repo_dir: str) -> List[Tuple[str, str]]:
+    """(path, blob id) of every file added, copied, modified or renamed in the index
+
+    Paths are relative to repo_dir, which may be a subdirectory of the
+    repository (only files under it are listed). Works before the first
+    commit. Raises RuntimeError if git fails.
+    """
+    try:
+        # Outside a repository `git diff` silently turns into `git diff --no-index`
+        inside = subprocess.run(['git', 'rev-parse', '--is-inside-work-tree'],
+                                cwd=repo_dir, capture_output=True)
+        if inside.returncode != 0:
+            raise RuntimeError(inside.stderr.decode('utf-8', errors='replace').strip())
+        result = subprocess.run(
+            ['git', 'diff', '--cached', '--raw', '-z', '--no-abbrev', '-M',
+             '--diff-filter=ACMR', '--relative'],
+            cwd=repo_dir,
+            capture_output=True
+        )
+    except OSError as e:
+        raise RuntimeError(str(e))
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.decode('utf-8', errors='replace').strip() or 'git diff --cached failed')
+
+    # ":<old mode> <new mode> <old id> <new id> <status>\0<path>\0", renames and copies add the source path
+    fields = result.stdout.split(b'\0')
+    blobs = []
+    i = 0
+    while i + 1 < len(fields):
+        meta = fields[i].decode('ascii', errors='replace')
+        i += 1
+        if not meta.startswith(':'):
+            continue
+        _, new_mode, _, new_oid, status = meta[1:].split(' ')
+        if status[:1] in ('R', 'C'):
+            i += 1
+        path = fields[i].decode('utf-8', errors='surrogateescape')
+        i += 1
+        if new_mode != '160000':  # Submodule commits are not blobs
+            blobs.append((path, new_oid))
+    return blobs
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Gitignore-Aware Ignore Matcher for AVA OLO scanners
+Prunes ignored directories before they are walked
+"""
+import os
+import re
+from typing import Dict, Iterable, List, Optional
+
+# Project-level ignore file (gitignore syntax), read from the scan root
+PROJECT_IGNORE_FILE = '.avaoloignore'
+GITIGNORE_FILE = '.gitignore'
+
+
+def glob_to_regex(glob: str) -> str:
+    """Translate a gitignore glob (with ** support) to a regex for '/'-separated paths"""
+    parts = []
+    i = 0
+    while i < len(glob):
+        if glob.startswith('**/', i):
+            parts.append('(?:.*/)?')
+            i += 3
+        elif glob.startswith('/**', i) and i + 3 == len(glob):
+            parts.append('/.*')
+            i += 3
+        elif glob.startswith('**', i):
+            parts.append('.*')
+            i += 2
+        elif glob[i] == '*':
+            parts.append('[^/]*')
+            i += 1
+        elif glob[i] == '?':
+            parts.append('[^/]')
+            i += 1
+        elif glob[i] == '[':
+            end = glob.find(']', i + 2 if glob[i + 1:i + 2] in ('!', '^') else i + 1)
+            if end == -1:
+                parts.append(re.escape('['))
+                i += 1
+                continue
+            members = glob[i + 1:end]
+            if members[:1] in ('!', '^'):
+                members = '^' + members[1:]
+            parts.append(f"[{members.replace(chr(92), chr(92) * 2)}]")
+            i = end + 1
+        elif glob[i] == '\\' and i + 1 < len(glob):
+            parts.append(re.escape(glob[i + 1]))
+            i += 2
+        else:
+            parts.append(re.escape(glob[i]))
+            i += 1
+    return ''.join(parts)
+
+
+class IgnorePattern:
+    """One compiled gitignore line, relative to the directory of its ignore file"""
+
+    def __init__(self, line: str, base: str):
+        self.base = base  # '/'-separated, relative to the matcher root ('' for the root)
+        self.negated = line.startswith('!')
+        if self.negated:
+            line = line[1:]
+        self.directory_only = line.endswith('/')
+        line = line.rstrip('/')
+        # Without an inner slash the pattern matches a name at any depth
+        self.anchored = '/' in line
+        line = line.lstrip('/')
+        self.source = line
+        self.regex = re.compile(glob_to_regex(line) + r'\Z', re.DOTALL)
+
+    def matches(self, relative_path: str, is_dir: bool) -> bool:
+        """relative_path is '/'-separated and relative to the matcher root"""
+        if self.directory_only and not is_dir:
+            return False
+        if self.base:
+            if not relative_path.startswith(self.base + '/'):
+                return False
+            relative_path = relative_path[len(self.base) + 1:]
+        if self.anchored:
+            return self.regex.match(relative_path) is not None
+        return self.regex.match(relative_path.rsplit('/', 1)[-1]) is not None
+
+
+def parse_ignore_lines(lines: Iterable[str], base: str = '') -> List[IgnorePattern]:
+    patterns = []
+    for line in lines:
+        line = line.rstrip('\n').rstrip('\r')
+        # Trailing spaces are ignored unless escaped
+        stripped = line.rstrip(' ')
+        if stripped.endswith('\\') and len(stripped) < len(line):
+            stripped += ' '
+        if not stripped or stripped.startswith('#'):
+            continue
+        patterns.append(IgnorePattern(stripped, base))
+    return patterns
+
+
+class IgnoreMatcher:
+    """Decides which paths under a scan root are ignored
+
+    Rules come from built-in defaults, the project ignore file at the root
+    and every .gitignore between the root and the path, in that order; like
+    git, the last matching rule wins and '!' re-includes. Walkers call
+    is_ignored() on each directory entry and never descend into an ignored
+    directory.
+    """
+
+    def __init__(self, root: str, default_patterns: Iterable[str] = (),
+                 project_ignore_file: Optional[str] = PROJECT_IGNORE_FILE,
+                 use_gitignore: bool = True):
+        self.root = os.path.abspath(root)
+        self.use_gitignore = use_gitignore
+        self.base_patterns = parse_ignore_lines(default_patterns)
+        if project_ignore_file:
+            self.base_patterns += self._read_ignore_file(os.path.join(self.root, project_ignore_file), '')
+        # .gitignore rules per root-relative directory ('' is the root)
+        self._directory_patterns: Dict[str, List[IgnorePattern]] = {}
+        # All rules in effect inside a directory, in precedence order
+        self._rules: Dict[str, List[IgnorePattern]] = {}
+
+    @staticmethod
+    def _read_ignore_file(path: str, base: str) -> List[IgnorePattern]:
+        try:
+            with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+                return parse_ignore_lines(f, base)
+        except OSError:
+            return []
+
+    def relative(self, path: str) -> str:
+        relative = os.path.relpath(os.path.abspath(path), self.root)
+        return '' if relative == '.' else relative.replace(os.sep, '/')
+
+    def load_directory(self, relative_dir: str, has_gitignore: Optional[bool] = None) -> List[IgnorePattern]:
+        """.gitignore rules of one directory (read once; has_gitignore=False skips the open)"""
+        patterns = self._directory_patterns.get(relative_dir)
+        if patterns is None:
+            patterns = []
+            if self.use_gitignore and has_gitignore is not False:
+                directory = os.path.join(self.root, relative_dir) if relative_dir else self.root
+                patterns = self._read_ignore_file(os.path.join(directory, GITIGNORE_FILE), relative_dir)
+            self._directory_patterns[relative_dir] = patterns
+        return patterns
+
+    def _rules_for(self, relative_dir: str) -> List[IgnorePattern]:
+        rules = self._rules.get(relative_dir)
+        if rules is None:
+            if relative_dir:
+                parent = relative_dir.rsplit('/', 1)[0] if '/' in relative_dir else ''
+                rules = self._rules_for(parent) + self.load_directory(relative_dir)
+            else:
+                rules = self.base_patterns + self.load_directory('')
+            self._rules[relative_dir] = rules
+        return rules
+
+    def is_ignored(self, path: str, is_dir: bool, check_parents: bool = False) -> bool:
+        """True if path is ignored; check_parents also honours ignored ancestor directories"""
+        relative = self.relative(path)
+        if not relative or relative.startswith('..'):
+            return False
+
+        if check_parents:
+            parts = relative.split('/')
+            for depth in range(1, len(parts)):
+                if self.is_relative_ignored('/'.join(parts[:depth]), True):
+                    return True
+
+        return self.is_relative_ignored(relative, is_dir)
+
+    def is_relative_ignored(self, relative: str, is_dir: bool) -> bool:
+        """is_ignored() for a '/'-separated root-relative path whose parents are not ignored"""
+        parent = relative.rsplit('/', 1)[0] if '/' in relative else ''
+        ignored = False
+        for pattern in self._rules_for(parent):
+            # Last matching rule wins, so only rules that would flip the state matter
+            if pattern.negated == ignored and pattern.matches(relative, is_dir):
+                ignored = not pattern.negated
+        return ignored
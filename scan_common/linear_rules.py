@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Linear-Time Rule Engine for AVA OLO compliance scans
+Evaluates wildcard-chained rules like `elif.*elif.*elif` without regex backtracking
+"""
+import re
+from typing import List, Optional, Tuple
+
+
+def split_top_level(pattern: str, separator: str) -> List[str]:
+    """Split a regex on separator occurrences outside groups, classes and escapes"""
+    parts = []
+    depth = 0
+    in_class = False
+    start = 0
+    i = 0
+
+    while i < len(pattern):
+        char = pattern[i]
+        if char == '\\':
+            i += 2
+            continue
+        if in_class:
+            if char == ']':
+                in_class = False
+        elif char == '[':
+            in_class = True
+            # A ']' right after '[' or '[^' is a literal member of the class
+            if pattern[i + 1:i + 2] == '^':
+                i += 1
+            if pattern[i + 1:i + 2] == ']':
+                i += 1
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        elif depth == 0 and pattern.startswith(separator, i):
+            parts.append(pattern[start:i])
+            i += len(separator)
+            start = i
+            continue
+        i += 1
+
+    parts.append(pattern[start:])
+    return parts
+
+
+def has_unbounded_wildcard(pattern: str) -> bool:
+    """True if pattern still contains '.*' or '.+' outside character classes"""
+    in_class = False
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == '\\':
+            i += 2
+            continue
+        if in_class:
+            if char == ']':
+                in_class = False
+        elif char == '[':
+            in_class = True
+        elif char == '.' and pattern[i + 1:i + 2] in ('*', '+'):
+            return True
+        i += 1
+    return False
+
+
+class LinearRule:
+    """A regex rule rewritten as alternatives of ordered, wildcard-free atoms
+
+    `A.*B.*C` matches when A, B and C occur in that order on one line. Each
+    atom is searched once, left to right, from where the previous one ended,
+    so evaluation is linear in the input instead of polynomial in the number
+    of wildcards. Matches (and match text) are the same as re.search with the
+    original pattern for the rule sets used by the AVA OLO scanners.
+    """
+
+    def __init__(self, pattern: str, flags: int = 0):
+        self.pattern = pattern
+        self.flags = flags
+        # Each alternative: (atoms, starts with a wildcard, ends with a wildcard)
+        self.alternatives: List[Tuple[List[re.Pattern], bool, bool]] = []
+
+        for alternative in split_top_level(pattern, '|'):
+            pieces = split_top_level(alternative, '.*')
+            atoms = []
+            for atom in pieces:
+                if not atom:
+                    continue  # A wildcard at either end only widens the span
+                if has_unbounded_wildcard(atom):
+                    raise ValueError(
+                        f'Rule {pattern!r} has a nested wildcard in {atom!r}; '
+                        f'only top-level .* chains can be evaluated in linear time'
+                    )
+                atoms.append(re.compile(atom, flags))
+            self.alternatives.append((atoms, len(pieces) > 1 and not pieces[0],
+                                      len(pieces) > 1 and not pieces[-1]))
+
+    @property
+    def first_atoms(self) -> List[str]:
+        """Leading atom of every alternative - a cheap necessary condition for a match"""
+        return [atoms[0].pattern for atoms, _, _ in self.alternatives if atoms]
+
+    def search(self, text: str) -> Optional[Tuple[int, int]]:
+        """Span of the leftmost match in text, or None
+
+        Like the original regex, the wildcards never cross a newline and are
+        greedy, so the span ends at the last occurrence of the final atom.
+        """
+        best = None
+        for atoms, leading, trailing in self.alternatives:
+            span = self._search_alternative(atoms, leading, text)
+            if span is not None and (leading or trailing):
+                line_start = text.rfind('\n', 0, span[0]) + 1
+                line_end = text.find('\n', span[1])
+                span = (line_start if leading else span[0],
+                        (len(text) if line_end == -1 else line_end) if trailing else span[1])
+            if span is not None and (best is None or span[0] < best[0]):
+                best = span
+        return best
+
+    def matches(self, text: str) -> bool:
+        return self.search(text) is not None
+
+    def _search_alternative(self, atoms: List[re.Pattern], leading: bool,
+                            text: str) -> Optional[Tuple[int, int]]:
+        if not atoms:
+            return (0, 0)
+
+        pos = 0
+        while pos <= len(text):
+            first = atoms[0].search(text, pos)
+            if first is None:
+                return None
+
+            line_end = text.find('\n', first.end())
+            if line_end == -1:
+                line_end = len(text)
+
+            if leading and len(atoms) == 1:
+                # `.*A` - the greedy wildcard pushes the match to the last A on the line
+                end = self._match_rest(atoms, text, first.start(), line_end)
+            else:
+                end = self._match_rest(atoms[1:], text, first.end(), line_end)
+            if end is not None:
+                return (first.start(), end)
+
+            # A later start on the same line cannot succeed either - skip the line
+            pos = line_end + 1
+        return None
+
+    @staticmethod
+    def _match_rest(atoms: List[re.Pattern], text: str, pos: int, line_end: int) -> Optional[int]:
+        """End of the greedy chain of atoms within [pos, line_end), or None"""
+        if not atoms:
+            return pos
+
+        for atom in atoms[:-1]:
+            found = atom.search(text, pos, line_end)
+            if found is None:
+                return None
+            pos = found.end()
+
+        # Greedy wildcard: the final atom matches at its rightmost start on the line
+        end = None
+        found = atoms[-1].search(text, pos, line_end)
+        while found is not None:
+            end = found.end()
+            found = atoms[-1].search(text, found.start() + 1, line_end)
+        return end
+
+
+def compile_linear_rules(patterns: List[str], flags: int = 0) -> List[LinearRule]:
+    return [LinearRule(pattern, flags) for pattern in patterns]
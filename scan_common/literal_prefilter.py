@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Literal Prefilter for AVA OLO rule sets
+Skips regex evaluation for text that lacks every rule's required literal token
+"""
+import re
+import copy
+from typing import Any, Callable, List, Optional
+
+from scan_common.linear_rules import compile_linear_rules
+
+# Non-ASCII characters that re.IGNORECASE treats as equal to an ASCII letter;
+# str.lower() alone does not map them (or maps them to two characters)
+_IGNORECASE_ASCII_FOLDS = str.maketrans({'İ': 'i', 'ı': 'i', 'ſ': 's', 'K': 'k'})
+
+MIN_TOKEN_LENGTH = 3
+
+
+def literal_runs(atom: str) -> List[str]:
+    """Literal substrings every match of a wildcard-free regex atom must contain"""
+    runs = []
+    run = ''
+    i = 0
+    while i < len(atom):
+        char = atom[i]
+        if char == '\\':
+            escaped = atom[i + 1:i + 2]
+            i += 2
+            if escaped and not escaped.isalnum():
+                run += escaped  # \. \( \' ... are literal characters
+                continue
+            runs.append(run)  # \s \d \b ... are classes or assertions
+            run = ''
+            continue
+
+        if char in '?*{':
+            # The previous character is optional or repeated a variable number of times
+            runs.append(run[:-1])
+            run = ''
+            if char == '{':
+                i = atom.find('}', i) + 1 or len(atom)
+                continue
+        elif char == '[':
+            runs.append(run)
+            run = ''
+            # Skip the class, honouring a literal ']' right after '[' or '[^'
+            i += 1
+            if atom[i:i + 1] == '^':
+                i += 1
+            if atom[i:i + 1] == ']':
+                i += 1
+            while i < len(atom) and atom[i] != ']':
+                i += 2 if atom[i] == '\\' else 1
+        elif char == '(':
+            runs.append(run)
+            run = ''
+            depth = 0
+            while i < len(atom):
+                if atom[i] == '\\':
+                    i += 2
+                    continue
+                depth += {'(': 1, ')': -1}.get(atom[i], 0)
+                if depth == 0:
+                    break
+                i += 1
+        elif char in '.^$|)+':
+            runs.append(run)
+            run = ''
+        else:
+            run += char
+        i += 1
+
+    runs.append(run)
+    return [run for run in runs if run]
+
+
+def required_tokens(rule: Any) -> Optional[List[str]]:
+    """One literal token per alternative of a LinearRule, or None if some alternative has none
+
+    A rule can only match text containing at least one of the returned tokens
+    (lower-cased for IGNORECASE rules).
+    """
+    ignore_case = bool(rule.flags & re.IGNORECASE)
+    tokens = []
+    for atoms, _, _ in rule.alternatives:
+        runs = [run for atom in atoms for run in literal_runs(atom.pattern)]
+        if not runs:
+            return None
+        token = max(runs, key=len)
+        if len(token) < MIN_TOKEN_LENGTH or not token.isascii():
+            return None
+        tokens.append(token.lower() if ignore_case else token)
+    return tokens
+
+
+class PrefilteredRuleSet:
+    """An audit's rule list behind a literal-token prefilter
+
+    Each rule is reduced to the literal tokens it cannot match without (e.g.
+    `country`, `getenv`, `sqlite`, `farmer_id`). candidates() checks all
+    distinct tokens with plain substring search - at most one lower-casing
+    of the text per call - and returns only the rules whose tokens occur, in
+    their original order, so text without any token costs no regex work.
+    """
+
+    def __init__(self, rules: List[Any]):
+        self.rules = list(rules)
+        self.tokens = [required_tokens(rule) for rule in self.rules]
+        self.ignore_case = [bool(rule.flags & re.IGNORECASE) for rule in self.rules]
+
+    def __iter__(self):
+        return iter(self.rules)
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def map_rules(self, wrap: Callable[[Any], Any]) -> 'PrefilteredRuleSet':
+        """Same prefilter around wrapped rules (e.g. timing wrappers)"""
+        mapped = copy.copy(self)
+        mapped.rules = [wrap(rule) for rule in self.rules]
+        return mapped
+
+    def candidates(self, text: str) -> List[Any]:
+        """Rules that may match text, in rule order"""
+        folded = None
+        present = {}
+        selected = []
+        for rule, tokens, ignore_case in zip(self.rules, self.tokens, self.ignore_case):
+            if tokens is None:
+                selected.append(rule)
+                continue
+
+            if ignore_case and folded is None:
+                folded = text.lower() if text.isascii() else text.translate(_IGNORECASE_ASCII_FOLDS).lower()
+            haystack = folded if ignore_case else text
+            for token in tokens:
+                key = (token, ignore_case)
+                if key not in present:
+                    present[key] = token in haystack
+                if present[key]:
+                    selected.append(rule)
+                    break
+        return selected
+
+
+def compile_prefiltered_rules(patterns: List[str], flags: int = 0) -> PrefilteredRuleSet:
+    return PrefilteredRuleSet(compile_linear_rules(patterns, flags))
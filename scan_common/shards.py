@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+CI Sharding for AVA OLO scanners
+Deterministic, size-balanced file partitions for parallel jobs and checks for merging them
+"""
+import heapq
+import hashlib
+import argparse
+from typing import Iterable, List, Tuple
+
+# Per-file cost in bytes on top of its size (open, stat, per-file setup), so shards
+# of many small files balance against shards of a few large ones
+FILE_COST_BYTES = 4096
+
+
+def parse_shard(spec: str) -> Tuple[int, int]:
+    """(index, count) from 'i/N' with 1 <= i <= N; raises ValueError"""
+    try:
+        index, count = (int(part) for part in spec.split('/'))
+    except ValueError:
+        raise ValueError(f"shard must look like i/N, got {spec!r}")
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"shard index must be between 1 and {count}, got {spec!r}")
+    return index, count
+
+
+def shard_argument(spec: str) -> Tuple[int, int]:
+    """argparse type for --shard i/N"""
+    try:
+        return parse_shard(spec)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def path_hash(path: str) -> int:
+    return int.from_bytes(hashlib.sha1(path.encode('utf-8', errors='surrogateescape')).digest()[:8], 'big')
+
+
+def assign_shards(items: List[Tuple[str, int]], count: int) -> List[int]:
+    """Shard number (1..count) of each (path, size) item
+
+    Files are placed largest first, each on the shard with the least total
+    weight so far (size plus FILE_COST_BYTES); equal sizes are ordered by
+    path hash and equal loads by shard number. The result depends only on
+    the paths and sizes - not on walk order, machine or process - so every
+    CI job computes the same partition from the same checkout. Paths should
+    be relative to the checkout so absolute workspace paths do not matter.
+    """
+    order = sorted(range(len(items)), key=lambda i: (-items[i][1], path_hash(items[i][0]), items[i][0]))
+    loads = [(0, shard) for shard in range(1, count + 1)]
+    assignment = [0] * len(items)
+    for i in order:
+        load, shard = heapq.heappop(loads)
+        assignment[i] = shard
+        heapq.heappush(loads, (load + items[i][1] + FILE_COST_BYTES, shard))
+    return assignment
+
+
+def validate_shard_set(shards: Iterable[Tuple[int, int]]) -> int:
+    """Shard count of a complete set of (index, count) pairs; raises ValueError otherwise"""
+    shards = list(shards)
+    counts = {count for _, count in shards}
+    if len(counts) != 1:
+        raise ValueError(f"shard outputs come from different shard counts: {sorted(counts)}")
+    count = counts.pop()
+    indices = sorted(index for index, _ in shards)
+    if indices != list(range(1, count + 1)):
+        missing = sorted(set(range(1, count + 1)) - set(indices))
+        duplicated = sorted({index for index in indices if indices.count(index) > 1})
+        raise ValueError(f"incomplete shard set for {count} shards "
+                         f"(missing: {missing or 'none'}, duplicated: {duplicated or 'none'})")
+    return count
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Baseline tests
+Fingerprints survive whitespace changes and moved lines; only new findings are reported
+"""
+import sys
+import json
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.append(str(ROOT))
+sys.path.append(str(ROOT / 'llm_first_audit'))
+from scan_common.baseline import Baseline, fingerprint, normalize_code
+import llm_first_scanner
+
+
+def test_normalize_code():
+    assert normalize_code('\tif  x ==\t1:  \n') == 'if x == 1:'
+
+
+def test_fingerprint_is_stable_across_whitespace():
+    assert fingerprint('a.py', 'rule', '    if x == 1:') == fingerprint('a.py', 'rule', 'if x  ==  1:\n')
+
+
+@pytest.mark.parametrize('other', [
+    ('b.py', 'rule', 'if x == 1:', 0),
+    ('a.py', 'other rule', 'if x == 1:', 0),
+    ('a.py', 'rule', 'if x == 2:', 0),
+    ('a.py', 'rule', 'if x == 1:', 1),
+])
+def test_fingerprint_parts(other):
+    assert fingerprint('a.py', 'rule', 'if x == 1:') != fingerprint(*other)
+
+
+def test_fingerprint_uses_forward_slashes(monkeypatch):
+    monkeypatch.setattr('scan_common.baseline.os.sep', '\\')
+    assert fingerprint('pkg\\a.py', 'rule', 'x') == fingerprint('pkg/a.py', 'rule', 'x')
+
+
+def test_save_and_load_round_trip(tmp_path):
+    path = str(tmp_path / 'baseline.json')
+    baseline = Baseline()
+    assert not baseline.known('f1')
+    baseline.known('f2')
+    baseline.save(path)
+
+    loaded = Baseline.load(path)
+    assert loaded.fingerprints == {'f1', 'f2'}
+    assert loaded.known('f1') and loaded.suppressed == 1
+    loaded.reset()
+    assert loaded.seen == set() and loaded.suppressed == 0
+
+
+def test_load_rejects_other_files(tmp_path):
+    path = tmp_path / 'baseline.json'
+    path.write_text(json.dumps({'format': 0, 'fingerprints': []}))
+    with pytest.raises(ValueError):
+        Baseline.load(str(path))
+
+
+def test_known_all():
+    baseline = Baseline(['a', 'b'])
+    assert baseline.known_all(['a', 'b'])
+    assert not baseline.known_all(['a', 'c'])
+    assert not baseline.known_all([])
+    assert baseline.suppressed == 1
+    assert baseline.seen == {'a', 'b', 'c'}
+
+
+def scan(repository: Path, baseline_file: Path, *options: str):
+    report_file = repository.parent / 'report.json'
+    llm_first_scanner.main([str(repository), '--baseline', str(baseline_file), '--json', str(report_file),
+                            *options])
+    return json.loads(report_file.read_text())
+
+
+def test_scanner_reports_only_new_findings(tmp_path):
+    repository = tmp_path / 'ava-olo-shared'
+    repository.mkdir()
+    module = repository / 'alerts.py'
+    module.write_text('if notification_ready: send()\n')
+    baseline_file = tmp_path / 'baseline.json'
+
+    assert scan(repository, baseline_file, '--update-baseline')['total_violations'] == 1
+    assert scan(repository, baseline_file)['total_violations'] == 0
+
+    # Moved and re-indented: still known
+    module.write_text('import os\n\n\ndef alert():\n    if notification_ready:   send()\n')
+    report = scan(repository, baseline_file)
+    assert report['total_violations'] == 0
+    assert report['baseline_suppressed'] == 1
+
+    # A different line breaking the same rule is new
+    module.write_text('if notification_ready: send()\nif notification_late: send()\n')
+    report = scan(repository, baseline_file)
+    assert [finding['line'] for finding in report['violations']] == [2]
+
+
+def test_scanner_reports_a_new_copy_of_a_known_line(tmp_path):
+    repository = tmp_path / 'ava-olo-shared'
+    repository.mkdir()
+    module = repository / 'alerts.py'
+    module.write_text('if notification_ready: send()\n')
+    baseline_file = tmp_path / 'baseline.json'
+    scan(repository, baseline_file, '--update-baseline')
+
+    module.write_text('if notification_ready: send()\nx = 1\n    if notification_ready:  send()\n')
+    report = scan(repository, baseline_file)
+    assert [finding['line'] for finding in report['violations']] == [3]
+    assert report['baseline_suppressed'] == 1
+
+
+def test_diff_scan_numbers_copies_across_the_whole_file(tmp_path, git):
+    repository = tmp_path / 'ava-olo-shared'
+    repository.mkdir()
+    module = repository / 'alerts.py'
+    module.write_text('if notification_ready: send()\n' + 'x = 1\n' * 10)
+    baseline_file = tmp_path / 'baseline.json'
+    scan(repository, baseline_file, '--update-baseline')
+    git(repository, 'init', '-q')
+    git(repository, 'add', '.')
+    git(repository, 'commit', '-q', '-m', 'base')
+
+    # Only the copy far below the known line is in the diff; it is still the second occurrence
+    module.write_text(module.read_text() + 'if notification_ready: send()\n')
+    git(repository, 'commit', '-q', '-am', 'copy')
+    report = scan(repository, baseline_file, '--git-range', 'HEAD~1')
+    assert [finding['line'] for finding in report['violations']] == [12]
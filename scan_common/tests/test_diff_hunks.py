@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Unified diff parsing tests
+New-side line numbers must agree with the files git actually diffed
+"""
+import os
+import sys
+import zlib
+import random
+import subprocess
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from scan_common.diff_hunks import FileChange, parse_unified_diff, unquote_path
+
+GIT_DIFF = """diff --git a/app.py b/app.py
+index 1111111111111111111111111111111111111111..2222222222222222222222222222222222222222 100644
+--- a/app.py
++++ b/app.py
+@@ -2,0 +3,2 @@ def main():
++    if crop == 'mango':
++        pass
+@@ -10 +11,0 @@
+-    old()
+diff --git a/gone.py b/gone.py
+deleted file mode 100644
+index 3333333333333333333333333333333333333333..0000000000000000000000000000000000000000
+--- a/gone.py
++++ /dev/null
+@@ -1 +0,0 @@
+-x = 1
+diff --git a/old_name.py b/"new name\\303\\251.py"
+similarity index 90%
+rename from old_name.py
+rename to "new name\\303\\251.py"
+index 4444444444444444444444444444444444444444..5555555555555555555555555555555555555555 100644
+diff --git a/logo.png b/logo.png
+index 6666666666666666666666666666666666666666..7777777777777777777777777777777777777777 100644
+Binary files a/logo.png and b/logo.png differ
+"""
+
+
+def test_git_diff():
+    app, gone, renamed, logo = parse_unified_diff(GIT_DIFF.splitlines(keepends=True))
+    assert (app.path, renamed.path) == ('app.py', 'new nameé.py')
+    assert app.new_blob == '2' * 40
+    assert app.added == [3, 4]
+    assert app.deletion_points == [12]  # +11,0: the removal sits after new line 11
+    assert app.lines[3] == "    if crop == 'mango':\n"
+    assert gone.deleted and not app.deleted
+    assert renamed.added == [] and renamed.new_blob == '5' * 40
+    # Scanners skip deleted and binary changes before looking at their path
+    assert logo.binary
+
+
+def test_plain_diff_without_git_header():
+    diff = ['--- a.py\t2026-01-01\n', '+++ b.py\t2026-01-02\n', '@@ -1,3 +1,3 @@\n',
+            ' one\n', '-two\n', '+TWO\n', ' three\n']
+    [change] = parse_unified_diff(diff)
+    assert change.path == 'b.py'
+    assert change.added == [2]
+    assert change.lines == {1: 'one\n', 2: 'TWO\n', 3: 'three\n'}
+    assert change.new_blob is None
+
+
+def test_lines_to_scan():
+    change = FileChange('x.py')
+    change.added = [5]
+    change.deletion_points = [1, 20]
+    assert change.lines_to_scan(1) == [1, 4, 5, 6, 19, 20]
+    assert change.lines_to_scan(2, line_count=19) == [1, 2, 3, 4, 5, 6, 7, 18, 19]
+    assert change.lines_to_scan(0) == [5]
+
+
+def test_unquote_path():
+    assert unquote_path('"tab\\there.py"') == 'tab\there.py'
+    assert unquote_path('b/plain.py\t2026-01-01') == 'b/plain.py'
+
+
+def random_edit(lines, generator):
+    lines = list(lines)
+    for _ in range(generator.randint(1, 4)):
+        position = generator.randint(0, len(lines))
+        action = generator.choice(['insert', 'delete', 'replace'])
+        if action != 'insert' and position < len(lines):
+            del lines[position:position + generator.randint(1, 3)]
+        if action != 'delete':
+            lines[position:position] = [f'new {generator.random():.6f}\n'
+                                        for _ in range(generator.randint(1, 3))]
+    return lines
+
+
+@pytest.mark.parametrize('seed', range(25))
+@pytest.mark.parametrize('context', [0, 3])
+def test_matches_git_diff_of_random_edits(tmp_path, seed, context):
+    generator = random.Random(zlib.crc32(f'{seed}'.encode()))
+    old = [f'line {number}\n' for number in range(generator.randint(0, 30))]
+    new = random_edit(old, generator)
+    (tmp_path / 'old.py').write_text(''.join(old))
+    (tmp_path / 'new.py').write_text(''.join(new))
+    diff = subprocess.run(['git', 'diff', '--no-index', '--no-color', f'--unified={context}',
+                           'old.py', 'new.py'], cwd=tmp_path, capture_output=True, text=True).stdout
+
+    changes = parse_unified_diff(diff.splitlines(keepends=True))
+    if old == new:
+        assert changes == []
+        return
+    [change] = changes
+    assert change.path == 'new.py'
+    # Every line the diff shows is the new file's line with that number
+    for number, text in change.lines.items():
+        assert new[number - 1] == text
+    assert len(change.added) == sum(1 for line in diff.splitlines()
+                                    if line.startswith('+') and not line.startswith('+++'))
+    # Every removal without a replacement leaves a point inside the new file
+    assert all(1 <= point <= len(new) + 1 for point in change.deletion_points)
+    if len(new) < len(old) and not change.added:
+        assert change.deletion_points
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Findings cache tests
+Cached findings are reused only while the file content and the rule set are unchanged
+"""
+import os
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.append(str(ROOT))
+sys.path.append(str(ROOT / 'llm_first_audit'))
+from scan_common.findings_cache import FindingsCache
+from llm_first_scanner import LLMFirstScanner
+
+RULESET = FindingsCache.hash_ruleset({'rules': ['if.*crop']})
+
+
+def never_called():
+    raise AssertionError('content hash computed on the stat fast path')
+
+
+def saved_cache(tmp_path: Path) -> Path:
+    cache_file = tmp_path / 'cache.json'
+    cache = FindingsCache(cache_file, RULESET)
+    cache.put('a.py', 10, 1000, FindingsCache.hash_content('old'), [['finding']])
+    cache.save()
+    return cache_file
+
+
+def test_stat_fast_path_skips_hashing(tmp_path):
+    cache = FindingsCache(saved_cache(tmp_path), RULESET)
+    assert cache.get('a.py', 10, 1000, never_called) == [['finding']]
+    assert (cache.hits, cache.misses) == (1, 0)
+
+
+def test_touched_file_with_same_content_hits(tmp_path):
+    cache = FindingsCache(saved_cache(tmp_path), RULESET)
+    assert cache.get('a.py', 10, 2000, lambda: FindingsCache.hash_content('old')) == [['finding']]
+    assert cache.is_fresh('a.py', 10, 2000)
+    assert cache.dirty
+
+
+def test_changed_content_misses(tmp_path):
+    cache = FindingsCache(saved_cache(tmp_path), RULESET)
+    assert cache.get('a.py', 10, 2000, lambda: FindingsCache.hash_content('new')) is None
+    assert cache.get('a.py', 11, 1000, never_called) is None
+    assert cache.misses == 2
+
+
+def test_ruleset_change_discards_everything(tmp_path):
+    cache = FindingsCache(saved_cache(tmp_path), FindingsCache.hash_ruleset({'rules': ['if.*country']}))
+    assert cache.entries == {}
+
+
+def test_corrupt_or_old_format_file_is_ignored(tmp_path):
+    cache_file = tmp_path / 'cache.json'
+    cache_file.write_text('{"format_version": 0, "entries": {"a.py": {}}}')
+    assert FindingsCache(cache_file, RULESET).entries == {}
+    cache_file.write_text('{not json')
+    assert FindingsCache(cache_file, RULESET).entries == {}
+
+
+def test_untouched_entries_are_dropped(tmp_path):
+    cache = FindingsCache(saved_cache(tmp_path), RULESET)
+    cache.put('b.py', 1, 1, 'hash', [])
+    cache.discard_untouched()
+    assert list(cache.entries) == ['b.py']
+
+
+def test_files_without_hash_are_not_cached(tmp_path):
+    cache = FindingsCache(tmp_path / 'cache.json', RULESET)
+    cache.put('a.py', 1, 1, None, [])
+    assert cache.entries == {} and not cache.dirty
+
+
+def test_scanner_rescans_edited_file(tmp_path):
+    repository = tmp_path / 'ava-olo-shared'
+    repository.mkdir()
+    module = repository / 'alerts.py'
+    module.write_text('if notification_ready: send()\n')
+    cache_file = str(tmp_path / 'cache.json')
+
+    first = LLMFirstScanner(cache_file=cache_file)
+    assert [v.line for v in first.scan_directory(str(repository))] == [1]
+
+    second = LLMFirstScanner(cache_file=cache_file)
+    assert [v.line for v in second.scan_directory(str(repository))] == [1]
+    assert (second.cache.hits, second.cache.misses) == (1, 0)
+
+    # Same size, new content and mtime: the content hash decides
+    size = module.stat().st_size
+    module.write_text('#  notification_ready: send()\n')
+    stat = module.stat()
+    assert stat.st_size == size
+    os.utime(module, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    third = LLMFirstScanner(cache_file=cache_file)
+    assert third.scan_directory(str(repository)) == []
+    assert third.cache.misses == 1
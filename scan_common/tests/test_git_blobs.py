@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Git blob reader tests
+Contents come from git objects through one cat-file process, never from the working tree
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from scan_common.git_blobs import GitBlobReader, git_prefix, is_null_oid, staged_blobs
+
+
+@pytest.fixture
+def repo(tmp_path, git):
+    git(tmp_path, 'init', '-q')
+    (tmp_path / 'pkg').mkdir()
+    (tmp_path / 'pkg' / 'app.py').write_bytes(b'committed\n')
+    (tmp_path / 'data.bin').write_bytes(bytes(range(256)) + b'\n')
+    git(tmp_path, 'add', '.')
+    git(tmp_path, 'commit', '-q', '-m', 'base')
+    return tmp_path
+
+
+def test_reads_blobs_by_id_and_revision(repo, git):
+    (repo / 'pkg' / 'app.py').write_bytes(b'working tree\n')
+    blob = git(repo, 'rev-parse', 'HEAD:pkg/app.py')
+    with GitBlobReader(str(repo)) as reader:
+        assert reader.read(blob) == b'committed\n'
+        assert reader.read(blob[:10]) == b'committed\n'
+        assert reader.read('HEAD:pkg/app.py') == b'committed\n'
+        assert reader.read('HEAD:data.bin') == bytes(range(256)) + b'\n'
+        process = reader.process
+    assert reader.reads == 4
+    assert process.returncode is not None  # One process served every read and is closed
+
+
+def test_missing_and_non_blob_objects(repo):
+    with GitBlobReader(str(repo)) as reader:
+        assert reader.read('HEAD:missing.py') is None
+        assert reader.read('HEAD:pkg') is None  # A tree
+        assert reader.read('HEAD') is None  # A commit
+        assert reader.read('bad\nname') is None
+        assert reader.read('HEAD:pkg/app.py') == b'committed\n'  # Still usable
+
+
+def test_outside_repository(tmp_path):
+    reader = GitBlobReader(str(tmp_path))
+    assert reader.read('HEAD:x') is None
+    assert reader.failed
+    assert reader.read('HEAD:x') is None
+
+
+def test_git_prefix(repo, tmp_path_factory):
+    assert git_prefix(str(repo)) == ''
+    assert git_prefix(str(repo / 'pkg')) == 'pkg/'
+    assert git_prefix(str(tmp_path_factory.mktemp('plain'))) == ''
+
+
+def test_staged_blobs(repo, git):
+    (repo / 'pkg' / 'app.py').write_bytes(b'staged\n')
+    (repo / 'pkg' / 'new.py').write_bytes(b'new\n')
+    git(repo, 'add', 'pkg')
+    git(repo, 'mv', 'data.bin', 'moved.bin')
+    (repo / 'pkg' / 'app.py').write_bytes(b'unstaged edit\n')
+    (repo / 'untracked.py').write_bytes(b'x\n')
+
+    blobs = dict(staged_blobs(str(repo)))
+    assert sorted(blobs) == ['moved.bin', 'pkg/app.py', 'pkg/new.py']
+    with GitBlobReader(str(repo)) as reader:
+        assert reader.read(blobs['pkg/app.py']) == b'staged\n'
+        assert reader.read(blobs['pkg/new.py']) == b'new\n'
+
+
+def test_staged_blobs_of_subdirectory(repo, git):
+    (repo / 'pkg' / 'app.py').write_bytes(b'staged\n')
+    (repo / 'top.py').write_bytes(b'top\n')
+    git(repo, 'add', '.')
+    assert [path for path, _ in staged_blobs(str(repo / 'pkg'))] == ['app.py']
+
+
+def test_staged_blobs_before_first_commit(tmp_path, git):
+    git(tmp_path, 'init', '-q')
+    (tmp_path / 'first.py').write_bytes(b'first\n')
+    git(tmp_path, 'add', 'first.py')
+    assert [path for path, _ in staged_blobs(str(tmp_path))] == ['first.py']
+
+
+def test_staged_blobs_outside_repository(tmp_path):
+    with pytest.raises(RuntimeError):
+        staged_blobs(str(tmp_path))
+
+
+def test_null_oid():
+    assert is_null_oid('0' * 40) and is_null_oid(None) and is_null_oid('')
+    assert not is_null_oid('0' * 39 + '1')
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Ignore matcher tests
+.gitignore files are applied the way git applies them, checked against git check-ignore
+"""
+import os
+import re
+import sys
+import subprocess
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from scan_common.fs_walk import scandir_walk
+from scan_common.ignore_rules import IgnoreMatcher, glob_to_regex
+
+GITIGNORES = {
+    '.gitignore': '# build output\n*.log\nbuild/\n/dist\n!keep.log\ndocs/**/draft_*\nsecret?.py\n[abc]_tmp.py\n',
+    'pkg/.gitignore': 'generated/\n!build/\n/local.py\nnested/*.py\n',
+    'pkg/sub/.gitignore': '!*.log\n',
+}
+
+FILES = [
+    'app.py', 'debug.log', 'keep.log', 'build/out.py', 'dist/bundle.js', 'pkg/dist/ok.py',
+    'docs/draft_a.md', 'docs/guide/draft_b.md', 'docs/guide/final.md', 'secret1.py', 'secret10.py',
+    'a_tmp.py', 'd_tmp.py', 'pkg/generated/models.py', 'pkg/build/kept.py', 'pkg/local.py',
+    'pkg/sub/local.py', 'pkg/nested/x.py', 'pkg/nested/deeper/y.py', 'pkg/sub/trace.log', 'pkg/trace.log',
+]
+
+
+def git_ignored(repo: Path, paths):
+    result = subprocess.run(['git', '-c', 'core.excludesFile=', 'check-ignore', '--stdin'], cwd=repo,
+                            input='\n'.join(paths), capture_output=True, text=True)
+    assert result.returncode in (0, 1), result.stderr
+    return set(result.stdout.split())
+
+
+@pytest.fixture
+def tree(tmp_path, git):
+    git(tmp_path, 'init', '-q')
+    for path, content in GITIGNORES.items():
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_text(content)
+    for path in FILES:
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_text('x = 1\n')
+    return tmp_path
+
+
+def test_files_match_git(tree):
+    matcher = IgnoreMatcher(str(tree), project_ignore_file=None)
+    ignored = {path for path in FILES if matcher.is_ignored(str(tree / path), False, check_parents=True)}
+    assert ignored == git_ignored(tree, FILES)
+
+
+def test_scandir_walk_matches_git(tree):
+    matcher = IgnoreMatcher(str(tree), project_ignore_file=None)
+    walked = {os.path.relpath(path, str(tree)).replace(os.sep, '/')
+              for path, _ in scandir_walk(str(tree), ignore=matcher)}
+    assert walked & set(FILES) == set(FILES) - git_ignored(tree, FILES)
+
+
+def test_defaults_and_project_file_apply_before_gitignore(tree):
+    (tree / '.avaoloignore').write_text('app.py\n')
+    matcher = IgnoreMatcher(str(tree), default_patterns=['*.md'])
+    assert matcher.is_ignored(str(tree / 'app.py'), False)
+    assert matcher.is_ignored(str(tree / 'docs/guide/final.md'), False)
+    # A .gitignore further down can still re-include
+    assert not matcher.is_ignored(str(tree / 'pkg/sub/trace.log'), False)
+
+
+def test_paths_outside_root_are_not_ignored(tree):
+    matcher = IgnoreMatcher(str(tree / 'pkg'), default_patterns=['*'])
+    assert not matcher.is_ignored(str(tree / 'app.py'), False)
+
+
+@pytest.mark.parametrize('glob,path,matches', [
+    ('**/cache', 'a/b/cache', True),
+    ('**/cache', 'cache', True),
+    ('logs/**', 'logs/a/b.txt', True),
+    ('a/**/b', 'a/b', True),
+    ('a/**/b', 'a/x/y/b', True),
+    ('*.py', 'dir/x.py', False),
+    ('[!a]x', 'bx', True),
+    ('[!a]x', 'ax', False),
+])
+def test_glob_translation(glob, path, matches):
+    assert bool(re.match(glob_to_regex(glob) + r'\Z', path)) is matches
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+LinearRule tests
+Every rule the scanners use must match exactly where re.search with its pattern does
+"""
+import re
+import sys
+import zlib
+import random
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.append(str(ROOT))
+sys.path.append(str(ROOT / 'protection_system'))
+sys.path.append(str(ROOT / 'llm_first_audit'))
+from scan_common.linear_rules import LinearRule, split_top_level
+from comprehensive_audit import AVASystemAuditor
+from llm_first_scanner import LLMFirstScanner
+
+
+def repository_rules():
+    """(pattern, flags) of every rule set in the auditor and the scanner"""
+    rules = []
+    for attr in AVASystemAuditor.RULE_SETS:
+        rules.extend((rule.pattern, rule.flags) for rule in getattr(AVASystemAuditor, attr))
+    for patterns in LLMFirstScanner().violation_patterns.values():
+        rules.extend((pattern, re.IGNORECASE) for pattern, _ in patterns)
+    return rules
+
+
+RULES = repository_rules()
+
+# Operators and separators the patterns are built from
+PUNCTUATION = ['==', '!=', '=', ':', '(', ')', '[', ']', '{', '}', "'", '"', '.', ',', ';', '|', '\n']
+
+
+def random_texts(pattern: str, count: int):
+    """Lines made of the pattern's own words (in any case), so partial and complete chains are common"""
+    generator = random.Random(zlib.crc32(pattern.encode()))
+    words = re.findall(r'[A-Za-z_]{2,}', pattern) or ['x']
+    for _ in range(count):
+        pieces = []
+        for _ in range(generator.randint(1, 12)):
+            if generator.random() < 0.6:
+                word = generator.choice(words)
+                pieces.append(word.upper() if generator.random() < 0.1 else word)
+            else:
+                pieces.append(generator.choice(PUNCTUATION))
+            pieces.append(generator.choice(['', ' ', '  ']))
+        yield ''.join(pieces)
+
+
+def test_repository_has_rules():
+    assert len(RULES) > 50
+
+
+@pytest.mark.parametrize('pattern,flags', RULES, ids=[pattern for pattern, _ in RULES])
+def test_matches_like_re(pattern, flags):
+    rule = LinearRule(pattern, flags)
+    reference = re.compile(pattern, flags)
+    for text in random_texts(pattern, 300):
+        expected = reference.search(text)
+        assert rule.search(text) == (expected.span() if expected else None), text
+
+
+@pytest.mark.parametrize('pattern,text,span', [
+    (r'elif.*elif.*elif', 'elif a: x\nelif b: elif c: elif d', (10, 30)),
+    (r'if.*crop', 'if x and crop and crop', (0, 22)),
+    (r'.*country', 'a country, another country\nno', (0, 26)),
+    (r'RULES\s*=\s*\{.*\}', 'RULES = {1: 2}', (0, 14)),
+    (r'if.*mango|elif.*mango', 'elif y: mango', (0, 13)),
+])
+def test_known_spans(pattern, text, span):
+    assert LinearRule(pattern, re.IGNORECASE).search(text) == span
+    assert re.search(pattern, text, re.IGNORECASE).span() == span
+
+
+def test_wildcards_do_not_cross_lines():
+    assert LinearRule(r'def.*recommend').search('def f():\n    recommend()') is None
+
+
+def test_nested_wildcard_is_rejected():
+    with pytest.raises(ValueError):
+        LinearRule(r'if(a.*b)c')
+
+
+def test_split_ignores_separators_in_groups_and_classes():
+    assert split_top_level(r'a|(b|c)|[|]|\|', '|') == ['a', '(b|c)', '[|]', r'\|']
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Literal prefilter tests
+candidates() may drop a rule only when the rule cannot match the text
+"""
+import re
+import sys
+import zlib
+import random
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.append(str(ROOT))
+sys.path.append(str(ROOT / 'protection_system'))
+from scan_common.linear_rules import LinearRule
+from scan_common.literal_prefilter import compile_prefiltered_rules, literal_runs, required_tokens
+from comprehensive_audit import AVASystemAuditor
+
+
+@pytest.mark.parametrize('atom,runs', [
+    (r'os\.getenv', ['os.getenv']),
+    (r'if\s+country', ['if', 'country']),
+    (r'colou?r', ['colo', 'r']),
+    (r'farmer_[a-z]+id', ['farmer_', 'id']),
+    (r'(mango|kiwi)\s*==', ['==']),
+    (r'x{2,3}yz', ['yz']),
+    (r'[]x]abc', ['abc']),
+])
+def test_literal_runs(atom, runs):
+    assert literal_runs(atom) == runs
+
+
+def test_required_tokens_per_alternative():
+    assert required_tokens(LinearRule(r'if.*crop|elif.*country', re.IGNORECASE)) == ['crop', 'country']
+    assert required_tokens(LinearRule(r'os.*environ')) == ['environ']
+
+
+def test_rule_without_token_is_always_a_candidate():
+    rules = compile_prefiltered_rules([r'a.*b', r'\w+\s*=='])
+    assert rules.tokens == [None, None]
+    assert rules.candidates('nothing here') == rules.rules
+
+
+def test_candidates_keep_rule_order():
+    rules = compile_prefiltered_rules([r'sqlite3', r'country', r'mango'], re.IGNORECASE)
+    assert [rule.pattern for rule in rules.candidates('MANGO by Country')] == ['country', 'mango']
+
+
+def test_ignorecase_folds_like_re():
+    rules = compile_prefiltered_rules([r'kiwi'], re.IGNORECASE)
+    text = 'KİWİ'  # Dotted capital I folds to i under re.IGNORECASE
+    assert bool(re.search('kiwi', text, re.IGNORECASE)) == bool(rules.candidates(text))
+
+
+def test_case_sensitive_rules_are_not_folded():
+    rules = compile_prefiltered_rules([r'os\.environ'])
+    assert rules.candidates('OS.ENVIRON') == []
+
+
+@pytest.mark.parametrize('attr', sorted(AVASystemAuditor.RULE_SETS))
+def test_never_drops_a_matching_rule(attr):
+    rule_set = getattr(AVASystemAuditor, attr)
+    words = [word for rule in rule_set for word in re.findall(r'[A-Za-z_]{2,}', rule.pattern)]
+    generator = random.Random(zlib.crc32(attr.encode()))
+    for _ in range(500):
+        text = ' '.join(generator.choice(words + ['=', '==', '(', ')', "'", '.', '\n'])
+                        for _ in range(generator.randint(1, 10)))
+        if generator.random() < 0.2:
+            text = text.upper()
+        candidates = rule_set.candidates(text)
+        for rule in rule_set:
+            if rule not in candidates:
+                assert not re.search(rule.pattern, text, rule.flags), (rule.pattern, text)
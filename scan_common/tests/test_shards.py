@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Shard assignment and merge tests
+Every job computes the same balanced partition, and merged shards equal one full run
+"""
+import sys
+import json
+import zlib
+import random
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.append(str(ROOT))
+sys.path.append(str(ROOT / 'llm_first_audit'))
+from scan_common.shards import FILE_COST_BYTES, assign_shards, parse_shard, validate_shard_set
+import llm_first_scanner
+
+
+def random_items(seed: int, count: int):
+    generator = random.Random(seed)
+    return [(f'repo/module_{index}/file_{generator.randint(0, 10 ** 6)}.py',
+             int(generator.paretovariate(1.2) * 2000))
+            for index in range(count)]
+
+
+@pytest.mark.parametrize('spec,expected', [('1/1', (1, 1)), ('3/4', (3, 4))])
+def test_parse_shard(spec, expected):
+    assert parse_shard(spec) == expected
+
+
+@pytest.mark.parametrize('spec', ['0/2', '3/2', '1/0', '1', 'a/b', '1/2/3'])
+def test_parse_shard_rejects(spec):
+    with pytest.raises(ValueError):
+        parse_shard(spec)
+
+
+def test_assignment_ignores_input_order():
+    items = random_items(1, 200)
+    shuffled = list(items)
+    random.Random(2).shuffle(shuffled)
+    by_path = dict(zip((path for path, _ in items), assign_shards(items, 4)))
+    assert dict(zip((path for path, _ in shuffled), assign_shards(shuffled, 4))) == by_path
+
+
+@pytest.mark.parametrize('count', [1, 2, 3, 8])
+def test_assignment_is_balanced(count):
+    items = random_items(zlib.crc32(b'balance') + count, 500)
+    assignment = assign_shards(items, count)
+    assert set(assignment) == set(range(1, count + 1))
+    loads = [sum(size + FILE_COST_BYTES for (_, size), shard in zip(items, assignment) if shard == number)
+             for number in range(1, count + 1)]
+    # Greedy largest-first placement is within one file of the ideal split
+    largest = max(size for _, size in items) + FILE_COST_BYTES
+    assert max(loads) - min(loads) <= largest
+
+
+def test_more_shards_than_files():
+    assert sorted(assign_shards([('a.py', 10), ('b.py', 10)], 5)) == [1, 2]
+
+
+def test_validate_shard_set():
+    assert validate_shard_set([(2, 3), (1, 3), (3, 3)]) == 3
+    with pytest.raises(ValueError, match='missing: \\[2\\]'):
+        validate_shard_set([(1, 3), (3, 3)])
+    with pytest.raises(ValueError, match='duplicated: \\[1\\]'):
+        validate_shard_set([(1, 2), (1, 2), (2, 2)])
+    with pytest.raises(ValueError, match='different shard counts'):
+        validate_shard_set([(1, 2), (2, 3)])
+
+
+@pytest.fixture
+def repository(tmp_path):
+    repository = tmp_path / 'ava-olo-shared'
+    generator = random.Random(7)
+    lines = ['if notification_ready: send()', 'priority = 1 if urgent else 2', 'x = 1',
+             'if crop == value: pass', 'def classify(x): return 1 if x else 2 elif']
+    for index in range(30):
+        module = repository / f'pkg{index % 4}' / f'module_{index}.py'
+        module.parent.mkdir(parents=True, exist_ok=True)
+        module.write_text(''.join(generator.choice(lines) + '\n' for _ in range(generator.randint(1, 40))))
+    return repository
+
+
+def test_merged_shards_equal_a_full_scan(tmp_path, repository):
+    full = tmp_path / 'full.json'
+    llm_first_scanner.main([str(repository), '--json', str(full)])
+    shard_files = []
+    for index in (2, 3, 1):
+        shard_file = tmp_path / f'shard_{index}.json'
+        llm_first_scanner.main([str(repository), '--shard', f'{index}/3', '--json', str(shard_file)])
+        shard_files.append(str(shard_file))
+    merged = tmp_path / 'merged.json'
+    llm_first_scanner.main(['--merge-shards', *shard_files, '--json', str(merged)])
+
+    full_report = json.loads(full.read_text())
+    merged_report = json.loads(merged.read_text())
+    assert merged_report['total_violations'] > 0
+    for key in ('violations', 'by_severity', 'by_file', 'compliance_score', 'total_violations'):
+        assert merged_report[key] == full_report[key], key
+    assert (merged_report['repositories'][str(repository)]['files']
+            == full_report['repositories'][str(repository)]['files'])
+
+
+def test_merge_rejects_incomplete_set(tmp_path, repository, capsys):
+    shard_file = tmp_path / 'shard_1.json'
+    llm_first_scanner.main([str(repository), '--shard', '1/2', '--json', str(shard_file)])
+    assert llm_first_scanner.main(['--merge-shards', str(shard_file)]) is None
+    assert 'missing: [2]' in capsys.readouterr().err
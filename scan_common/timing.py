@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Timing Instrumentation for AVA OLO compliance scans
+Records wall time, files, bytes and matches per audit phase and per rule
+"""
+import json
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+PHASE_FIELDS = ['seconds', 'files', 'bytes_read', 'matches']
+RULE_FIELDS = ['seconds', 'calls', 'bytes_scanned', 'matches']
+
+
+def _new_stats(fields: List[str]) -> Dict[str, Union[int, float]]:
+    return {field: 0.0 if field == 'seconds' else 0 for field in fields}
+
+
+class TimedRule:
+    """Wraps a compiled rule (LinearRule or re.Pattern) and records every evaluation"""
+
+    def __init__(self, rule: Any, stats: Dict[str, Union[int, float]]):
+        self.rule = rule
+        self.pattern = rule.pattern
+        self.stats = stats
+
+    @property
+    def first_atoms(self) -> List[str]:
+        return self.rule.first_atoms
+
+    def search(self, text: str):
+        start = time.perf_counter()
+        result = self.rule.search(text)
+        self._record(start, text, result is not None)
+        return result
+
+    def matches(self, text: str) -> bool:
+        start = time.perf_counter()
+        result = self.rule.matches(text) if hasattr(self.rule, 'matches') else self.rule.search(text) is not None
+        self._record(start, text, result)
+        return result
+
+    def _record(self, start: float, text: str, matched: bool):
+        stats = self.stats
+        stats['seconds'] += time.perf_counter() - start
+        stats['calls'] += 1
+        stats['bytes_scanned'] += len(text)
+        if matched:
+            stats['matches'] += 1
+
+
+class TimingRecorder:
+    """Per-phase and per-rule counters for one audit or scan run
+
+    Phases are timed with phase(); files, bytes and matches are added with
+    count(). Rules wrapped with wrap_rule() record their own time and hits.
+    """
+
+    def __init__(self):
+        self.phases: Dict[str, Dict] = {}
+        self.rules: Dict[str, Dict] = {}
+        self.current_phase: Optional[str] = None
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[Dict]:
+        """Time a block and attribute count() calls without a phase name to it"""
+        stats = self.phases.setdefault(name, _new_stats(PHASE_FIELDS))
+        outer_phase = self.current_phase
+        self.current_phase = name
+        start = time.perf_counter()
+        try:
+            yield stats
+        finally:
+            stats['seconds'] += time.perf_counter() - start
+            self.current_phase = outer_phase
+
+    def count(self, phase: Optional[str] = None, files: int = 0, bytes_read: int = 0,
+              matches: int = 0, seconds: float = 0.0):
+        name = phase or self.current_phase
+        if name is None:
+            return
+        stats = self.phases.setdefault(name, _new_stats(PHASE_FIELDS))
+        stats['seconds'] += seconds
+        stats['files'] += files
+        stats['bytes_read'] += bytes_read
+        stats['matches'] += matches
+
+    def timed_iter(self, phase: str, results: Iterable) -> Iterator:
+        """Yield from results, charging only the time spent producing each item to phase"""
+        iterator = iter(results)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                self.count(phase, seconds=time.perf_counter() - start)
+                return
+            self.count(phase, seconds=time.perf_counter() - start)
+            yield item
+
+    def wrap_rule(self, group: str, rule: Any, name: Optional[str] = None) -> TimedRule:
+        stats = self.rules.setdefault(f'{group}: {name or rule.pattern}', _new_stats(RULE_FIELDS))
+        return TimedRule(rule, stats)
+
+    def reset(self):
+        """Zero all counters in place (wrapped rules keep recording into them)"""
+        for table, fields in ((self.phases, PHASE_FIELDS), (self.rules, RULE_FIELDS)):
+            for stats in table.values():
+                stats.update(_new_stats(fields))
+
+    def snapshot(self) -> Dict[str, Dict]:
+        return {
+            'phases': {name: dict(stats) for name, stats in self.phases.items()},
+            'rules': {name: dict(stats) for name, stats in self.rules.items()}
+        }
+
+    def merge(self, snapshot: Dict[str, Dict]):
+        """Add counters recorded elsewhere (e.g. in a worker process)"""
+        for key, fields in (('phases', PHASE_FIELDS), ('rules', RULE_FIELDS)):
+            table = getattr(self, key)
+            for name, stats in snapshot.get(key, {}).items():
+                target = table.setdefault(name, _new_stats(fields))
+                for field in fields:
+                    target[field] += stats.get(field, 0)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-ready timings, slowest rules first"""
+        data = self.snapshot()
+        data['rules'] = dict(sorted(data['rules'].items(), key=lambda item: item[1]['seconds'], reverse=True))
+        for table in data.values():
+            for stats in table.values():
+                stats['seconds'] = round(stats['seconds'], 6)
+        return data
+
+    def save_json(self, output_file: Union[str, Path]):
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def markdown_table(self, top_rules: int = 15) -> str:
+        """Markdown tables of phase timings and the slowest rules"""
+        lines = [
+            '| Phase | Wall Time (s) | Files | Bytes Read | Matches |',
+            '|-------|---------------|-------|------------|---------|'
+        ]
+        for name, stats in self.phases.items():
+            lines.append(f"| {name} | {stats['seconds']:.3f} | {stats['files']} | "
+                         f"{stats['bytes_read']} | {stats['matches']} |")
+
+        rules = sorted(self.rules.items(), key=lambda item: item[1]['seconds'], reverse=True)
+        if rules:
+            lines += [
+                '',
+                f'**Slowest rules** (top {min(top_rules, len(rules))} of {len(rules)})',
+                '',
+                '| Rule | Time (s) | Calls | Bytes Scanned | Matches |',
+                '|------|----------|-------|---------------|---------|'
+            ]
+            for name, stats in rules[:top_rules]:
+                escaped = name.replace('|', '\\|')
+                lines.append(f"| `{escaped}` | {stats['seconds']:.4f} | {stats['calls']} | "
+                             f"{stats['bytes_scanned']} | {stats['matches']} |")
+
+        return '\n'.join(lines) + '\n'